@@ -55,3 +55,11 @@ print()
 print('Parametrized:')
 print(ps)
 print()
+print('Canonical Form Test')
+h1 = Hyperplane(normal_vector=Vector([1, -2, 0, 2]), constant_term = 3)
+h2 = Hyperplane(normal_vector=Vector([-2, 4, 0, -4]), constant_term = -6)
+h3 = Hyperplane(normal_vector=Vector([1, -2, 0, 2]), constant_term = 4)
+print(h1.canonical_form())
+print('Equal:', h1 == h2, h1.canonical_form() == h2.canonical_form(),
+      'Distinct planes:', len(set([h.canonical_form() for h in [h1, h2, h3]])))
+print()
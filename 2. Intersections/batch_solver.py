@@ -0,0 +1,129 @@
+from array import array
+from linearsys import LinearSystem
+
+# Solves many small independent systems A x = b at once, eg. the intersections
+# of millions of line pairs or plane triples.  No LinearSystem, Hyperplane or
+# Vector objects are built: each system is a nested list of m rows of n
+# coefficients and all arithmetic is in floats.  2 x 2 and 3 x 3 systems use
+# Cramer's rule in closed form; singular ones, and every other shape, go
+# through a small Gauss-Jordan elimination with partial pivoting.
+
+UNIQUE = 0
+NO_SOLUTION = 1
+INFINITE = 2
+CODE_MESSAGES = {UNIQUE: 'Unique solution',
+                 NO_SOLUTION: LinearSystem.NO_SOLUTIONS_MSG,
+                 INFINITE: LinearSystem.INF_SOLUTIONS_MSG}
+
+SHAPES_MUST_MATCH_MSG = 'Every system in a batch must have the same m x n shape'
+
+
+def solve_batch(coefficients, constant_terms, tol=1e-10):
+    '''
+    Input: N coefficient matrices of shape m x n (nested lists or tuples), N
+    lists of m constant terms, relative tolerance for the singularity decision
+    Output: (solutions, codes); solutions is a flat array('d') of N * n values,
+    system i owning solutions[i*n:(i+1)*n], and codes an array('b') of N
+    classification codes: UNIQUE, NO_SOLUTION or INFINITE (see CODE_MESSAGES).
+    For INFINITE the solution is the basepoint with every free variable set to 0,
+    as in compute_solution; for NO_SOLUTION it is n NaNs.
+    '''
+    solutions = array('d')
+    codes = array('b')
+    if not len(coefficients):
+        return solutions, codes
+    m = len(coefficients[0])
+    n = len(coefficients[0][0])
+    if m == n == 2:
+        solver = solve_2x2
+    elif m == n == 3:
+        solver = solve_3x3
+    else:
+        solver = solve_small
+
+    append = codes.append
+    extend = solutions.extend
+    for a, b in zip(coefficients, constant_terms):
+        if len(a) != m or len(a[0]) != n:
+            raise Exception(SHAPES_MUST_MATCH_MSG)
+        code, x = solver(a, b, tol)
+        append(code)
+        extend(x)
+    return solutions, codes
+
+
+def solve_2x2(a, b, tol=1e-10):
+    '''
+    Output: (code, (x1, x2)) by Cramer's rule
+    The determinant counts as zero when it is below tol times the product of the
+    row 1-norms, which bounds it; those systems are classified by solve_small.
+    '''
+    (a11, a12), (a21, a22) = a
+    a11, a12, a21, a22 = float(a11), float(a12), float(a21), float(a22)
+    b1, b2 = float(b[0]), float(b[1])
+    det = a11*a22 - a12*a21
+    if abs(det) <= tol * (abs(a11) + abs(a12)) * (abs(a21) + abs(a22)) or det == 0:
+        return solve_small(a, b, tol)
+    return UNIQUE, ((b1*a22 - a12*b2) / det, (a11*b2 - b1*a21) / det)
+
+
+def solve_3x3(a, b, tol=1e-10):
+    '''
+    Output: (code, (x1, x2, x3)) by Cramer's rule, through the cofactors of A
+    Same singularity test as solve_2x2.
+    '''
+    (a11, a12, a13), (a21, a22, a23), (a31, a32, a33) = a
+    a11, a12, a13 = float(a11), float(a12), float(a13)
+    a21, a22, a23 = float(a21), float(a22), float(a23)
+    a31, a32, a33 = float(a31), float(a32), float(a33)
+    b1, b2, b3 = float(b[0]), float(b[1]), float(b[2])
+    c11 = a22*a33 - a23*a32
+    c12 = a23*a31 - a21*a33
+    c13 = a21*a32 - a22*a31
+    det = a11*c11 + a12*c12 + a13*c13
+    bound = (abs(a11) + abs(a12) + abs(a13)) * (abs(a21) + abs(a22) + abs(a23)) * (abs(a31) + abs(a32) + abs(a33))
+    if abs(det) <= tol * bound or det == 0:
+        return solve_small(a, b, tol)
+    # x = adj(A) b / det, the adjugate being the transposed cofactor matrix
+    x1 = (c11*b1 + (a13*a32 - a12*a33)*b2 + (a12*a23 - a13*a22)*b3) / det
+    x2 = (c12*b1 + (a11*a33 - a13*a31)*b2 + (a13*a21 - a11*a23)*b3) / det
+    x3 = (c13*b1 + (a12*a31 - a11*a32)*b2 + (a11*a22 - a12*a21)*b3) / det
+    return UNIQUE, (x1, x2, x3)
+
+
+def solve_small(a, b, tol=1e-10):
+    '''
+    Output: (code, x) for any m x n system by Gauss-Jordan elimination with
+    partial pivoting on the float augmented rows.  Values below tol times the
+    largest |value| of the augmented matrix count as zero.
+    '''
+    rows = [[float(x) for x in row] + [float(k)] for row, k in zip(a, b)]
+    m = len(rows)
+    n = len(rows[0]) - 1
+    eps = tol * max([abs(x) for row in rows for x in row])
+
+    pivots = []
+    i = 0
+    for j in range(n):
+        if i == m:
+            break
+        r = max(range(i, m), key=lambda k: abs(rows[k][j]))
+        if abs(rows[r][j]) <= eps:
+            continue
+        rows[i], rows[r] = rows[r], rows[i]
+        beta = rows[i][j]
+        pivot_row = rows[i] = [x / beta for x in rows[i]]
+        for k in range(m):
+            gamma = rows[k][j]
+            if k != i and gamma:
+                rows[k] = [y - gamma*x for x, y in zip(pivot_row, rows[k])]
+        pivots.append(j)
+        i += 1
+
+    for row in rows[i:]:
+        if abs(row[-1]) > eps:
+            return NO_SOLUTION, (float('nan'),) * n
+    x = [0.0] * n
+    for row, j in zip(rows, pivots):
+        x[j] = row[-1]
+    return (UNIQUE if len(pivots) == n else INFINITE), tuple(x)
@@ -0,0 +1,36 @@
+import sys
+from random import uniform, seed
+from time import perf_counter
+from batch_solver import solve_batch
+from linearsys import LinearSystem
+from hyperplane import Hyperplane
+from vector_alt import Vector
+
+# Solves N random 2 x 2 and 3 x 3 systems with solve_batch and, for the first
+# 1000 of them, with LinearSystem.compute_ge_solution on the float64 backend,
+# reporting systems per second and the largest difference between the two.
+# Usage: python batch_solver_benchmark.py [N]   (default N = 200000)
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+seed(0)
+
+print('solve_batch benchmark, {} systems per size'.format(N))
+print('{:<8}{:<22}{:>14}{:>14}'.format('size', 'method', 'systems/s', 'max error'))
+for n in (2, 3):
+    coefficients = [[[uniform(-10, 10) for _ in range(n)] for _ in range(n)] for _ in range(N)]
+    constants = [[uniform(-10, 10) for _ in range(n)] for _ in range(N)]
+
+    start = perf_counter()
+    solutions, codes = solve_batch(coefficients, constants)
+    seconds = perf_counter() - start
+    print('{:<8}{:<22}{:>14.0f}{:>14}'.format('{}x{}'.format(n, n), 'solve_batch', N / seconds, '-'))
+
+    count = min(N, 1000)
+    error = 0.0
+    start = perf_counter()
+    for i in range(count):
+        s = LinearSystem([Hyperplane(Vector(row, 'float64'), k) for row, k in zip(coefficients[i], constants[i])])
+        x = s.compute_ge_solution()
+        error = max([error] + [abs(a - b) for a, b in zip(x.coordinates, solutions[i*n:(i+1)*n])])
+    seconds = perf_counter() - start
+    print('{:<8}{:<22}{:>14.0f}{:>14.2e}'.format('{}x{}'.format(n, n), 'compute_ge_solution', count / seconds, error))
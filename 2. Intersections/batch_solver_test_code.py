@@ -0,0 +1,40 @@
+from batch_solver import solve_batch, CODE_MESSAGES, UNIQUE, NO_SOLUTION, INFINITE
+from linearsys import LinearSystem
+from hyperplane import Hyperplane
+from vector_alt import Vector
+
+
+def show(solutions, codes, n):
+    for i, code in enumerate(codes):
+        print(CODE_MESSAGES[code] + ':', [round(x, 6) for x in solutions[i*n:(i+1)*n]])
+
+
+print('2 x 2 Batch Test')
+coefficients = [[[4.046, 2.836], [10.115, 7.09]],        # coincident lines
+                [[7.204, 3.182], [8.172, 4.114]],        # one intersection
+                [[1.182, 5.562], [1.773, 8.343]],        # parallel lines
+                [[1, 2], [3, 4]]]
+constants = [[1.21, 3.025], [8.68, 9.883], [6.744, 9.525], [5, 6]]
+solutions, codes = solve_batch(coefficients, constants)
+show(solutions, codes, 2)
+print()
+
+print('3 x 3 Batch Test')
+coefficients = [[[1, 1, 1], [0, 2, 5], [2, 5, -1]],
+                [[1, 1, 1], [0, 1, 0], [1, 1, -1]],      # one solution
+                [[1, 1, 1], [0, 1, 0], [1, 2, 1]],       # dependent rows
+                [[1, 1, 1], [0, 1, 0], [1, 2, 1]]]       # inconsistent rows
+constants = [[6, -4, 27], [1, 2, 3], [1, 2, 3], [1, 2, 4]]
+solutions, codes = solve_batch(coefficients, constants)
+show(solutions, codes, 3)
+s = LinearSystem([Hyperplane(Vector(row), k) for row, k in zip(coefficients[0], constants[0])])
+print('LinearSystem:', s.compute_ge_solution())
+print()
+
+print('3 x 2 Batch Test')
+coefficients = [[[1, 0], [0, 1], [1, 1]], [[1, 0], [0, 1], [1, 1]]]
+constants = [[1, 2, 3], [1, 2, 4]]
+solutions, codes = solve_batch(coefficients, constants)
+show(solutions, codes, 2)
+print('Codes:', list(codes), codes[0] == UNIQUE, codes[1] == NO_SOLUTION, INFINITE)
+print()
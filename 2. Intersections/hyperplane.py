@@ -1,8 +1,13 @@
 from decimal import getcontext, Decimal
+from math import sqrt
+from fractions import Fraction
 from vector_alt import Vector
 
 getcontext().prec = 30
 
+# decimal places kept by canonical_equation, shared by Hyperplane, Plane and Line
+CANONICAL_DECIMALS = 9
+
 class Hyperplane(object):
 
     NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
@@ -27,7 +32,7 @@ class Hyperplane(object):
         if not constant_term:
             constant_term = 0
 
-        self.constant_term = Decimal(constant_term)
+        self.constant_term = normal_vector.number_type(constant_term)
         self.set_basepoint()
 
     def __eq__(self, p):
@@ -37,6 +42,8 @@ class Hyperplane(object):
                 return False
             else:
                 diff = self.constant_term - p.constant_term
+                if isinstance(diff, Fraction):
+                    return diff == 0
                 return MyDecimal(diff).is_near_zero()
         elif p.normal_vector.is_zero():
             return False
@@ -46,11 +53,21 @@ class Hyperplane(object):
 
         x0 = self.basepoint
         y0 = p.basepoint
-        basepoint_difference = Vector(x0.minus(y0))
+        basepoint_difference = Vector(x0.minus(y0), x0.backend)
         n = self.normal_vector
         return basepoint_difference.orthogonal(n)
 
 
+    def canonical_form(self):
+        '''
+        Output: tuple (u1, ..., un, d), see canonical_equation
+        Proportional equations get the same tuple, so it can key a dict for
+        deduplication in linear time.  It is not a __hash__: __eq__ compares
+        within a tolerance, which rounding cannot match.
+        '''
+        return canonical_equation(self.normal_vector.coordinates, self.constant_term)
+
+
     def __repr__(self):
 
         return 'Hyperplane(normal_vector = Vector(' + str([round(float(value), 3) for value in  self.normal_vector.coordinates]) + '), constant_term = ' + str(round(float(self.constant_term), 3)) +')'
@@ -120,7 +137,7 @@ class Hyperplane(object):
             initial_coefficient = n[initial_index]
 
             basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self.basepoint = Vector(basepoint_coords, self.normal_vector.backend)
 
         except Exception as e:
             if str(e) == Hyperplane.NO_NONZERO_ELTS_FOUND_MSG:
@@ -131,11 +148,40 @@ class Hyperplane(object):
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if isinstance(item, Fraction):
+                # the fraction backend is exact, so only a true 0 counts as zero
+                if item != 0:
+                    return k
+            elif not MyDecimal(item).is_near_zero():
                 return k
         raise Exception(Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
 
 
+def canonical_equation(coordinates, constant_term, digits=CANONICAL_DECIMALS):
+    '''
+    Input: normal vector coordinates n and constant term k of n.x = k
+    Output: tuple (u1, ..., un, d) for the unit normal u = n/|n| and d = k/|n|,
+    signed so that the first coordinate of u not rounding to 0 is positive, and
+    rounded to digits places; a zero normal gives zeros and the rounded k
+    Review: equations within __eq__ tolerance of each other can still straddle
+    a rounding boundary and get different tuples, so deduplication through the
+    tuple can miss them; it never merges equations further apart than the
+    rounding.
+    '''
+    n = [float(x) for x in coordinates]
+    k = float(constant_term)
+    magnitude = sqrt(sum([x*x for x in n]))
+    if magnitude < 1e-10:
+        return tuple([0.0]*len(n) + [round(k, digits) + 0.0])
+    sign = 1.0
+    for x in n:
+        if round(x/magnitude, digits) != 0:
+            sign = 1.0 if x > 0 else -1.0
+            break
+    scale = sign/magnitude
+    return tuple([round(x*scale, digits) + 0.0 for x in n] + [round(k*scale, digits) + 0.0])
+
+
 class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
         return abs(self) < eps
@@ -0,0 +1,253 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import heappush, heappop
+from math import sqrt
+from operator import mul, sub
+from vector_alt import Vector, VectorArray
+
+
+class HyperplaneIndex(object):
+
+    NO_PLANES_MSG = 'The index needs at least one hyperplane'
+    ZERO_NORMAL_MSG = 'Every hyperplane needs a nonzero normal vector'
+    DIMENSIONS_MUST_MATCH_MSG = 'The points must have the dimension of the hyperplanes'
+
+    def __init__(self, planes, leaf_size=64):
+        '''
+        Input: list of Hyperplane, Plane or Line objects of one dimension n,
+        number of planes per leaf of the tree
+        Review: plane k, n.x = c, is stored lifted as the point w_k = (u, d) in
+        n + 1 dimensions, u = n/|n| the unit normal and d = c/|n|.  For a point
+        p and q = (p, -1), <w_k, q> = u.p - d is the signed distance of p from
+        plane k.  The planes go into a ball tree on the normals: a node keeps
+        the center u_c and radius r of its unit normals and the range
+        [d_lo, d_hi] of its offsets, so every plane in it has a signed distance
+        in [u_c.p - r |p| - d_hi, u_c.p + r |p| - d_lo] and whole subtrees are
+        accepted or skipped at once.  Within a leaf the planes are sorted by d:
+        plane j is then within r |p| of u_c.p - d_j, so a bisection on d splits
+        the leaf into planes surely above the point, surely below it, and a
+        narrow band that is checked one by one.
+        '''
+        if not planes:
+            raise Exception(self.NO_PLANES_MSG)
+        self.dimension = planes[0].normal_vector.dimension
+        lifted = []
+        for p in planes:
+            normal = [float(x) for x in p.normal_vector.coordinates]
+            magnitude = sqrt(sum(map(mul, normal, normal)))
+            if len(normal) != self.dimension:
+                raise Exception(self.DIMENSIONS_MUST_MATCH_MSG)
+            if magnitude == 0:
+                raise Exception(self.ZERO_NORMAL_MSG)
+            lifted.append(tuple([x/magnitude for x in normal] + [float(p.constant_term)/magnitude]))
+
+        # normals and offsets in plane order, for the batched kernel
+        n = self.dimension
+        self.normals = VectorArray([x for w in lifted for x in w[:n]], n)
+        self.offsets = array('d', [w[n] for w in lifted])
+
+        # ball tree: node i covers the planes order[starts[i]:ends[i]], in the
+        # permuted order also used by self.lifted
+        self.leaf_size = leaf_size
+        self.order = list(range(len(lifted)))
+        self.centers = []
+        self.radii = []
+        self.offset_ranges = []
+        self.starts = []
+        self.ends = []
+        self.children = []
+        self.build(lifted, 0, len(lifted))
+        self.lifted = [lifted[k] for k in self.order]
+        self.sorted_offsets = [w[n] for w in self.lifted]
+        self.positions = array('l', bytes(array('l').itemsize * len(lifted)))
+        for position, k in enumerate(self.order):
+            self.positions[k] = position
+
+
+    def build(self, lifted, start, end):
+        '''
+        This adds the node for order[start:end] and its subtree, splitting at the
+        median of the normal coordinate with the largest spread; a leaf is
+        sorted by offset.
+        Output: index of the node
+        '''
+        node = len(self.centers)
+        n = self.dimension
+        members = [lifted[k] for k in self.order[start:end]]
+        center = [sum(column) / len(members) for column in zip(*members)][:n]
+        radius = max([sqrt(sum([(x - c)**2 for x, c in zip(w, center)])) for w in members])
+        self.centers.append(tuple(center))
+        self.radii.append(radius)
+        self.offset_ranges.append((min([w[n] for w in members]), max([w[n] for w in members])))
+        self.starts.append(start)
+        self.ends.append(end)
+        self.children.append(None)
+        if end - start > self.leaf_size:
+            spreads = [max(column) - min(column) for column in list(zip(*members))[:n]]
+            axis = spreads.index(max(spreads))
+            self.order[start:end] = sorted(self.order[start:end], key=lambda k: lifted[k][axis])
+            middle = (start + end) // 2
+            self.children[node] = (self.build(lifted, start, middle), self.build(lifted, middle, end))
+        else:
+            self.order[start:end] = sorted(self.order[start:end], key=lambda k: lifted[k][n])
+        return node
+
+
+    def __len__(self):
+        return len(self.offsets)
+
+
+    def __repr__(self):
+        return 'HyperplaneIndex({} hyperplanes, {} nodes)'.format(len(self), len(self.centers))
+
+
+    def lift(self, point):
+        '''
+        Output: (q, |p|) for q = (p, -1)
+        '''
+        if isinstance(point, Vector):
+            point = point.coordinates
+        if len(point) != self.dimension:
+            raise Exception(self.DIMENSIONS_MUST_MATCH_MSG)
+        q = tuple([float(x) for x in point] + [-1.0])
+        return q, sqrt(sum(map(mul, q, q)) - 1.0)
+
+
+    def bounds(self, node, q, p_norm):
+        '''
+        Output: (u_c.p, r |p|, lowest, highest) where lowest and highest bound
+        the signed distances of the point from the planes of the node
+        '''
+        value = sum(map(mul, self.centers[node], q))
+        margin = self.radii[node] * p_norm
+        d_lo, d_hi = self.offset_ranges[node]
+        return value, margin, value - margin - d_hi, value + margin - d_lo
+
+
+    def signed_distances(self, points):
+        '''
+        Input: VectorArray of M points, or a list of Vectors
+        Output: list with one array('d') per hyperplane, the signed distances of
+        all M points from it (positive on the side the normal points to)
+        Batched kernel: each hyperplane is one VectorArray dot product over the
+        whole batch, so no Vector is built per point.
+        '''
+        if not isinstance(points, VectorArray):
+            points = VectorArray.from_vectors(points)
+        if points.dimension != self.dimension:
+            raise Exception(self.DIMENSIONS_MUST_MATCH_MSG)
+        distances = []
+        for k in range(len(self)):
+            dots = points.dot_prod(self.normals[k])
+            distances.append(array('d', map(sub, dots, [self.offsets[k]] * len(dots))))
+        return distances
+
+
+    def sides(self, point, tol=1e-10):
+        '''
+        Output: array('b') with, for each hyperplane, 1 if the point is on the
+        side its normal points to, -1 on the other side, 0 within tol of it
+        A subtree whose planes all lie on one side is filled in one slice.
+        '''
+        q, p_norm = self.lift(point)
+        signs = array('b', bytes(len(self)))
+        positive = array('b', [1])
+        negative = array('b', [-1])
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            value, margin, lowest, highest = self.bounds(node, q, p_norm)
+            start, end = self.starts[node], self.ends[node]
+            if self.children[node] is not None and lowest <= tol and highest >= -tol:
+                stack.extend(self.children[node])
+                continue
+            # plane j is surely above the point when d_j < value - margin - tol,
+            # surely below it when d_j > value + margin + tol
+            above = bisect_left(self.sorted_offsets, value - margin - tol, start, end)
+            below = bisect_right(self.sorted_offsets, value + margin + tol, above, end)
+            signs[start:above] = positive * (above - start)
+            signs[below:end] = negative * (end - below)
+            for position in range(above, below):
+                distance = sum(map(mul, self.lifted[position], q))
+                signs[position] = 1 if distance > tol else (-1 if distance < -tol else 0)
+        return array('b', map(signs.__getitem__, self.positions))
+
+
+    def nearest(self, point):
+        '''
+        Output: (index, signed distance) of the hyperplane closest to the point
+        Best-first search: nodes are visited by the lower bound of |distance|
+        from their interval, and the search stops once that bound is no better
+        than the closest plane found.
+        '''
+        q, p_norm = self.lift(point)
+        best = None
+        best_distance = float('inf')
+        heap = [(0.0, 0)]
+        while heap:
+            bound, node = heappop(heap)
+            if bound >= best_distance:
+                break
+            if self.children[node] is None:
+                # walk out from d = u_c.p both ways while |u_c.p - d| - r |p| can still win
+                value, margin = self.bounds(node, q, p_norm)[:2]
+                start, end = self.starts[node], self.ends[node]
+                middle = bisect_left(self.sorted_offsets, value, start, end)
+                for positions in (range(middle, end), range(middle - 1, start - 1, -1)):
+                    for position in positions:
+                        if abs(value - self.sorted_offsets[position]) - margin >= best_distance:
+                            break
+                        distance = sum(map(mul, self.lifted[position], q))
+                        if abs(distance) < best_distance:
+                            best, best_distance, signed = position, abs(distance), distance
+                continue
+            for child in self.children[node]:
+                lowest, highest = self.bounds(child, q, p_norm)[2:]
+                child_bound = max(lowest, -highest, 0.0)
+                if child_bound < best_distance:
+                    heappush(heap, (child_bound, child))
+        return self.order[best], signed
+
+
+    def within(self, point, distance):
+        '''
+        Output: sorted list of the indices of the hyperplanes at most distance
+        away from the point
+        '''
+        q, p_norm = self.lift(point)
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            value, margin, lowest, highest = self.bounds(node, q, p_norm)
+            start, end = self.starts[node], self.ends[node]
+            if lowest > distance or highest < -distance:
+                continue
+            if -distance <= lowest and highest <= distance:
+                found.extend(self.order[start:end])
+            elif self.children[node] is None:
+                first = bisect_left(self.sorted_offsets, value - margin - distance, start, end)
+                last = bisect_right(self.sorted_offsets, value + margin + distance, first, end)
+                found.extend([self.order[position] for position in range(first, last)
+                              if abs(sum(map(mul, self.lifted[position], q))) <= distance])
+            else:
+                stack.extend(self.children[node])
+        return sorted(found)
+
+
+    def nearest_many(self, points):
+        '''
+        Output: list of (index, signed distance), one per point
+        '''
+        if isinstance(points, VectorArray):
+            points = points.to_vectors()
+        return [self.nearest(p) for p in points]
+
+
+    def sides_many(self, points, tol=1e-10):
+        '''
+        Output: list of sign arrays (see sides), one per point
+        '''
+        if isinstance(points, VectorArray):
+            points = points.to_vectors()
+        return [self.sides(p, tol) for p in points]
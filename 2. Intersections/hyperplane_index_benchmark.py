@@ -0,0 +1,47 @@
+import sys
+from random import uniform, seed
+from time import perf_counter
+from hyperplane import Hyperplane
+from hyperplane_index import HyperplaneIndex
+from vector_alt import Vector
+
+# Classifies M random points against K random planes in 3D: nearest plane,
+# sides and planes within 0.1, through HyperplaneIndex, and the nearest plane
+# by a loop of dot_prod calls over every plane for comparison.
+# Usage: python hyperplane_index_benchmark.py [K] [M]   (default K = 5000, M = 1000)
+
+K = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+M = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+seed(0)
+planes = [Hyperplane(Vector([uniform(-1, 1) for _ in range(3)], 'float64'), uniform(-10, 10)) for _ in range(K)]
+points = [Vector([uniform(-10, 10) for _ in range(3)], 'float64') for _ in range(M)]
+
+start = perf_counter()
+index = HyperplaneIndex(planes)
+print('HyperplaneIndex benchmark, {} planes, {} points, built in {:.3f} s'.format(K, M, perf_counter() - start))
+print('{:<30}{:>14}'.format('query', 'points/s'))
+
+start = perf_counter()
+nearest = index.nearest_many(points)
+print('{:<30}{:>14.0f}'.format('nearest', M / (perf_counter() - start)))
+
+start = perf_counter()
+index.sides_many(points)
+print('{:<30}{:>14.0f}'.format('sides', M / (perf_counter() - start)))
+
+start = perf_counter()
+for p in points:
+    index.within(p, 0.1)
+print('{:<30}{:>14.0f}'.format('within 0.1', M / (perf_counter() - start)))
+
+start = perf_counter()
+index.signed_distances(points)
+print('{:<30}{:>14.0f}'.format('signed_distances (batched)', M / (perf_counter() - start)))
+
+count = min(M, 50)
+units = [(Vector(p.normal_vector.normalize(), "float64"), p.constant_term / p.normal_vector.magnitude()) for p in planes]
+start = perf_counter()
+for p in points[:count]:
+    brute = min(range(K), key=lambda k: abs(units[k][0].dot_prod(p) - units[k][1]))
+seconds = perf_counter() - start
+print('{:<30}{:>14.0f}'.format('nearest, dot_prod loop', count / seconds))
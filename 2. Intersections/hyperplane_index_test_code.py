@@ -0,0 +1,34 @@
+from hyperplane import Hyperplane
+from plane import Plane
+from hyperplane_index import HyperplaneIndex
+from vector_alt import Vector
+
+# the planes x = k and y = k for k = 0..9, and 2z = 4
+planes = [Plane(Vector([1, 0, 0]), k) for k in range(10)] + [Plane(Vector([0, 1, 0]), k) for k in range(10)]
+planes.append(Plane(Vector([0, 0, 2]), 4))
+index = HyperplaneIndex(planes, leaf_size=4)
+print(repr(index))
+print()
+
+print('Nearest Test')
+print(index.nearest(Vector([3.4, 7.2, 0])))
+print(index.nearest(Vector([3.5, 7.6, 2.05])))
+print(index.nearest_many([Vector([-5, 20, 0]), Vector([0.5, 0.5, 0.5])]))
+print()
+
+print('Sides Test')
+print(list(index.sides(Vector([3.4, 7.2, 0]))))
+print(list(index.sides(Vector([3, 7, 2]))))
+print()
+
+print('Within Test')
+print(index.within(Vector([3.4, 7.2, 0]), 0.5))
+print(index.within(Vector([3.4, 7.2, 2.5]), 1))
+print()
+
+print('Signed Distances Test')
+distances = index.signed_distances([Vector([3.4, 7.2, 0]), Vector([0, 0, 5])])
+print([round(d, 3) for d in distances[3]], [round(d, 3) for d in distances[20]])
+h = Hyperplane(Vector([1, 1, 1, 1]), 2)
+print(HyperplaneIndex([h]).nearest(Vector([1, 1, 1, 1])))
+print()
@@ -0,0 +1,184 @@
+from math import sqrt
+from operator import add, sub, mul
+
+# Iterative solvers for a square system A x = b, shared by LinearSystem and
+# SparseLinearSystem.  They are matrix-free: A is only used through its rows,
+# given as (indices, values) pairs holding the nonzero coefficients, so a row
+# costs its number of nonzeros.  All arithmetic is in floats.
+
+METHODS = ('cg', 'jacobi', 'gauss_seidel', 'gmres')
+UNKNOWN_METHOD_MSG = 'The iterative method must be one of: cg, jacobi, gauss_seidel, gmres'
+ZERO_DIAGONAL_MSG = 'Jacobi and Gauss-Seidel need a nonzero coefficient on every diagonal entry'
+
+
+def solve_iterative(rows, b, method='cg', tol=1e-10, maxiter=None, x0=None, callback=None, restart=30):
+    '''
+    Input: rows of A as (indices, values) pairs, constant terms b, method name,
+    relative tolerance, iteration limit (default 10 * n), initial guess x0
+    (warm start, default zeros), callback(iteration, residual_norm) called after
+    every iteration, and the GMRES restart length.
+    Output: (x, converged) where converged means ||b - A x|| <= tol * ||b||
+    cg needs A symmetric positive definite; jacobi and gauss_seidel need it
+    diagonally dominant (or SPD for gauss_seidel); gmres works for any
+    nonsingular A.
+    '''
+    if method not in METHODS:
+        raise Exception(UNKNOWN_METHOD_MSG)
+    n = len(rows)
+    b = [float(x) for x in b]
+    x = [float(v) for v in x0] if x0 is not None else [0.0] * n
+    if maxiter is None:
+        maxiter = 10 * n
+    target = tol * (norm(b) or 1.0)
+    solver = {'cg': conjugate_gradient, 'jacobi': jacobi, 'gauss_seidel': gauss_seidel, 'gmres': gmres}[method]
+    if method == 'gmres':
+        return solver(rows, b, x, target, maxiter, callback, restart)
+    return solver(rows, b, x, target, maxiter, callback)
+
+
+def float_rows(coefficient_rows):
+    '''
+    Input: dense coefficient rows (lists or Vectors' coordinates)
+    Output: the (indices, values) form used by the solvers, zeros dropped
+    '''
+    rows = []
+    for row in coefficient_rows:
+        indices = [j for j, value in enumerate(row) if value != 0]
+        rows.append((indices, [float(row[j]) for j in indices]))
+    return rows
+
+
+def matvec(rows, x):
+    get = x.__getitem__
+    return [sum(map(mul, values, map(get, indices))) for indices, values in rows]
+
+
+def norm(v):
+    return sqrt(sum(map(mul, v, v)))
+
+
+def dot(v, w):
+    return sum(map(mul, v, w))
+
+
+def diagonal(rows):
+    '''
+    Output: list of the diagonal coefficients; raises if one of them is zero
+    '''
+    d = []
+    for i, (indices, values) in enumerate(rows):
+        a_ii = dict(zip(indices, values)).get(i, 0.0)
+        if a_ii == 0:
+            raise Exception(ZERO_DIAGONAL_MSG)
+        d.append(a_ii)
+    return d
+
+
+def conjugate_gradient(rows, b, x, target, maxiter, callback):
+    r = list(map(sub, b, matvec(rows, x)))
+    p = r[:]
+    rr = dot(r, r)
+    for iteration in range(1, maxiter + 1):
+        if sqrt(rr) <= target:
+            return x, True
+        ap = matvec(rows, p)
+        alpha = rr / dot(p, ap)
+        x = [xi + alpha*pi for xi, pi in zip(x, p)]
+        r = [ri - alpha*api for ri, api in zip(r, ap)]
+        rr_new = dot(r, r)
+        if callback:
+            callback(iteration, sqrt(rr_new))
+        p = [ri + (rr_new/rr)*pi for ri, pi in zip(r, p)]
+        rr = rr_new
+    return x, sqrt(rr) <= target
+
+
+def jacobi(rows, b, x, target, maxiter, callback):
+    '''
+    x_new = x + D^-1 (b - A x); one product with A per iteration gives both the
+    residual of x and the update.
+    '''
+    d = diagonal(rows)
+    r = list(map(sub, b, matvec(rows, x)))
+    for iteration in range(1, maxiter + 1):
+        if norm(r) <= target:
+            return x, True
+        x = [xi + ri/di for xi, ri, di in zip(x, r, d)]
+        r = list(map(sub, b, matvec(rows, x)))
+        if callback:
+            callback(iteration, norm(r))
+    return x, norm(r) <= target
+
+
+def gauss_seidel(rows, b, x, target, maxiter, callback):
+    '''
+    Like Jacobi, but each x_i is updated in place, so the rows below already
+    use the new values within the same sweep.
+    '''
+    d = diagonal(rows)
+    get = x.__getitem__
+    residual = norm(list(map(sub, b, matvec(rows, x))))
+    for iteration in range(1, maxiter + 1):
+        if residual <= target:
+            return x, True
+        for i, (indices, values) in enumerate(rows):
+            x[i] += (b[i] - sum(map(mul, values, map(get, indices)))) / d[i]
+        residual = norm(list(map(sub, b, matvec(rows, x))))
+        if callback:
+            callback(iteration, residual)
+    return x, residual <= target
+
+
+def gmres(rows, b, x, target, maxiter, callback, restart):
+    '''
+    Restarted GMRES: each cycle builds an orthonormal Krylov basis of up to
+    restart vectors by Arnoldi (modified Gram-Schmidt) and keeps the small
+    least squares problem triangular with Givens rotations, so the residual
+    norm is known at every step without forming x.
+    '''
+    n = len(rows)
+    iteration = 0
+    while iteration < maxiter:
+        r = list(map(sub, b, matvec(rows, x)))
+        beta = norm(r)
+        if beta <= target:
+            return x, True
+        basis = [[ri/beta for ri in r]]
+        h = []                  # columns of the Hessenberg matrix, rotated
+        cs = []
+        sn = []
+        g = [beta]              # rotated right hand side beta * e1
+        for k in range(min(restart, n)):
+            iteration += 1
+            w = matvec(rows, basis[k])
+            column = []
+            for v in basis:
+                hik = dot(w, v)
+                column.append(hik)
+                w = [wi - hik*vi for wi, vi in zip(w, v)]
+            h_next = norm(w)
+            for i in range(k):
+                column[i], column[i+1] = (cs[i]*column[i] + sn[i]*column[i+1],
+                                          -sn[i]*column[i] + cs[i]*column[i+1])
+            denominator = sqrt(column[k]**2 + h_next**2)
+            cs.append(column[k]/denominator)
+            sn.append(h_next/denominator)
+            column[k] = denominator
+            g.append(-sn[k]*g[k])
+            g[k] = cs[k]*g[k]
+            h.append(column)
+            if callback:
+                callback(iteration, abs(g[k+1]))
+            if abs(g[k+1]) <= target or h_next == 0 or iteration >= maxiter:
+                break
+            basis.append([wi/h_next for wi in w])
+
+        # back substitution for the Krylov coefficients, then x += V y
+        m = len(h)
+        y = [0.0] * m
+        for i in reversed(range(m)):
+            y[i] = (g[i] - sum([h[j][i]*y[j] for j in range(i+1, m)])) / h[i][i]
+        for yi, v in zip(y, basis):
+            x = list(map(add, x, [yi*vi for vi in v]))
+    residual = norm(list(map(sub, b, matvec(rows, x))))
+    return x, residual <= target
@@ -0,0 +1,31 @@
+import sys
+from time import perf_counter
+from sparse_linearsys import SparseLinearSystem
+
+# Solves the 5-point Laplacian on a k x k grid (k*k variables, symmetric
+# positive definite) with SparseLinearSystem.solve_iterative and reports the
+# iterations, final residual and time per method.  Jacobi and Gauss-Seidel need
+# O(k^2) iterations on this problem, so they only run for small grids.
+# Usage: python iterative_benchmark.py [k]   (default k = 100, ie. 10000 variables)
+
+k = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+equations = []
+for r in range(k):
+    for c in range(k):
+        coefficients = {r*k + c: 4.0}
+        for rr, cc in ((r-1, c), (r+1, c), (r, c-1), (r, c+1)):
+            if 0 <= rr < k and 0 <= cc < k:
+                coefficients[rr*k + cc] = -1.0
+        equations.append((coefficients, 1.0))
+s = SparseLinearSystem.from_equations(equations, k*k, 'float64')
+
+print('solve_iterative benchmark, {} variables, {} nonzeros'.format(k*k, s.nnz))
+print('{:<14}{:>12}{:>14}{:>10}'.format('method', 'iterations', 'residual', 'time (s)'))
+methods = ['cg', 'gmres'] + (['jacobi', 'gauss_seidel'] if k <= 30 else [])
+for method in methods:
+    residuals = []
+    start = perf_counter()
+    s.solve_iterative(method, tol=1e-8, maxiter=100000, callback=lambda i, r: residuals.append(r))
+    seconds = perf_counter() - start
+    print('{:<14}{:>12}{:>14.2e}{:>10.3f}'.format(method, len(residuals), residuals[-1], seconds))
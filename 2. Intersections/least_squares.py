@@ -0,0 +1,138 @@
+from math import sqrt, hypot
+from operator import mul
+from vector_alt import Vector
+
+
+def householder_least_squares(coefficient_rows, constant_terms, tol=1e-10):
+    '''
+    Input: m coefficient rows of n values, m constant terms, relative tolerance
+    Output: (x, residual_norm, rank) minimizing ||A x - b||
+    Householder QR with column pivoting: at step k the remaining column with the
+    largest norm is swapped to position k and reflected onto e_k, so A is never
+    squared as in the normal equations.  Columns whose remaining norm is below
+    tol times the largest column norm count as dependent; their variables are
+    set to 0 (basic solution).
+    '''
+    rows = [[float(x) for x in row] for row in coefficient_rows]
+    constants = [float(x) for x in constant_terms]
+    m = len(rows)
+    n = len(rows[0])
+    columns = [[row[j] for row in rows] for j in range(n)]
+    b = constants[:]
+    permutation = list(range(n))
+    norms = [sqrt(sum(map(mul, column, column))) for column in columns]
+    largest = max(norms) if norms else 0.0
+
+    rank = 0
+    for k in range(min(m, n)):
+        p = max(range(k, n), key=lambda j: norms[j])
+        if norms[p] <= tol * largest or norms[p] == 0:
+            break
+        columns[k], columns[p] = columns[p], columns[k]
+        norms[k], norms[p] = norms[p], norms[k]
+        permutation[k], permutation[p] = permutation[p], permutation[k]
+
+        x = columns[k][k:]
+        alpha = sqrt(sum(map(mul, x, x)))
+        if x[0] > 0:
+            alpha = -alpha
+        v = x
+        v[0] -= alpha
+        vv = sum(map(mul, v, v))
+        for j in range(k+1, n):
+            column = columns[j]
+            factor = 2 * sum(map(mul, v, column[k:])) / vv
+            column[k:] = [c - factor*vi for c, vi in zip(column[k:], v)]
+            norms[j] = sqrt(sum(map(mul, column[k+1:], column[k+1:])))
+        factor = 2 * sum(map(mul, v, b[k:])) / vv
+        b[k:] = [c - factor*vi for c, vi in zip(b[k:], v)]
+        columns[k][k] = alpha
+        rank += 1
+
+    # back substitution on the leading rank x rank block of R
+    y = [0.0] * rank
+    for i in reversed(range(rank)):
+        y[i] = (b[i] - sum([columns[j][i]*y[j] for j in range(i+1, rank)])) / columns[i][i]
+    solution = [0.0] * n
+    for i in range(rank):
+        solution[permutation[i]] = y[i]
+
+    residual = [sum(map(mul, row, solution)) - c for row, c in zip(rows, constants)]
+    return solution, sqrt(sum([r*r for r in residual])), rank
+
+
+class StreamingLeastSquares(object):
+
+    DIMENSIONS_MUST_MATCH_MSG = 'Every equation must have one coefficient per variable'
+
+    def __init__(self, dimension, tol=1e-10):
+        '''
+        Input: number of variables, relative tolerance for the rank decision
+        Review: only the n x n triangular factor R, Q^T b (n values) and the sum of
+        squares of the residual part are kept, so memory is O(n^2) however many
+        equations are folded in.
+        '''
+        self.dimension = dimension
+        self.tol = tol
+        self.r = [[0.0] * dimension for _ in range(dimension)]
+        self.qtb = [0.0] * dimension
+        self.residual_squares = 0.0
+        self.count = 0
+
+
+    def __len__(self):
+        return self.count
+
+
+    def add_equation(self, coefficients, constant_term):
+        '''
+        Input: one equation, coefficients as a Vector or list, and its constant term
+        Givens rotations fold the row into R one entry at a time; what is left of
+        the constant term after all n rotations is residual.
+        '''
+        if isinstance(coefficients, Vector):
+            coefficients = coefficients.coordinates
+        if len(coefficients) != self.dimension:
+            raise Exception(self.DIMENSIONS_MUST_MATCH_MSG)
+        row = [float(x) for x in coefficients]
+        beta = float(constant_term)
+        for k in range(self.dimension):
+            if row[k] == 0:
+                continue
+            r_k = self.r[k]
+            radius = hypot(r_k[k], row[k])
+            c = r_k[k] / radius
+            s = row[k] / radius
+            for j in range(k, self.dimension):
+                r_k[j], row[j] = c*r_k[j] + s*row[j], c*row[j] - s*r_k[j]
+            self.qtb[k], beta = c*self.qtb[k] + s*beta, c*beta - s*self.qtb[k]
+        self.residual_squares += beta*beta
+        self.count += 1
+
+
+    def add_equations(self, equations):
+        '''
+        Input: iterable of (coefficients, constant_term), eg. a generator over a file
+        '''
+        for coefficients, constant_term in equations:
+            self.add_equation(coefficients, constant_term)
+
+
+    def solution(self):
+        '''
+        Output: (float64 Vector x, residual_norm, rank) for the equations so far
+        Diagonal entries of R below tol times the largest one count as dependent
+        and their variables are set to 0.
+        '''
+        n = self.dimension
+        r = self.r
+        largest = max([abs(r[k][k]) for k in range(n)])
+        independent = [abs(r[k][k]) > self.tol * largest and r[k][k] != 0 for k in range(n)]
+        x = [0.0] * n
+        for i in reversed(range(n)):
+            if independent[i]:
+                x[i] = (self.qtb[i] - sum(map(mul, r[i][i+1:], x[i+1:]))) / r[i][i]
+        # rows of R left out of the solve add their misfit to the residual
+        misfit = [sum(map(mul, r[i][i:], x[i:])) - self.qtb[i] for i in range(n)]
+        residual = sqrt(self.residual_squares + sum([d*d for d in misfit]))
+        return Vector(x, 'float64'), residual, sum(independent)
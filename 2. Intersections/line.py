@@ -1,6 +1,8 @@
 from decimal import Decimal, getcontext
+from fractions import Fraction
 
 from vector_alt import Vector
+from hyperplane import canonical_equation
 
 getcontext().prec = 30
 
@@ -20,7 +22,7 @@ class Line(object):
         if not constant_term:
             constant_term = 0
             
-        self.constant_term = Decimal(constant_term)
+        self.constant_term = normal_vector.number_type(constant_term)
         self.set_basepoint()
         
     def __eq__(self, ell):
@@ -30,6 +32,8 @@ class Line(object):
                 return False
             else:
                 diff = self.constant_term - ell.constant_term
+                if isinstance(diff, Fraction):
+                    return diff == 0
                 return MyDecimal(diff).is_near_zero()
         elif ell.normal_vector.is_zero():
             return False
@@ -39,10 +43,17 @@ class Line(object):
         
         x0 = self.basepoint
         y0 = ell.basepoint
-        basepoint_difference = Vector(x0.minus(y0))
+        basepoint_difference = Vector(x0.minus(y0), x0.backend)
         n = self.normal_vector
         return basepoint_difference.orthogonal(n)
 
+    def canonical_form(self):
+        '''
+        Output: (u1, u2, d), see hyperplane.canonical_equation
+        '''
+        return canonical_equation(self.normal_vector.coordinates, self.constant_term)
+
+
     def __repr__(self):
         
         return 'Line(normal_vector = Vector(' + str([value for value in  self.normal_vector.coordinates]) + '), constant_term = ' + str(self.constant_term) +')'
@@ -111,9 +122,10 @@ class Line(object):
             
             x_numerator = D*k1 - B*k2
             y_numerator = -C*k1 + A*k2
-            one_over_denom = Decimal(1.0)/round((A*D - B*C), 10)
+            one_over_denom = self.normal_vector.number_type(1.0)/round((A*D - B*C), 10)
 ##            print(A*D - B*C)
-            return Vector(Vector([x_numerator, y_numerator]).scalar_mult(one_over_denom))
+            backend = self.normal_vector.backend
+            return Vector(Vector([x_numerator, y_numerator], backend).scalar_mult(one_over_denom), backend)
         
         except ZeroDivisionError:
             if self == ell:
@@ -135,7 +147,7 @@ class Line(object):
             initial_coefficient = n[initial_index]
 
             basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self.basepoint = Vector(basepoint_coords, self.normal_vector.backend)
 #            return basepoint_coords
 
         except Exception as e:
@@ -148,7 +160,11 @@ class Line(object):
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if isinstance(item, Fraction):
+                # the fraction backend is exact, so only a true 0 counts as zero
+                if item != 0:
+                    return k
+            elif not MyDecimal(item).is_near_zero():
                 return k
         raise Exception(Line.NO_NONZERO_ELTS_FOUND_MSG)
 
@@ -0,0 +1,169 @@
+from array import array
+from itertools import compress, count
+from line import Line
+from sweep_line import clip_line, sweep_intersections, grid_intersections
+from vector_alt import Vector
+
+
+class LineSet(object):
+
+    LENGTHS_MUST_MATCH_MSG = 'There must be as many a, b and c coefficients as lines'
+    INDEX_LENGTHS_MUST_MATCH_MSG = 'There must be as many first as second line indices'
+    INDEX_OUT_OF_RANGE_MSG = 'Every line index must be below the number of lines'
+    UNKNOWN_BOX_METHOD_MSG = 'The box intersection method must be one of: sweep, grid'
+
+    # classification codes of a pair of lines
+    INTERSECTING = 0
+    PARALLEL = 1
+    COINCIDENT = 2
+
+    def __init__(self, a, b, c):
+        '''
+        Input: coefficients of N lines a[i] x + b[i] y = c[i]
+        Review: the lines are stored as three array('d') columns instead of N
+        Line objects, so intersections run on floats over whole columns at once.
+        Each line is scaled so that |a| + |b| = 1 (the same line), which makes
+        the parallel test a plain comparison with tol.
+        '''
+        if not len(a) == len(b) == len(c):
+            raise Exception(self.LENGTHS_MUST_MATCH_MSG)
+        self.a = array('d')
+        self.b = array('d')
+        self.c = array('d')
+        for ai, bi, ci in zip(a, b, c):
+            ai, bi, ci = float(ai), float(bi), float(ci)
+            scale = abs(ai) + abs(bi) or 1.0
+            self.a.append(ai / scale)
+            self.b.append(bi / scale)
+            self.c.append(ci / scale)
+
+
+    @classmethod
+    def from_lines(cls, lines):
+        '''
+        Input: iterable of Line objects
+        '''
+        a, b, c = [], [], []
+        for ell in lines:
+            n = ell.normal_vector.coordinates
+            a.append(float(n[0]))
+            b.append(float(n[1]))
+            c.append(float(ell.constant_term))
+        return cls(a, b, c)
+
+
+    def __len__(self):
+        return len(self.a)
+
+
+    def __getitem__(self, i):
+        return Line(Vector([self.a[i], self.b[i]], 'float64'), self.c[i])
+
+
+    def __repr__(self):
+        return 'LineSet({} lines)'.format(len(self))
+
+
+    def intersections(self, first, second, tol=1e-10):
+        '''
+        Input: two equally long sequences of line indices, the pairs being
+        (first[k], second[k]), and the relative tolerance of the parallel test;
+        ValueError if the two lengths differ
+        Output: (x, y, codes), array('d'), array('d') and array('b') with one
+        entry per pair
+        Two lines count as parallel when a1 b2 - b1 a2 is below tol (with the
+        lines scaled to |a| + |b| = 1); the code is then PARALLEL or COINCIDENT and
+        x, y are NaN.  Otherwise the code is INTERSECTING and (x, y) comes from
+        Cramer's rule.
+        '''
+        if len(first) != len(second):
+            raise ValueError(self.INDEX_LENGTHS_MUST_MATCH_MSG)
+        n = len(self)
+        if len(first) and (min(first) < 0 or max(first) >= n or min(second) < 0 or max(second) >= n):
+            raise Exception(self.INDEX_OUT_OF_RANGE_MSG)
+        columns = []
+        for values in (self.a.tolist(), self.b.tolist(), self.c.tolist()):
+            columns.append(([values[i] for i in first], [values[j] for j in second]))
+        (a1, a2), (b1, b2), (c1, c2) = columns
+        return self.intersect_columns(a1, b1, c1, a2, b2, c2, tol)
+
+
+    def pairwise_intersections(self, tol=1e-10):
+        '''
+        Output: (first, second, x, y, codes) for all N (N - 1) / 2 pairs i < j,
+        ordered by i then j; first and second are array('l') of the indices, the
+        rest as in intersections.
+        Each line i is intersected with the slice of lines after it, so no index
+        lists need to be gathered.
+        '''
+        first = array('l')
+        second = array('l')
+        x = array('d')
+        y = array('d')
+        codes = array('b')
+        n = len(self)
+        a, b, c = self.a.tolist(), self.b.tolist(), self.c.tolist()
+        for i in range(n - 1):
+            m = n - i - 1
+            xi, yi, ci = self.intersect_columns([a[i]]*m, [b[i]]*m, [c[i]]*m, a[i+1:], b[i+1:], c[i+1:], tol)
+            first.extend([i]*m)
+            second.extend(range(i+1, n))
+            x.extend(xi)
+            y.extend(yi)
+            codes.extend(ci)
+        return first, second, x, y, codes
+
+
+    def clip_to_box(self, xmin, ymin, xmax, ymax, tol=1e-10):
+        '''
+        Output: list of segments (i, a, b, c, x1, y1, x2, y2), the part of each
+        line i that crosses the box, as used by the sweep_line module
+        '''
+        segments = []
+        for i, (a, b, c) in enumerate(zip(self.a, self.b, self.c)):
+            ends = clip_line(a, b, c, xmin, ymin, xmax, ymax, tol)
+            if ends is not None:
+                segments.append((i, a, b, c) + ends)
+        return segments
+
+
+    def box_intersections(self, xmin, ymin, xmax, ymax, method='sweep', tol=1e-10):
+        '''
+        Input: bounding box, method ('sweep' or 'grid'), tolerance
+        Output: generator of (i, j, x, y), i < j, for every pair of lines crossing
+        inside the box; parallel and coincident pairs are not reported.
+        sweep is a Bentley-Ottmann sweep, O((N + K) log N) for K crossings;
+        grid buckets the lines into about sqrt(N) x sqrt(N) cells.  Both stream
+        the crossings as they are found, in no particular order.
+        '''
+        if method not in ('sweep', 'grid'):
+            raise Exception(self.UNKNOWN_BOX_METHOD_MSG)
+        segments = self.clip_to_box(xmin, ymin, xmax, ymax, tol)
+        if method == 'sweep':
+            return sweep_intersections(segments, tol)
+        return grid_intersections(segments, xmin, ymin, xmax, ymax, tol)
+
+
+    def intersect_columns(self, a1, b1, c1, a2, b2, c2, tol=1e-10):
+        '''
+        This intersects line k of the first columns with line k of the second
+        ones, for every k.  Determinants and coordinates are list comprehensions
+        over the zipped columns; only the (rare) parallel pairs are classified
+        one by one.
+        '''
+        det = [p*s - q*r for p, q, r, s in zip(a1, b1, a2, b2)]
+        codes = array('b', bytes(len(det)))
+        if det and min(map(abs, det)) <= tol:
+            for k in compress(count(), map(float(tol).__ge__, map(abs, det))):
+                # parallel lines coincide when both Cramer numerators vanish too
+                bound = tol * max(1.0, abs(c1[k]) + abs(c2[k]))
+                if (abs(c1[k]*b2[k] - b1[k]*c2[k]) <= bound and
+                        abs(a1[k]*c2[k] - c1[k]*a2[k]) <= bound):
+                    codes[k] = self.COINCIDENT
+                else:
+                    codes[k] = self.PARALLEL
+                # x / NaN is NaN, so the coordinates below need no special case
+                det[k] = float('nan')
+        x = array('d', [(p*s - q*r)/d for p, q, r, s, d in zip(c1, b1, c2, b2, det)])
+        y = array('d', [(p*s - q*r)/d for p, q, r, s, d in zip(a1, c1, a2, c2, det)])
+        return x, y, codes
@@ -0,0 +1,37 @@
+import sys
+from random import uniform, randrange, seed
+from time import perf_counter
+from line import Line
+from line_set import LineSet
+from vector_alt import Vector
+
+# Intersects all pairs of N random lines with LineSet.pairwise_intersections,
+# then 10^6 random indexed pairs with LineSet.intersections, and times the
+# first 10000 of those pairs with Line.intersection_with for comparison.
+# Usage: python line_set_benchmark.py [N]   (default N = 1415, ie. about 10^6 pairs)
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1415
+seed(0)
+s = LineSet([uniform(-10, 10) for _ in range(N)], [uniform(-10, 10) for _ in range(N)],
+            [uniform(-10, 10) for _ in range(N)])
+
+print('LineSet benchmark, {} lines'.format(N))
+print('{:<26}{:>10}{:>12}{:>14}'.format('method', 'pairs', 'time (s)', 'pairs/s'))
+start = perf_counter()
+first, second, x, y, codes = s.pairwise_intersections()
+seconds = perf_counter() - start
+print('{:<26}{:>10}{:>12.3f}{:>14.0f}'.format('pairwise_intersections', len(codes), seconds, len(codes) / seconds))
+
+first = [randrange(N) for _ in range(10**6)]
+second = [randrange(N) for _ in range(10**6)]
+start = perf_counter()
+x, y, codes = s.intersections(first, second)
+seconds = perf_counter() - start
+print('{:<26}{:>10}{:>12.3f}{:>14.0f}'.format('intersections', len(codes), seconds, len(codes) / seconds))
+
+lines = [Line(Vector([s.a[i], s.b[i]]), s.c[i]) for i in range(N)]
+start = perf_counter()
+for i, j in zip(first[:10000], second[:10000]):
+    lines[i].intersection_with(lines[j])
+seconds = perf_counter() - start
+print('{:<26}{:>10}{:>12.3f}{:>14.0f}'.format('Line.intersection_with', 10000, seconds, 10000 / seconds))
@@ -0,0 +1,29 @@
+import sys
+from random import uniform, seed
+from time import perf_counter
+from line_set import LineSet
+
+# Counts the crossings inside the box [-1, 1] x [-1, 1] of N random lines
+# a x + b y = c, with |c| up to 10 so most lines miss the box, with
+# LineSet.box_intersections ('sweep' and 'grid') and, for N <= 3000, with
+# pairwise_intersections filtered to the box.
+# Usage: python line_set_sweep_benchmark.py [N]   (default N = 3000)
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+seed(0)
+s = LineSet([uniform(-1, 1) for _ in range(N)], [uniform(-1, 1) for _ in range(N)],
+            [uniform(-10, 10) for _ in range(N)])
+box = (-1, -1, 1, 1)
+
+print('box_intersections benchmark, {} lines, {} cross the box'.format(N, len(s.clip_to_box(*box))))
+print('{:<24}{:>12}{:>12}'.format('method', 'crossings', 'time (s)'))
+for method in ('sweep', 'grid'):
+    start = perf_counter()
+    crossings = sum(1 for crossing in s.box_intersections(*box, method=method))
+    print('{:<24}{:>12}{:>12.3f}'.format(method, crossings, perf_counter() - start))
+
+if N <= 3000:
+    start = perf_counter()
+    first, second, x, y, codes = s.pairwise_intersections()
+    crossings = sum([1 for xk, yk in zip(x, y) if -1 <= xk <= 1 and -1 <= yk <= 1])
+    print('{:<24}{:>12}{:>12.3f}'.format('pairwise_intersections', crossings, perf_counter() - start))
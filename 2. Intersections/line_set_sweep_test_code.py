@@ -0,0 +1,34 @@
+from line_set import LineSet
+
+# x = 0, y = 0, x + y = 0 and x - y = 0 all cross at the origin; y = 0.5 is
+# listed twice; x + y = 3 misses the box; 2x = 1 is vertical.
+s = LineSet([1, 0, 1, 1, 0, 0, 1, 2], [0, 1, 1, -1, 1, 2, 1, 0], [0, 0, 0, 0, 0.5, 1, 3, 1])
+box = (-1, -1, 1, 1)
+print('Clipped Segments Test')
+for segment in s.clip_to_box(*box):
+    print(segment[0], [round(value, 3) for value in segment[4:]])
+print()
+
+for method in ('sweep', 'grid'):
+    print(method.capitalize(), 'Test')
+    crossings = sorted(s.box_intersections(*box, method=method))
+    for i, j, x, y in crossings:
+        print(i, j, round(x, 3) + 0, round(y, 3) + 0)
+    print('Crossings:', len(crossings))
+    print()
+
+print('Small Box Test')
+print(sorted([(i, j) for i, j, x, y in s.box_intersections(0.1, 0.1, 1, 1)]))
+print(sorted([(i, j) for i, j, x, y in s.box_intersections(0.1, 0.1, 1, 1, method='grid')]))
+print()
+print('Box Edge Test')
+# -3x + 2y = -3 and y = 1.5 cross at (2, 1.5), the right end of both segments;
+# x = 1 is vertical and meets 2x - 3y = -4 at the top edge (1, 2); x + y = 0,
+# x - y = 0 and 2x + y = 0 cross at the origin, a corner of the second box
+edges = LineSet([-3, 0, 1, 2, 1, 1, 2], [2, 2, 0, -3, 1, -1, 1], [-3, 3, 1, -4, 0, 0, 0])
+for box in [(-2, -2, 2, 2), (0, 0, 2, 2), (-1, -1, 1, 1)]:
+    sweep = sorted([(i, j, round(x, 3) + 0, round(y, 3) + 0) for i, j, x, y in edges.box_intersections(*box)])
+    grid = sorted([(i, j, round(x, 3) + 0, round(y, 3) + 0) for i, j, x, y in edges.box_intersections(*box, method='grid')])
+    print(box, sweep, sweep == grid)
+print([(i, j, round(x, 3), round(y, 3)) for i, j, x, y in LineSet([-3, 0], [2, 2], [-3, 3]).box_intersections(-2, -2, 2, 2)])
+print()
@@ -0,0 +1,37 @@
+from vector_alt import Vector
+from line import Line
+from line_set import LineSet
+
+
+lines = [Line(Vector((4.046, 2.836)), 1.21),
+         Line(Vector((10.115, 7.09)), 3.025),          # coincides with line 0
+         Line(Vector((7.204, 3.182)), 8.68),
+         Line(Vector((8.172, 4.114)), 9.883),
+         Line(Vector((1.182, 5.562)), 6.744),
+         Line(Vector((1.773, 8.343)), 9.525)]          # parallel to line 4
+s = LineSet.from_lines(lines)
+names = {LineSet.INTERSECTING: 'intersecting', LineSet.PARALLEL: 'parallel', LineSet.COINCIDENT: 'coincident'}
+print(repr(s))
+print('Line 2:', s[2])
+print()
+
+print('Indexed Pairs Test')
+x, y, codes = s.intersections([0, 2, 4, 0], [1, 3, 5, 2])
+for k in range(len(codes)):
+    print(names[codes[k]], round(x[k], 3), round(y[k], 3))
+print('Line.intersection_with:', lines[2].intersection_with(lines[3]))
+try:
+    s.intersections([0, 2, 4], [1, 3])
+except ValueError as e:
+    print('Mismatched indices:', e)
+print()
+
+print('Pairwise Test')
+first, second, x, y, codes = s.pairwise_intersections()
+print('Pairs:', len(codes))
+for i, j, xk, yk, code in zip(first, second, x, y, codes):
+    if code != LineSet.INTERSECTING:
+        print(i, j, names[code])
+k = list(zip(first, second)).index((2, 3))
+print('Pair (2, 3):', round(x[k], 3), round(y[k], 3))
+print()
@@ -27,4 +27,17 @@ n2 = Vector((1.773, 8.343))
 k2 = 9.525
 ell1 = Line(n1, k1)
 ell2 = Line(n2, k2)
-print('Calculate Intersection:', ell1.intersection_with(ell2))
\ No newline at end of file
+print('Calculate Intersection:', ell1.intersection_with(ell2))
+print()
+print('Canonical Form Test')
+ell1 = Line(Vector((4.046, 2.836)), 1.21)
+ell2 = Line(Vector((10.115, 7.09)), 3.025)
+print(ell1.canonical_form(), ell1 == ell2, ell1.canonical_form() == ell2.canonical_form())
+print('Distinct lines:', len(set([ell.canonical_form() for ell in [ell1, ell2, Line(Vector((0, -2)), 4)]])),
+      Line(Vector((0, -2)), 4).canonical_form())
+print()
+print('Fraction Backend Test')
+ell1 = Line(Vector((0, 1), 'fraction'), 3)
+ell2 = Line(Vector((1, 1), 'fraction'), 5)
+print(ell1, '|', ell2, '| Equal to scaled copy?', ell1 == Line(Vector((0, 2), 'fraction'), 6))
+print('Calculate Intersection:', ell1.intersection_with(ell2))
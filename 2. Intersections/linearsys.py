@@ -1,15 +1,33 @@
 from decimal import Decimal, getcontext
-from copy import deepcopy
+from fractions import Fraction
+from math import lcm
 from vector_alt import Vector
 from hyperplane import Hyperplane
+from iterative import solve_iterative, float_rows
+from least_squares import householder_least_squares
 
 getcontext().prec = 30
 
 class LinearSystem(object):
 
     ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG = 'All planes in the system should live in the same dimension'
+    ALL_PLANES_MUST_SHARE_BACKEND_MSG = 'All planes in the system should use the same vector backend'
     NO_SOLUTIONS_MSG = 'No solution exists'
     INF_SOLUTIONS_MSG = 'Infinitely many solutions'
+    UNKNOWN_PIVOT_STRATEGY_MSG = 'The pivot strategy must be one of: first_nonzero, partial, scaled_partial, complete'
+    FACTORIZE_NEEDS_SQUARE_SYSTEM_MSG = 'Only a system with as many equations as variables can be factorized'
+    UNKNOWN_RANK_METHOD_MSG = 'The rank method must be one of: modp, exact'
+    ITERATIVE_NEEDS_SQUARE_SYSTEM_MSG = 'Only a system with as many equations as variables can be solved iteratively'
+    NOT_CONVERGED_MSG = 'The iterative solver did not converge'
+
+    # first_nonzero: first row at or below the current one with a nonzero coeff
+    # partial: row with the largest |coeff| in the current column
+    # scaled_partial: row with the largest |coeff| relative to the largest |coeff| in its row
+    # complete: largest |coeff| anywhere in the remaining rows and columns
+    PIVOT_STRATEGIES = ('first_nonzero', 'partial', 'scaled_partial', 'complete')
+
+    # The three largest primes below 2^61 (2^61 - 1, 2^61 - 31, 2^61 - 45)
+    MODULAR_PRIMES = (2305843009213693951, 2305843009213693921, 2305843009213693907)
 
     def __init__(self, planes):
         try:
@@ -20,8 +38,52 @@ class LinearSystem(object):
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
+        backend = planes[0].normal_vector.backend
+        for p in planes:
+            if p.normal_vector.backend != backend:
+                raise Exception(self.ALL_PLANES_MUST_SHARE_BACKEND_MSG)
+
         self.planes = planes
         self.dimension = d
+        self.backend = backend
+        # True while self.planes may be referenced by a copy (see copy)
+        self.shares_planes = False
+        # results of the eliminations, dropped by __setitem__ (see cached)
+        self.cache = {}
+
+
+    def copy(self):
+        '''
+        Output: LinearSystem with the same equations
+        Review: copy on write; the clone and the original share the list of
+        Hyperplanes until one of them replaces a row through __setitem__, which
+        then copies the list (the Hyperplanes themselves are never modified in
+        place, so they can always be shared).
+        '''
+        clone = LinearSystem.__new__(LinearSystem)
+        clone.planes = self.planes
+        clone.dimension = self.dimension
+        clone.backend = self.backend
+        clone.shares_planes = self.shares_planes = True
+        clone.cache = dict(self.cache)
+        return clone
+
+
+    def cached(self, key, compute):
+        '''
+        Input: cache key, function computing the value when it is not cached
+        Output: the cached value; LinearSystem and Parametrization values come
+        back as copies, so changing a returned result never changes the cache
+        Review: every row operation goes through __setitem__, which empties the
+        cache, so a cached result always belongs to the current equations.
+        Assigning to self.planes directly bypasses this.
+        '''
+        if key not in self.cache:
+            self.cache[key] = compute()
+        value = self.cache[key]
+        if isinstance(value, (LinearSystem, Parametrization)):
+            return value.copy()
+        return value
 
 
     def __repr__(self):
@@ -44,11 +106,17 @@ class LinearSystem(object):
     def __setitem__(self, i, x):
         try:
             assert x.dimension == self.dimension
-            self.planes[i] = x
-
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
+        if x.normal_vector.backend != self.backend:
+            raise Exception(self.ALL_PLANES_MUST_SHARE_BACKEND_MSG)
+        if self.shares_planes:
+            self.planes = list(self.planes)
+            self.shares_planes = False
+        self.planes[i] = x
+        self.cache = {}
+
 
     def swap_rows(self, row1, row2):
         temp = self[row1]
@@ -60,7 +128,7 @@ class LinearSystem(object):
     def multiply_coefficient_and_row(self, coefficient, row):
         c = coefficient
         constant_term = self[row].constant_term * c
-        self[row] = Hyperplane(Vector(self[row].normal_vector.scalar_mult(c)), constant_term)
+        self[row] = Hyperplane(Vector(self[row].normal_vector.scalar_mult(c), self.backend), constant_term)
         return
 
 
@@ -69,42 +137,193 @@ class LinearSystem(object):
         rta = row_to_add
         rtat = row_to_add_to
         temp_constant = self[rta].constant_term * c
-        temp_vector = Vector(self[rta].normal_vector.scalar_mult(c))
-        self[rtat] = Hyperplane(Vector(temp_vector.plus(self[rtat].normal_vector)),\
+        temp_vector = Vector(self[rta].normal_vector.scalar_mult(c), self.backend)
+        self[rtat] = Hyperplane(Vector(temp_vector.plus(self[rtat].normal_vector), self.backend),\
                                   self[rtat].constant_term + temp_constant)
         return
 
-    def compute_triangular_form(self):
+    def remove_redundant_equations(self):
+        '''
+        Output: (LinearSystem, dropped); the system without duplicate or
+        proportional equations, and the sorted indices of the equations of self
+        that were dropped
+        Review: each equation is keyed by its canonical form (see
+        Hyperplane.canonical_form), which proportional equations share, and only
+        the first equation with a given key is kept.  This is one dict pass,
+        linear in the number of equations, so large redundant constraint sets
+        shrink before the O(n^3) elimination.  Equations that differ only past
+        CANONICAL_DECIMALS places count as the same.
+        '''
+        pruned, dropped = self.cached('redundant', self.find_redundant_equations)
+        return pruned.copy(), list(dropped)
+
+
+    def pruned_system(self):
         '''
-        Input: System of equations
+        Output: the cached system without redundant equations, itself rather than
+        a copy, so the results it caches are kept for the next call; it must not
+        be modified
+        '''
+        return self.cached('redundant', self.find_redundant_equations)[0]
+
+
+    def find_redundant_equations(self):
+        '''
+        Output: (LinearSystem, dropped) as returned by remove_redundant_equations,
+        computed without the cache; the first equation with each canonical form
+        is kept, in order, and the indices of the later ones go to dropped
+        '''
+        kept = {}
+        dropped = []
+        for i, p in enumerate(self.planes):
+            key = p.canonical_form()
+            if key in kept:
+                dropped.append(i)
+            else:
+                kept[key] = p
+        return LinearSystem(list(kept.values())), dropped
+
+
+    def with_zero_rows(self, count):
+        '''
+        Output: new LinearSystem with count equations 0 = 0 added at the bottom,
+        which is where elimination leaves the dropped redundant equations
+        '''
+        zero = Hyperplane(Vector([0] * self.dimension, self.backend), 0)
+        return LinearSystem(self.planes + [zero] * count)
+
+
+    def compute_triangular_form(self, pivot='first_nonzero', prune=False):
+        '''
+        Input: System of equations, pivot strategy (see PIVOT_STRATEGIES), and
+        whether to remove redundant equations first (see remove_redundant_equations)
         Output: System of equations in triangular form
         This method arranges the system so that each variable is a leading variable, ie.
         starting from row 1, the leading variable will not have the same variable in the
         rows below it.  It will stop if 0=k is found (inconsistent).
+        With complete pivoting the variables are eliminated in pivot order, so the
+        result is triangular in that order rather than in x1, x2, ... order.
+        The result is cached per pivot strategy until the system is modified.
+        With prune the redundant equations come back as 0 = 0 rows at the bottom.
+        '''
+        if prune:
+            pruned = self.pruned_system()
+            return pruned.compute_triangular_form(pivot).with_zero_rows(len(self) - len(pruned))
+        return self.cached(('triangular', pivot), lambda: self.do_triangularization(pivot))
+
+
+    def do_triangularization(self, pivot='first_nonzero'):
+        rows = self.augmented_rows()
+        originals = rows[:]
+        columns = self.triangularize_rows(rows, pivot)
+        return self.system_from_rows(unpermute_columns(rows, columns), originals)
+
+
+    def augmented_rows(self):
+        '''
+        Output: dense augmented matrix, one list [a1, ..., an, k] per equation
+        The elimination runs on these rows in place, so no Vector or Hyperplane
+        objects are built until the final system is returned.  A row it changes
+        is replaced by a new list; rows it only moves keep their identity.
+        '''
+        return [list(p.normal_vector.coordinates) + [p.constant_term] for p in self.planes]
+
+
+    def system_from_rows(self, rows, originals=None):
+        '''
+        Input: augmented rows, and optionally the list returned by augmented_rows
+        before the elimination ran on it
+        Output: new LinearSystem of Hyperplanes built from the rows
+        A row that is still one of the original lists was never modified, so its
+        Hyperplane from self is reused instead of being built again.
+        '''
+        planes_by_row = {}
+        if originals is not None:
+            planes_by_row = dict(zip(map(id, originals), self.planes))
+        planes = []
+        for row in rows:
+            plane = planes_by_row.get(id(row))
+            if plane is None:
+                plane = Hyperplane(Vector(row[:-1], self.backend), row[-1])
+            planes.append(plane)
+        return LinearSystem(planes)
+
+
+    def triangularize_rows(self, rows, pivot='first_nonzero'):
+        '''
+        This is compute_triangular_form on the augmented rows, updated in place.
+        For each variable j a pivot row is picked by the pivot strategy and swapped
+        up to row i, then multiples of row i clear variable j from the rows below.
+        Output: column order of the rows; columns[c] is the variable now in column c.
+        Only complete pivoting swaps columns, the other strategies return 0..n-1.
         '''
-        system = deepcopy(self)
-        num_equations = len(system.planes)
-        num_variables = system.dimension
+        if pivot not in self.PIVOT_STRATEGIES:
+            raise Exception(self.UNKNOWN_PIVOT_STRATEGY_MSG)
+
+        num_equations = len(rows)
+        num_variables = self.dimension
+        columns = list(range(num_variables))
+        scales = None
+        if pivot == 'scaled_partial':
+            scales = [max([abs(x) for x in row[:-1]]) for row in rows]
+
         j = 0
         # i, j are row, col indices; row is equation, col is variable
         for i in range(num_equations):
             while j < num_variables:
-                # This tests the first variable of current row for 0 coeff.  If true, then the following rows
-                # are tested for non-zero coeff for the same variable.  If found, the rows will swap.
-                # If no non-zero coeff are found on any row, this means that variable is not in the system.
-                # The while loop then tests the next variable of the current row.
-                c = MyDecimal(system[i].normal_vector.coordinates[j])
-                if c.is_near_zero():
-                    swap_succeeded = system.swap_with_row_below_for_nonzero_coefficient_if_able(i ,j)
-                    if not swap_succeeded:
+                if pivot == 'complete':
+                    r, c = max(((k, c) for k in range(i, num_equations) for c in range(j, num_variables)),
+                               key=lambda rc: abs(rows[rc[0]][rc[1]]))
+                    if is_near_zero(rows[r][c]):
+                        return columns
+                    if c != j:
+                        for row in rows:
+                            row[j], row[c] = row[c], row[j]
+                        columns[j], columns[c] = columns[c], columns[j]
+                else:
+                    r = find_pivot_row(rows, i, j, pivot, scales)
+                    if r is None:
                         j += 1
                         continue
-                # The next step happens once a row swap has occurred.  Once the coeff are cleared
-                # in all rows below, the while loop breaks and the for loop moves to the next equation.
-                system.clear_coefficients_below(i, j)
+                if r != i:
+                    rows[i], rows[r] = rows[r], rows[i]
+                    if scales:
+                        scales[i], scales[r] = scales[r], scales[i]
+
+                pivot_row = rows[i]
+                beta = pivot_row[j]
+                for k in range(i+1, num_equations):
+                    gamma = rows[k][j]
+                    if gamma:
+                        alpha = -gamma/beta
+                        rows[k] = [alpha*x + y for x, y in zip(pivot_row, rows[k])]
                 j += 1
                 break
-        return system
+        return columns
+
+
+    def reduce_triangular_rows(self, rows):
+        '''
+        This takes triangular augmented rows to RREF in place: from the bottom up
+        each pivot row is scaled to make its pivot coeff equal one, then the pivot
+        variable is cleared from the rows above.
+        '''
+        num_variables = self.dimension
+        one = Vector.BACKENDS[self.backend](1.0)
+        for i in range(len(rows))[::-1]:
+            j = first_nonzero_index_or_none(rows[i], num_variables)
+            if j is None:
+                continue
+            pivot_row = rows[i]
+            if pivot_row[j] != one:
+                beta = one/pivot_row[j]
+                pivot_row = rows[i] = [beta*x for x in pivot_row]
+            for k in range(i)[::-1]:
+                alpha = -(rows[k][j])
+                if alpha:
+                    rows[k] = [alpha*x + y for x, y in zip(pivot_row, rows[k])]
+        return rows
+
 
     def swap_with_row_below_for_nonzero_coefficient_if_able(self, row, col):
         '''
@@ -141,6 +360,10 @@ class LinearSystem(object):
 
 
     def indices_of_first_nonzero_terms_in_each_row(self):
+        return list(self.cached('pivot_indices', self.find_first_nonzero_terms_in_each_row))
+
+
+    def find_first_nonzero_terms_in_each_row(self):
         num_equations = len(self)
         num_variables = self.dimension
         indices = [-1] * num_equations
@@ -155,25 +378,45 @@ class LinearSystem(object):
                     raise e
         return indices
 
-    def compute_rref(self):
+    def compute_rref(self, pivot='first_nonzero', prune=False):
         '''
-        Input: System of equations
+        Input: System of equations, pivot strategy (see PIVOT_STRATEGIES), and
+        whether to remove redundant equations first (see remove_redundant_equations)
         Output: System of equations in reduce row echelon form (RREF)
         This method arranges the system so that each pivot variable is in its own column, ie.
         starting from triangular form bottom row, the leading variable will not have the same
         variable in the rows above it.  It will stop if 0=k is found (inconsistent).
+        The result is cached per pivot strategy until the system is modified.
+        With prune the redundant equations come back as 0 = 0 rows at the bottom,
+        as they would after eliminating them.
         '''
-        tf = self.compute_triangular_form()
-
-        num_equations = len(tf)
-        pivot_indices = tf.indices_of_first_nonzero_terms_in_each_row()
-        for i in range(num_equations)[::-1]:
-             j = pivot_indices[i]
-             if j < 0:
-                 continue
-             tf.scale_row_to_make_coeffcient_equal_one(i, j)
-             tf.clear_coefficients_above(i, j)
-        return tf
+        if prune:
+            pruned = self.pruned_system()
+            return pruned.compute_rref(pivot).with_zero_rows(len(self) - len(pruned))
+        return self.cached(('rref', pivot), lambda: self.do_reduction(pivot))
+
+
+    def do_reduction(self, pivot='first_nonzero'):
+        if pivot != 'complete':
+            # the (cached) triangular form is already in x1, x2, ... order
+            triangular = self.compute_triangular_form(pivot)
+            rows = triangular.augmented_rows()
+            originals = rows[:]
+            triangular.reduce_triangular_rows(rows)
+            return triangular.system_from_rows(rows, originals)
+
+        rows = self.augmented_rows()
+        originals = rows[:]
+        columns = self.triangularize_rows(rows, pivot)
+        self.reduce_triangular_rows(rows)
+
+        if columns != sorted(columns):
+            # complete pivoting reduced the rows in pivot order; one more pass
+            # in x1, x2, ... order turns them into the (unique) RREF
+            rows = unpermute_columns(rows, columns)
+            self.triangularize_rows(rows)
+            self.reduce_triangular_rows(rows)
+        return self.system_from_rows(rows, originals)
 
 
     def scale_row_to_make_coeffcient_equal_one(self, row, col):
@@ -181,7 +424,7 @@ class LinearSystem(object):
         This function normalizes the first coefficient of each row.
         '''
         n = self[row].normal_vector.coordinates
-        beta = Decimal(1.0)/n[col]
+        beta = self[row].normal_vector.number_type(1.0)/n[col]
         self.multiply_coefficient_and_row(beta, row)
         return
 
@@ -199,11 +442,15 @@ class LinearSystem(object):
             self.add_multiple_times_row_to_row(alpha, row, k)
         return
 
-    def compute_ge_solution(self):
+    def compute_ge_solution(self, pivot='first_nonzero', prune=False):
         '''
+        With prune the solution comes from the system without its redundant
+        equations (see remove_redundant_equations), which has the same solutions.
         '''
+        if prune:
+            return self.pruned_system().compute_ge_solution(pivot)
         try:
-            return self.do_gaussian_elimination_and_extract_solution()
+            return self.do_gaussian_elimination_and_extract_solution(pivot)
 
         except Exception as e:
             if (str(e) == self.NO_SOLUTIONS_MSG or str(e) == self.INF_SOLUTIONS_MSG):
@@ -211,15 +458,15 @@ class LinearSystem(object):
             else:
                 raise e
 
-    def do_gaussian_elimination_and_extract_solution(self):
-        rref = self.compute_rref()
+    def do_gaussian_elimination_and_extract_solution(self, pivot='first_nonzero'):
+        rref = self.compute_rref(pivot)
 
         rref.raise_exception_if_contradictory_equation()
         rref.raise_exception_too_few_pivots()
 
         num_variables = rref.dimension
         solution_coordinates = [rref[i].constant_term for i in range(num_variables)]
-        return Vector(solution_coordinates)
+        return Vector(solution_coordinates, self.backend)
 
     def raise_exception_if_contradictory_equation(self):
         for plane in self.planes:
@@ -230,10 +477,8 @@ class LinearSystem(object):
                 if str(e) == 'No nonzero elements found':
                     # This checks for 0 = k condition, if constant k is non-zero, an inconsistency
                     # has occured and no solution exists
-                    constant_term = MyDecimal(plane.constant_term)
-                    if not constant_term.is_near_zero():
+                    if not is_near_zero(plane.constant_term):
                         raise Exception(self.NO_SOLUTIONS_MSG)
-                    return
 #                    else:
 #                        raise e  #This was the bug!!!
 
@@ -247,11 +492,15 @@ class LinearSystem(object):
             raise Exception(self.INF_SOLUTIONS_MSG)
 
 
-    def compute_solution(self):
+    def compute_solution(self, pivot='first_nonzero', prune=False):
         '''
+        With prune the parametrization comes from the system without its
+        redundant equations, as in compute_ge_solution.
         '''
+        if prune:
+            return self.pruned_system().compute_solution(pivot)
         try:
-            return self.do_gaussian_elimination_and_parametrize_solution()
+            return self.do_gaussian_elimination_and_parametrize_solution(pivot)
 
         except Exception as e:
             if str(e) == self.NO_SOLUTIONS_MSG:
@@ -259,8 +508,12 @@ class LinearSystem(object):
             else:
                 raise e
 
-    def do_gaussian_elimination_and_parametrize_solution(self):
-        rref = self.compute_rref()
+    def do_gaussian_elimination_and_parametrize_solution(self, pivot='first_nonzero'):
+        return self.cached(('parametrization', pivot), lambda: self.parametrize_solution(pivot))
+
+
+    def parametrize_solution(self, pivot='first_nonzero'):
+        rref = self.compute_rref(pivot)
         rref.raise_exception_if_contradictory_equation()
 
         direction_vectors = rref.extract_direction_vectors_for_parametrization()
@@ -284,7 +537,7 @@ class LinearSystem(object):
                 if pivot_var < 0:
                     break
                 vector_coords[pivot_var] = -p.normal_vector.coordinates[free_var]
-            direction_vectors.append(Vector(vector_coords))
+            direction_vectors.append(Vector(vector_coords, self.backend))
 
         return direction_vectors
 
@@ -301,7 +554,147 @@ class LinearSystem(object):
                 break
             basepoint_coords[pivot_var] = p.constant_term
 
-        return Vector(basepoint_coords)
+        return Vector(basepoint_coords, self.backend)
+
+
+    def compute_exact_solution(self):
+        '''
+        Output: the unique solution as a fraction backend Vector, or NO_SOLUTIONS_MSG
+        or INF_SOLUTIONS_MSG.
+        This is the exact mode: every coefficient is read as the rational it holds
+        (Decimals and floats convert exactly), each equation is scaled to integers
+        and Bareiss fraction-free elimination runs on the integer rows, so zero
+        means exactly zero and no tolerance is needed.
+        '''
+        num_variables = self.dimension
+        rows = integer_rows(self.augmented_rows())
+        rank = bareiss_rows(rows, num_variables)
+
+        for row in rows[rank:]:
+            if row[-1] != 0:
+                return self.NO_SOLUTIONS_MSG
+        if rank < num_variables:
+            return self.INF_SOLUTIONS_MSG
+
+        # With full rank the last pivot d is +-det(A), so d*x is an integer
+        # vector (Cramer's rule) and back substitution stays in integers.
+        d = rows[num_variables-1][num_variables-1]
+        scaled = [0] * num_variables
+        for i in reversed(range(num_variables)):
+            row = rows[i]
+            total = d*row[-1] - sum([row[j]*scaled[j] for j in range(i+1, num_variables)])
+            scaled[i] = total // row[i]
+        return Vector([Fraction(x, d) for x in scaled], 'fraction')
+
+
+    def solve_iterative(self, method='cg', tol=1e-10, maxiter=None, x0=None, callback=None):
+        '''
+        Input: square system, method (cg, jacobi, gauss_seidel or gmres, see
+        iterative.py), relative tolerance on ||b - A x||, iteration limit, initial
+        guess x0 (Vector or list, for a warm start) and callback(iteration,
+        residual_norm) called after every iteration
+        Output: float64 Vector solution, or NOT_CONVERGED_MSG
+        The solvers only multiply by the coefficient rows (zeros skipped), so
+        nothing is eliminated and no fill-in is created.
+        '''
+        if len(self) != self.dimension:
+            raise Exception(self.ITERATIVE_NEEDS_SQUARE_SYSTEM_MSG)
+        if isinstance(x0, Vector):
+            x0 = x0.coordinates
+        rows = float_rows([p.normal_vector.coordinates for p in self.planes])
+        x, converged = solve_iterative(rows, [p.constant_term for p in self.planes], method, tol, maxiter,
+                                       x0, callback)
+        if not converged:
+            return self.NOT_CONVERGED_MSG
+        return Vector(x, 'float64')
+
+
+    def solve_least_squares(self, tol=1e-10):
+        '''
+        Input: system of any shape, typically more equations than variables
+        Output: (float64 Vector x, residual norm ||A x - b||, rank of A)
+        x is the best fit in the least squares sense, found by Householder QR with
+        column pivoting (see least_squares.py); a consistent system gives its exact
+        solution with residual ~0.  With rank < n the dependent variables are set
+        to 0.  For equations that do not fit in memory use StreamingLeastSquares.
+        '''
+        solution, residual, rank = householder_least_squares(
+            [p.normal_vector.coordinates for p in self.planes], [p.constant_term for p in self.planes], tol)
+        return Vector(solution, 'float64'), residual, rank
+
+
+    def rank(self, method='modp'):
+        '''
+        Output: rank of the coefficient matrix
+        modp: eliminate modulo the MODULAR_PRIMES.  A rank mod p is only a lower
+        bound: it falls below the true rank r when p divides every r x r minor.
+        So the largest rank over the primes is taken, and returned only when it
+        is certified, by reaching the largest rank the shape allows or by the
+        Hadamard bound (see coefficient_and_augmented_ranks); otherwise the
+        exact Bareiss elimination decides.  Agreeing primes prove nothing.
+        exact: Bareiss fraction-free elimination on the integer rows.
+        '''
+        return self.coefficient_and_augmented_ranks(method)[0]
+
+
+    def is_consistent(self, method='modp'):
+        '''
+        Output: True if the system has at least one solution, ie. the rank of the
+        coefficient matrix equals the rank of the augmented matrix.
+        '''
+        coefficient_rank, augmented_rank = self.coefficient_and_augmented_ranks(method)
+        return coefficient_rank == augmented_rank
+
+
+    def coefficient_and_augmented_ranks(self, method='modp'):
+        '''
+        Output: (rank of the coefficients, rank of the augmented rows), see rank().
+        Non-integer coefficients are scaled to integers one equation at a time,
+        which leaves both ranks unchanged.
+        Review: with modp the ranks are the maxima over the primes.  They are
+        certified when they reach min(m, n) and min(m, n + 1), the augmented
+        one also when it is the certified coefficient rank + 1 (it can be no
+        higher).  Failing that: if every prime undercounted a rank r, each
+        divides every r x r minor, so their product P divides a nonzero minor,
+        which Hadamard's inequality bounds by the product of the row norms; a
+        bound below P rules that out.  Otherwise Bareiss decides.
+        '''
+        if method not in ('modp', 'exact'):
+            raise Exception(self.UNKNOWN_RANK_METHOD_MSG)
+        num_variables = self.dimension
+        rows = integer_rows(self.augmented_rows())
+
+        if method == 'modp':
+            largest_coefficient_rank = min(len(rows), num_variables)
+            largest_augmented_rank = min(len(rows), num_variables + 1)
+            coefficient_rank = augmented_rank = 0
+            product = 1
+            for prime in self.MODULAR_PRIMES:
+                ranks = modular_ranks(rows, num_variables, prime)
+                coefficient_rank = max(coefficient_rank, ranks[0])
+                augmented_rank = max(augmented_rank, ranks[1])
+                product *= prime
+                if coefficient_rank == largest_coefficient_rank and augmented_rank in (
+                        largest_augmented_rank, coefficient_rank + 1):
+                    return coefficient_rank, augmented_rank
+            if hadamard_bound_below(rows, product):
+                return coefficient_rank, augmented_rank
+
+        rank = bareiss_rows(rows, num_variables)
+        return rank, rank + any([row[-1] != 0 for row in rows[rank:]])
+
+
+    def factorize(self):
+        '''
+        Input: square system of equations (n equations, n variables)
+        Output: LUFactorization of the coefficient matrix
+        The factorization ignores the constant terms, so it can be reused to
+        solve the same coefficients against any number of constant vectors.
+        '''
+        if len(self) != self.dimension:
+            raise Exception(self.FACTORIZE_NEEDS_SQUARE_SYSTEM_MSG)
+        return LUFactorization.from_rows([list(p.normal_vector.coordinates) for p in self.planes],
+                                         self.backend)
 
 
 class Parametrization(object):
@@ -321,6 +714,15 @@ class Parametrization(object):
         except AssertionError:
             raise Exception(BASEPT_AND_DIR_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
 
+
+    def copy(self):
+        '''
+        Output: Parametrization with the same basepoint and direction vectors
+        The Vectors are shared, as they are never modified in place; the list
+        of direction vectors is not.
+        '''
+        return Parametrization(self.basepoint, list(self.direction_vectors))
+
     def __repr__(self):
 
         return 'Basepoint: ' + str(self.basepoint) + '; Direction vectors: ' + str([vector for vector in self.direction_vectors])
@@ -344,6 +746,398 @@ class Parametrization(object):
         return output
 
 
+class IncrementalLinearSystem(object):
+
+    NO_EQUATIONS_TO_REMOVE_MSG = 'There is no equation left to remove'
+
+    def __init__(self, dimension, backend='decimal'):
+        '''
+        Input: number of variables, vector backend of the equations to come
+        Review: the system starts empty and keeps its RREF as one augmented row
+        per pivot variable.  add_equation reduces the new row against the pivots,
+        O(n * rank), and if it brings a new pivot clears that variable from the
+        other pivot rows; the Parametrization in self.parametrization is updated
+        in place, only in the entries that changed.  Every addition leaves an
+        undo entry, so pop_equation backtracks exactly.
+        '''
+        self.dimension = dimension
+        self.backend = backend
+        self.number_type = Vector.BACKENDS[backend]
+        self.planes = []
+        self.pivot_rows = {}            # pivot variable -> augmented RREF row
+        self.log = []                   # undo entry per equation
+        self.contradictions = 0         # equations reduced to 0 = k, k != 0
+
+        zero = self.number_type(0)
+        one = self.number_type(1)
+        self.basepoint_coords = [zero] * dimension
+        self.direction_coords = {}      # free variable -> direction vector coords
+        for free_var in range(dimension):
+            coords = [zero] * dimension
+            coords[free_var] = one
+            self.direction_coords[free_var] = coords
+        self.direction_vectors = dict([(f, Vector(c, backend)) for f, c in self.direction_coords.items()])
+        self.parametrization = Parametrization(Vector(self.basepoint_coords, backend),
+                                               [self.direction_vectors[f] for f in sorted(self.direction_vectors)])
+
+
+    def __len__(self):
+        return len(self.planes)
+
+
+    def __getitem__(self, i):
+        return self.planes[i]
+
+
+    def add_equation(self, plane):
+        '''
+        Input: Hyperplane in the dimension and backend of the system
+        '''
+        if plane.dimension != self.dimension:
+            raise Exception(LinearSystem.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+        if plane.normal_vector.backend != self.backend:
+            raise Exception(LinearSystem.ALL_PLANES_MUST_SHARE_BACKEND_MSG)
+        zero = self.number_type(0)
+
+        row = list(plane.normal_vector.coordinates) + [plane.constant_term]
+        for col, pivot_row in self.pivot_rows.items():
+            gamma = row[col]
+            if gamma != 0:
+                row = [a - gamma*b for a, b in zip(row, pivot_row)]
+                row[col] = zero
+        self.planes.append(plane)
+
+        j = first_nonzero_index_or_none(row, self.dimension)
+        if j is None:
+            if is_near_zero(row[-1]):
+                self.log.append(('redundant', None, None))
+            else:
+                self.contradictions += 1
+                self.log.append(('contradiction', None, None))
+            return
+
+        beta = row[j]
+        row = [x/beta for x in row]
+        row[j] = self.number_type(1)
+        saved = []
+        for col, pivot_row in self.pivot_rows.items():
+            gamma = pivot_row[j]
+            if gamma != 0:
+                saved.append((col, pivot_row))
+                new_row = [a - gamma*b for a, b in zip(pivot_row, row)]
+                new_row[j] = zero
+                self.pivot_rows[col] = new_row
+        self.pivot_rows[j] = row
+        self.log.append(('pivot', j, saved))
+        self.update_parametrization([col for col, old_row in saved] + [j], removed_free_var=j)
+
+
+    def pop_equation(self):
+        '''
+        Output: the most recently added Hyperplane, after undoing its addition
+        '''
+        if not self.planes:
+            raise Exception(self.NO_EQUATIONS_TO_REMOVE_MSG)
+        kind, j, saved = self.log.pop()
+        plane = self.planes.pop()
+        if kind == 'contradiction':
+            self.contradictions -= 1
+        elif kind == 'pivot':
+            del self.pivot_rows[j]
+            for col, old_row in saved:
+                self.pivot_rows[col] = old_row
+            self.update_parametrization([col for col, old_row in saved] + [j], added_free_var=j)
+        return plane
+
+
+    def update_parametrization(self, changed_rows, removed_free_var=None, added_free_var=None):
+        '''
+        This refreshes the basepoint and direction vector entries of the pivot
+        variables in changed_rows, and drops or adds the direction vector of a
+        variable that became a pivot or a free variable again.
+        '''
+        zero = self.number_type(0)
+        changed_free_vars = set()
+        if removed_free_var is not None:
+            del self.direction_coords[removed_free_var]
+            del self.direction_vectors[removed_free_var]
+
+        for col in changed_rows:
+            row = self.pivot_rows.get(col)
+            self.basepoint_coords[col] = row[-1] if row else zero
+            for free_var, coords in self.direction_coords.items():
+                value = -row[free_var] if row else zero
+                if coords[col] != value:
+                    coords[col] = value
+                    changed_free_vars.add(free_var)
+
+        if added_free_var is not None:
+            coords = [zero] * self.dimension
+            coords[added_free_var] = self.number_type(1)
+            for col, row in self.pivot_rows.items():
+                coords[col] = -row[added_free_var]
+            self.direction_coords[added_free_var] = coords
+            changed_free_vars.add(added_free_var)
+
+        for free_var in changed_free_vars:
+            self.direction_vectors[free_var] = Vector(self.direction_coords[free_var], self.backend)
+        self.parametrization.basepoint = Vector(self.basepoint_coords, self.backend)
+        self.parametrization.direction_vectors = [self.direction_vectors[f] for f in sorted(self.direction_vectors)]
+
+
+    def is_consistent(self):
+        return self.contradictions == 0
+
+
+    def solution(self):
+        '''
+        Output: the current Parametrization, or NO_SOLUTIONS_MSG
+        '''
+        if not self.is_consistent():
+            return LinearSystem.NO_SOLUTIONS_MSG
+        return self.parametrization
+
+
+class LUFactorization(object):
+
+    SINGULAR_MATRIX_MSG = 'The coefficient matrix is singular, no unique solution exists'
+    CONSTANTS_MUST_MATCH_DIM_MSG = 'The number of constant terms must equal the number of equations'
+
+    def __init__(self, lu, permutation, backend='decimal'):
+        '''
+        lu holds L (unit diagonal, stored below the diagonal) and U (on and above
+        the diagonal) in one n x n list of rows.  permutation[i] is the original
+        equation that ended up in row i after partial pivoting, so PA = LU.
+        '''
+        self.lu = lu
+        self.permutation = permutation
+        self.backend = backend
+        self.dimension = len(lu)
+
+
+    @classmethod
+    def from_rows(cls, rows, backend='decimal'):
+        '''
+        Input: n x n coefficient rows
+        Output: LUFactorization with partial pivoting (Doolittle, O(n^3))
+        At column k the row with the largest |coeff| at or below row k is swapped
+        up, so every multiplier stored in L has magnitude <= 1.
+        '''
+        lu = [list(row) for row in rows]
+        n = len(lu)
+        permutation = list(range(n))
+
+        for k in range(n):
+            p = max(range(k, n), key=lambda i: abs(lu[i][k]))
+            if is_near_zero(lu[p][k]):
+                raise Exception(cls.SINGULAR_MATRIX_MSG)
+            if p != k:
+                lu[k], lu[p] = lu[p], lu[k]
+                permutation[k], permutation[p] = permutation[p], permutation[k]
+
+            pivot_row = lu[k]
+            beta = pivot_row[k]
+            for i in range(k+1, n):
+                row = lu[i]
+                gamma = row[k]/beta
+                row[k] = gamma
+                if gamma:
+                    for j in range(k+1, n):
+                        row[j] -= gamma*pivot_row[j]
+        return cls(lu, permutation, backend)
+
+
+    def __repr__(self):
+        return 'LUFactorization(dimension = {}, permutation = {})'.format(self.dimension, self.permutation)
+
+
+    def solve(self, constant_terms):
+        '''
+        Input: the n constant terms (list, tuple or Vector) of the equations
+        Output: Vector solution
+        Forward substitution with L, then back substitution with U; O(n^2).
+        '''
+        if isinstance(constant_terms, Vector):
+            constant_terms = constant_terms.coordinates
+        n = self.dimension
+        if len(constant_terms) != n:
+            raise Exception(self.CONSTANTS_MUST_MATCH_DIM_MSG)
+
+        number_type = Vector.BACKENDS[self.backend]
+        lu = self.lu
+        y = [number_type(constant_terms[p]) for p in self.permutation]
+        for i in range(n):
+            row = lu[i]
+            y[i] -= sum([row[j]*y[j] for j in range(i)])
+        for i in range(n)[::-1]:
+            row = lu[i]
+            y[i] = (y[i] - sum([row[j]*y[j] for j in range(i+1, n)]))/row[i]
+        return Vector(y, self.backend)
+
+
+    def solve_many(self, constant_term_sets):
+        '''
+        Input: list of constant term sets, each one a right hand side for solve
+        Output: list of Vector solutions, one per set
+        '''
+        return [self.solve(b) for b in constant_term_sets]
+
+
+    def to_dict(self):
+        '''
+        Output: plain dict (JSON serializable) holding the factorization.
+        Numbers are stored as strings so decimal factors round trip exactly.
+        '''
+        return {'backend': self.backend,
+                'permutation': list(self.permutation),
+                'lu': [[str(x) for x in row] for row in self.lu]}
+
+
+    @classmethod
+    def from_dict(cls, data):
+        number_type = Vector.BACKENDS[data['backend']]
+        lu = [[number_type(x) for x in row] for row in data['lu']]
+        return cls(lu, list(data['permutation']), data['backend'])
+
+
+def is_near_zero(x, eps=1e-10):
+    return abs(x) < eps
+
+
+def find_pivot_row(rows, i, j, pivot, scales=None):
+    '''
+    Output: index of the row at or below row i to pivot on for column j, or None
+    if column j is (near) zero in all of those rows.
+    '''
+    if pivot == 'first_nonzero':
+        for k in range(i, len(rows)):
+            if not is_near_zero(rows[k][j]):
+                return k
+        return None
+    candidates = [k for k in range(i, len(rows)) if not is_near_zero(rows[k][j])]
+    if not candidates:
+        return None
+    if pivot == 'partial':
+        return max(candidates, key=lambda k: abs(rows[k][j]))
+    if pivot == 'scaled_partial':
+        return max(candidates, key=lambda k: abs(rows[k][j])/scales[k])
+
+
+def unpermute_columns(rows, columns):
+    '''
+    This puts the coefficients of each augmented row back in x1, x2, ... order.
+    '''
+    if columns == sorted(columns):
+        return rows
+    unpermuted = []
+    for row in rows:
+        new_row = row[:]
+        for c, variable in enumerate(columns):
+            new_row[variable] = row[c]
+        unpermuted.append(new_row)
+    return unpermuted
+
+
+def integer_rows(rows):
+    '''
+    Input: augmented rows of Decimals, floats, Fractions or ints
+    Output: new rows of ints, each row scaled by the lcm of its denominators
+    '''
+    integer = []
+    for row in rows:
+        fractions = [Fraction(x) for x in row]
+        scale = lcm(*[x.denominator for x in fractions])
+        integer.append([x.numerator * (scale // x.denominator) for x in fractions])
+    return integer
+
+
+def bareiss_rows(rows, num_variables):
+    '''
+    This is Bareiss fraction-free elimination on integer augmented rows, updated
+    in place to row echelon form.  Each update a_ij = (p*a_ij - a_ic*a_rj) / prev
+    divides exactly (every entry is a minor of the original matrix), so all
+    intermediates stay integers.  Pivots are the first nonzero entry in order.
+    Output: the rank of the coefficient part; rows below it have zero coefficients.
+    '''
+    num_equations = len(rows)
+    previous = 1
+    r = 0
+    for c in range(num_variables):
+        if r == num_equations:
+            break
+        k = next((k for k in range(r, num_equations) if rows[k][c] != 0), None)
+        if k is None:
+            continue
+        rows[r], rows[k] = rows[k], rows[r]
+        pivot_row = rows[r]
+        p = pivot_row[c]
+        pivot_tail = pivot_row[c+1:]
+        for i in range(r+1, num_equations):
+            row = rows[i]
+            a = row[c]
+            row[c] = 0
+            if a == 0:
+                row[c+1:] = [p*x // previous for x in row[c+1:]]
+            else:
+                row[c+1:] = [(p*x - a*y) // previous for x, y in zip(row[c+1:], pivot_tail)]
+        previous = p
+        r += 1
+    return r
+
+
+def hadamard_bound_below(rows, limit):
+    '''
+    Input: integer rows, positive integer limit
+    Output: True if every minor of the rows, of any size, is below limit in
+    absolute value: the product of the squared row norms (each taken as at
+    least 1) is compared with limit^2, in exact integers.
+    '''
+    bound = 1
+    limit_squared = limit*limit
+    for row in rows:
+        bound *= max(1, sum([x*x for x in row]))
+        if bound >= limit_squared:
+            return False
+    return True
+
+
+def modular_ranks(rows, num_variables, prime):
+    '''
+    Input: integer augmented rows (left unchanged), number of variables, prime p
+    Output: (rank of the coefficients, rank of the augmented rows), both mod p
+    This is Gaussian elimination over the integers mod p: the pivot row is scaled
+    by the modular inverse of its pivot and reduced mod p.  The other rows are
+    only reduced when read; each update subtracts a product below p^2, so their
+    entries stay below (num_equations + 1) * p^2 without a % per entry.
+    '''
+    rows = [[x % prime for x in row] for row in rows]
+    num_equations = len(rows)
+    r = 0
+    for c in range(num_variables):
+        if r == num_equations:
+            break
+        k = next((k for k in range(r, num_equations) if rows[k][c] % prime), None)
+        if k is None:
+            continue
+        rows[r], rows[k] = rows[k], rows[r]
+        inverse = pow(rows[r][c], -1, prime)
+        pivot_tail = [x*inverse % prime for x in rows[r][c+1:]]
+        for i in range(r+1, num_equations):
+            row = rows[i]
+            a = row[c] % prime
+            if a:
+                row[c+1:] = [x - a*y for x, y in zip(row[c+1:], pivot_tail)]
+        r += 1
+    return r, r + any([row[-1] % prime for row in rows[r:]])
+
+
+def first_nonzero_index_or_none(row, num_variables):
+    for k in range(num_variables):
+        if not is_near_zero(row[k]):
+            return k
+    return None
+
+
 class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
         return abs(self) < eps
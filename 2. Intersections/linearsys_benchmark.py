@@ -0,0 +1,59 @@
+import sys
+from random import uniform, randint, seed
+from time import perf_counter
+from linearsys import LinearSystem
+from hyperplane import Hyperplane
+from vector_alt import Vector
+
+# Times compute_ge_solution on a random n x n system: the decimal backend with
+# the default first_nonzero pivoting as the reference, then the float64 backend
+# with each pivot strategy, reporting the largest difference from the reference,
+# then the exact Bareiss path (compute_exact_solution) and rank(method) on an
+# integer system.
+# Usage: python linearsys_benchmark.py [n]   (default n = 200)
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+seed(0)
+coefficients = [[uniform(-10, 10) for _ in range(n)] for _ in range(n)]
+constants = [uniform(-10, 10) for _ in range(n)]
+
+
+def system(backend):
+    return LinearSystem([Hyperplane(Vector(row, backend), k) for row, k in zip(coefficients, constants)])
+
+
+print('compute_ge_solution benchmark, {} x {} system'.format(n, n))
+print('{:<10}{:<16}{:>10}{:>14}'.format('backend', 'pivot', 'time (s)', 'max error'))
+
+start = perf_counter()
+reference = system('decimal').compute_ge_solution()
+print('{:<10}{:<16}{:>10.3f}{:>14}'.format('decimal', 'first_nonzero', perf_counter() - start, '-'))
+
+for pivot in LinearSystem.PIVOT_STRATEGIES:
+    s = system('float64')
+    start = perf_counter()
+    solution = s.compute_ge_solution(pivot)
+    seconds = perf_counter() - start
+    error = max([abs(float(x) - y) for x, y in zip(reference.coordinates, solution.coordinates)])
+    print('{:<10}{:<16}{:>10.3f}{:>14.2e}'.format('float64', pivot, seconds, error))
+
+# The exact mode targets integer and rational inputs, so it is compared with the
+# decimal path on a random integer system of the same size.
+integer_coefficients = [[randint(-10, 10) for _ in range(n)] for _ in range(n)]
+integer_constants = [randint(-10, 10) for _ in range(n)]
+s = LinearSystem([Hyperplane(Vector(row), k) for row, k in zip(integer_coefficients, integer_constants)])
+print()
+print('integer system, exact mode')
+start = perf_counter()
+reference = s.compute_ge_solution()
+print('{:<10}{:<16}{:>10.3f}{:>14}'.format('decimal', 'first_nonzero', perf_counter() - start, '-'))
+start = perf_counter()
+solution = s.compute_exact_solution()
+seconds = perf_counter() - start
+error = max([abs(float(x) - float(y)) for x, y in zip(reference.coordinates, solution.coordinates)])
+print('{:<10}{:<16}{:>10.3f}{:>14.2e}'.format('fraction', 'bareiss', seconds, error))
+
+for method in ('modp', 'exact'):
+    start = perf_counter()
+    rank = s.rank(method)
+    print('{:<10}{:<16}{:>10.3f}{:>14}'.format('rank', method, perf_counter() - start, rank))
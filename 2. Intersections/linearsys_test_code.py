@@ -1,6 +1,7 @@
-from linearsys import LinearSystem, MyDecimal
+from linearsys import LinearSystem, IncrementalLinearSystem, MyDecimal
 from vector_alt import Vector
 from hyperplane import Hyperplane
+from least_squares import StreamingLeastSquares
 
 p0 = Hyperplane(normal_vector=Vector([1,1,1]), constant_term = 1)
 p1 = Hyperplane(normal_vector=Vector([0,1,0]), constant_term = 2)
@@ -20,3 +21,132 @@ print(s)
 print()
 print(MyDecimal('1e-9').is_near_zero())
 print(MyDecimal('1e-11').is_near_zero())
+
+h1 = Hyperplane(normal_vector=Vector([2.102, 7.489, -0.786]), constant_term = -0.713555)
+h2 = Hyperplane(normal_vector=Vector([-1.131, -8.318, 1.209]), constant_term = 0.118855)
+h3 = Hyperplane(normal_vector=Vector([9.015, -5.873, 1.105]), constant_term = 0.221634)
+s = LinearSystem([h1,h2,h3])
+lu = s.factorize()
+print('LU Factorization Test')
+print(lu)
+print('Solve:', lu.solve([-0.713555, 0.118855, 0.221634]))
+print('Solve many:', lu.solve_many([[1, 0, 0], [0, 1, 0], [0, 0, 1]]))
+print()
+
+print('Exact Solution Test')
+p1 = Hyperplane(normal_vector=Vector([1,1,1]), constant_term = 6)
+p2 = Hyperplane(normal_vector=Vector([0,2,5]), constant_term = -4)
+p3 = Hyperplane(normal_vector=Vector(['0.2','0.5','-0.1']), constant_term = '0.5')
+print('One solution:', LinearSystem([p1,p2,p3]).compute_exact_solution().coordinates)
+p3 = Hyperplane(normal_vector=Vector([1,3,6]), constant_term = 2)
+print('Dependent rows:', LinearSystem([p1,p2,p3]).compute_exact_solution())
+p3 = Hyperplane(normal_vector=Vector([1,3,6]), constant_term = 3)
+print('Inconsistent rows:', LinearSystem([p1,p2,p3]).compute_exact_solution())
+print()
+print('Rank Test')
+p1 = Hyperplane(normal_vector=Vector([1,1,1]), constant_term = 6)
+p2 = Hyperplane(normal_vector=Vector([0,2,5]), constant_term = -4)
+p3 = Hyperplane(normal_vector=Vector([1,3,6]), constant_term = 2)
+s = LinearSystem([p1,p2,p3])
+print('Rank:', s.rank(), s.rank('exact'), 'Consistent:', s.is_consistent())
+s[2] = Hyperplane(normal_vector=Vector([1,3,6]), constant_term = 3)
+print('Rank:', s.rank(), s.rank('exact'), 'Consistent:', s.is_consistent())
+# entries divisible by several of the primes, so the ranks mod p fall short
+p1, p2, p3 = LinearSystem.MODULAR_PRIMES
+s = LinearSystem([Hyperplane(normal_vector=Vector([p1*p2,0]), constant_term = 0),
+                  Hyperplane(normal_vector=Vector([0,1]), constant_term = 0)])
+print('Rank:', s.rank(), s.rank('exact'))
+s = LinearSystem([Hyperplane(normal_vector=Vector([1]), constant_term = p1*p2),
+                  Hyperplane(normal_vector=Vector([1]), constant_term = 0)])
+print('Consistent:', s.is_consistent(), s.is_consistent('exact'))
+s = LinearSystem([Hyperplane(normal_vector=Vector([1,1]), constant_term = p1*p2*p3),
+                  Hyperplane(normal_vector=Vector([1,1]), constant_term = 0),
+                  Hyperplane(normal_vector=Vector([2,2]), constant_term = 0)])
+print('Ranks:', s.coefficient_and_augmented_ranks(), 'Consistent:', s.is_consistent(), s.is_consistent('exact'))
+print()
+print('Iterative Solver Test')
+p1 = Hyperplane(normal_vector=Vector([4,1,0]), constant_term = 1)
+p2 = Hyperplane(normal_vector=Vector([1,3,-1]), constant_term = 2)
+p3 = Hyperplane(normal_vector=Vector([0,-1,5]), constant_term = 3)
+s = LinearSystem([p1,p2,p3])
+print('Direct:', s.compute_ge_solution())
+for method in ['cg', 'jacobi', 'gauss_seidel', 'gmres']:
+    print(method + ':', s.solve_iterative(method))
+residuals = []
+x = s.solve_iterative('jacobi', maxiter=3, callback=lambda i, r: residuals.append(r))
+print('Jacobi, 3 iterations:', x, len(residuals))
+print('Warm start:', s.solve_iterative('cg', x0=s.compute_ge_solution()))
+print()
+print('Least Squares Test')
+p1 = Hyperplane(normal_vector=Vector([1,1]), constant_term = 3.1)
+p2 = Hyperplane(normal_vector=Vector([1,-1]), constant_term = 0.9)
+p3 = Hyperplane(normal_vector=Vector([2,0]), constant_term = 4.2)
+p4 = Hyperplane(normal_vector=Vector([0,1]), constant_term = 0.95)
+s = LinearSystem([p1,p2,p3,p4])
+print('Gaussian elimination:', s.compute_ge_solution())
+x, residual, rank = s.solve_least_squares()
+print('Least squares:', x, round(residual, 6), rank)
+stream = StreamingLeastSquares(2)
+stream.add_equations((p.normal_vector, p.constant_term) for p in s.planes)
+x, residual, rank = stream.solution()
+print('Streaming:', x, round(residual, 6), rank, len(stream))
+print()
+print('Incremental System Test')
+s = IncrementalLinearSystem(3)
+s.add_equation(Hyperplane(normal_vector=Vector([1,1,1]), constant_term = 6))
+print(s.solution())
+s.add_equation(Hyperplane(normal_vector=Vector([0,2,5]), constant_term = -4))
+print(s.solution())
+s.add_equation(Hyperplane(normal_vector=Vector([1,3,6]), constant_term = 3))
+print('Consistent:', s.is_consistent(), s.solution())
+s.pop_equation()
+s.add_equation(Hyperplane(normal_vector=Vector([2,5,-1]), constant_term = 27))
+print(s.solution())
+print()
+print('Copy on Write Test')
+p1 = Hyperplane(normal_vector=Vector([1,1,1]), constant_term = 6)
+p2 = Hyperplane(normal_vector=Vector([0,1,2]), constant_term = 8)
+p3 = Hyperplane(normal_vector=Vector([0,0,1]), constant_term = 3)
+s = LinearSystem([p1,p2,p3])
+t = s.copy()
+print('Shared:', t.planes is s.planes)
+t.swap_rows(0, 2)
+print('After swap:', t.planes is s.planes, s[0] == p1, t[0] == p3)
+rref = s.compute_rref()
+print('Reused rows:', [rref[i] is p for i, p in enumerate([p1, p2, p3])])
+print('Reused again:', all([a is b for a, b in zip(rref.compute_rref().planes, rref.planes)]))
+s = LinearSystem([Hyperplane(normal_vector=Vector([1e-9,1]), constant_term = 1),
+                  Hyperplane(normal_vector=Vector([5e-11,2]), constant_term = 3)])
+x = s.compute_ge_solution()
+print('Small pivot:', x, abs(s[0].normal_vector.dot_prod(x) - s[0].constant_term) < 1e-10)
+print()
+print('Memoization Test')
+s = LinearSystem([p1,p2,p3])
+ps = s.compute_solution()
+print('Cached:', sorted([str(key) for key in s.cache]))
+first_row = s.compute_rref()[0]
+r = s.compute_rref()
+r.multiply_coefficient_and_row(2, 0)
+print('Returned copy changed, cache kept:', r[0] is first_row, s.compute_rref()[0] is first_row)
+ps.basepoint = None
+ps.direction_vectors.append(None)
+print('Returned Parametrization changed, cache kept:', s.compute_solution())
+s.swap_rows(0, 2)
+print('After swap:', len(s.cache), s.compute_ge_solution())
+print()
+print('Redundant Equations Test')
+p1 = Hyperplane(normal_vector=Vector([0.935, 1.76, -9.365]), constant_term = -9.955)
+p2 = Hyperplane(normal_vector=Vector([0.187, 0.352, -1.873]), constant_term = -1.991)
+p3 = Hyperplane(normal_vector=Vector([0.374, 0.704, -3.746]), constant_term = -3.982)
+p4 = Hyperplane(normal_vector=Vector([-0.561, -1.056, 5.619]), constant_term = 5.973)
+p5 = Hyperplane(normal_vector=Vector([1, 0, 0]), constant_term = 2)
+s = LinearSystem([p1,p2,p3,p4,p5])
+pruned, dropped = s.remove_redundant_equations()
+print('Kept:', len(pruned), 'Dropped:', dropped)
+print('Same RREF:', all([a == b for a, b in zip(s.compute_rref(prune=True).planes, s.compute_rref().planes)]))
+print(s.compute_rref(prune=True))
+print('Same Parametrization:', s.compute_solution(prune=True))
+print('Same Solution:', s.compute_ge_solution(prune=True) == s.compute_ge_solution())
+s = LinearSystem([p5, Hyperplane(normal_vector=Vector([-2, 0, 0]), constant_term = 4)])
+print('Contradiction kept:', s.remove_redundant_equations()[1], s.compute_ge_solution(prune=True))
+print()
@@ -1,5 +1,7 @@
 from decimal import getcontext, Decimal
+from fractions import Fraction
 from vector_alt import Vector
+from hyperplane import canonical_equation
 
 getcontext().prec = 30
 
@@ -19,7 +21,7 @@ class Plane(object):
         if not constant_term:
             constant_term = 0
 
-        self.constant_term = Decimal(constant_term)
+        self.constant_term = normal_vector.number_type(constant_term)
         self.set_basepoint()
 
     def __eq__(self, p):
@@ -29,6 +31,8 @@ class Plane(object):
                 return False
             else:
                 diff = self.constant_term - p.constant_term
+                if isinstance(diff, Fraction):
+                    return diff == 0
                 return MyDecimal(diff).is_near_zero()
         elif p.normal_vector.is_zero():
             return False
@@ -38,11 +42,18 @@ class Plane(object):
 
         x0 = self.basepoint
         y0 = p.basepoint
-        basepoint_difference = Vector(x0.minus(y0))
+        basepoint_difference = Vector(x0.minus(y0), x0.backend)
         n = self.normal_vector
         return basepoint_difference.orthogonal(n)
 
 
+    def canonical_form(self):
+        '''
+        Output: (u1, u2, u3, d), see hyperplane.canonical_equation
+        '''
+        return canonical_equation(self.normal_vector.coordinates, self.constant_term)
+
+
     def __repr__(self):
 
         return 'Plane(normal_vector = Vector(' + str([round(float(value), 3) for value in  self.normal_vector.coordinates]) + '), constant_term = ' + str(round(float(self.constant_term), 3)) +')'
@@ -112,7 +123,7 @@ class Plane(object):
             initial_coefficient = n[initial_index]
 
             basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self.basepoint = Vector(basepoint_coords, self.normal_vector.backend)
 
         except Exception as e:
             if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
@@ -123,7 +134,11 @@ class Plane(object):
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if isinstance(item, Fraction):
+                # the fraction backend is exact, so only a true 0 counts as zero
+                if item != 0:
+                    return k
+            elif not MyDecimal(item).is_near_zero():
                 return k
         raise Exception(Plane.NO_NONZERO_ELTS_FOUND_MSG)
 
@@ -29,4 +29,17 @@ k2 = -2.443
 p1 = Plane(n1, k1)
 p2 = Plane(n2, k2)
 print('Planes Parallel?', p1.parallel(p2))
-print('Planes Equal?', p1.plane_equal_with(p2))
\ No newline at end of file
+print('Planes Equal?', p1.plane_equal_with(p2))
+print()
+print('Canonical Form Test')
+p1 = Plane(Vector((-7.926, 8.625, -7.212)), -7.952)
+p2 = Plane(Vector((7.926, -8.625, 7.212)), 7.952)
+print(p1.canonical_form(), p2.canonical_form() == p1.canonical_form())
+print('Distinct planes:', len(set([p.canonical_form() for p in [p1, p2, Plane(Vector((1, 0, 0)), 1)]])))
+print()
+print('Fraction Backend Test')
+p1 = Plane(Vector((0, 1, 2), 'fraction'), 3)
+p2 = Plane(Vector((0, 2, 4), 'fraction'), 6)
+print(p1, '|', p2)
+print('Planes Parallel?', p1.parallel(p2))
+print('Planes Equal?', p1.plane_equal_with(p2))
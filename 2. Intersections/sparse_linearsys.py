@@ -0,0 +1,356 @@
+from array import array
+from heapq import heapify, heappush, heappop
+from linearsys import LinearSystem, Parametrization, is_near_zero
+from iterative import solve_iterative
+from vector_alt import Vector
+
+
+class SparseLinearSystem(object):
+
+    INDEX_OUT_OF_RANGE_MSG = 'Every variable index must be below the dimension of the system'
+    ROW_POINTERS_MUST_MATCH_MSG = 'There must be one row pointer per equation plus one'
+    NO_SOLUTIONS_MSG = LinearSystem.NO_SOLUTIONS_MSG
+    ITERATIVE_NEEDS_SQUARE_SYSTEM_MSG = LinearSystem.ITERATIVE_NEEDS_SQUARE_SYSTEM_MSG
+    NOT_CONVERGED_MSG = LinearSystem.NOT_CONVERGED_MSG
+
+    # a pivot may be at most this many times smaller than the largest |coeff| in its column
+    PIVOT_THRESHOLD = 10
+
+    def __init__(self, indptr, indices, data, constant_terms, dimension, backend='decimal'):
+        '''
+        Input: system in CSR form; equation i has the coefficients
+        data[indptr[i]:indptr[i+1]] for the variables indices[indptr[i]:indptr[i+1]]
+        and the constant term constant_terms[i].  All other coefficients are zero.
+        Review: only the nonzeros are stored, so memory scales with their number
+        (nnz) rather than equations x variables.  A per-column index (CSC pattern)
+        lists the equations each variable appears in.
+        '''
+        if backend not in Vector.BACKENDS:
+            raise ValueError(Vector.UNKNOWN_BACKEND_MSG)
+        if len(indptr) != len(constant_terms) + 1:
+            raise Exception(self.ROW_POINTERS_MUST_MATCH_MSG)
+        if any([index < 0 or index >= dimension for index in indices]):
+            raise Exception(self.INDEX_OUT_OF_RANGE_MSG)
+
+        self.backend = backend
+        self.number_type = Vector.BACKENDS[backend]
+        self.dimension = dimension
+        self.indptr = array('l', indptr)
+        self.indices = array('l', indices)
+        self.data = self.new_values(data)
+        self.constant_terms = self.new_values(constant_terms)
+        self.set_column_index()
+
+
+    @classmethod
+    def from_equations(cls, equations, dimension, backend='decimal'):
+        '''
+        Input: list of (coefficients, constant_term) where coefficients is a dict
+        {variable index: coefficient}; zero coefficients are dropped.
+        '''
+        indptr = [0]
+        indices = []
+        data = []
+        constant_terms = []
+        for coefficients, constant_term in equations:
+            for index in sorted(coefficients):
+                if coefficients[index] != 0:
+                    indices.append(index)
+                    data.append(coefficients[index])
+            indptr.append(len(indices))
+            constant_terms.append(constant_term)
+        return cls(indptr, indices, data, constant_terms, dimension, backend)
+
+
+    @classmethod
+    def from_linear_system(cls, system):
+        equations = [(dict(enumerate(p.normal_vector.coordinates)), p.constant_term) for p in system.planes]
+        return cls.from_equations(equations, system.dimension, system.backend)
+
+
+    def to_linear_system(self):
+        '''
+        Output: the equivalent dense LinearSystem
+        '''
+        from hyperplane import Hyperplane
+        planes = []
+        for i in range(len(self)):
+            coordinates = [0] * self.dimension
+            for index, value in self.row(i):
+                coordinates[index] = value
+            planes.append(Hyperplane(Vector(coordinates, self.backend), self.constant_terms[i]))
+        return LinearSystem(planes)
+
+
+    def new_values(self, values):
+        '''
+        This packs coefficient values into the storage type of the backend:
+        an array('d') for float64, a list of Decimals or Fractions otherwise.
+        '''
+        if self.backend == 'float64':
+            return array('d', values)
+        return [self.number_type(x) for x in values]
+
+
+    def set_column_index(self):
+        '''
+        This builds column_indptr and column_rows, the equations containing each
+        variable in CSC order: variable j appears in the equations
+        column_rows[column_indptr[j]:column_indptr[j+1]].
+        '''
+        counts = [0] * (self.dimension + 1)
+        for index in self.indices:
+            counts[index+1] += 1
+        for j in range(self.dimension):
+            counts[j+1] += counts[j]
+        self.column_indptr = array('l', counts)
+        self.column_rows = array('l', bytes(array('l').itemsize * len(self.indices)))
+        position = list(counts[:-1])
+        for i in range(len(self)):
+            for k in range(self.indptr[i], self.indptr[i+1]):
+                j = self.indices[k]
+                self.column_rows[position[j]] = i
+                position[j] += 1
+
+
+    def __len__(self):
+        return len(self.constant_terms)
+
+
+    def __repr__(self):
+        return 'SparseLinearSystem({} equations, {} variables, {} nonzeros)'.format(
+            len(self), self.dimension, self.nnz)
+
+
+    def __str__(self):
+        temp = []
+        for i in range(len(self)):
+            terms = ' + '.join(['{}*x{}'.format(round(float(value), 3), index+1) for index, value in self.row(i)])
+            temp.append('Equation {}: {} = {}'.format(i+1, terms or '0', round(float(self.constant_terms[i]), 3)))
+        return '\n'.join(temp)
+
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+
+    def row(self, i):
+        '''
+        Output: list of (variable index, coefficient) pairs of equation i
+        '''
+        start, end = self.indptr[i], self.indptr[i+1]
+        return list(zip(self.indices[start:end], self.data[start:end]))
+
+
+    def column(self, j):
+        '''
+        Output: list of the equations in which variable j has a nonzero coefficient
+        '''
+        return list(self.column_rows[self.column_indptr[j]:self.column_indptr[j+1]])
+
+
+    def eliminate(self):
+        '''
+        Output: (rows, constant_terms, pivots) after sparse Gauss-Jordan elimination;
+        rows are dicts {variable index: coefficient}, pivots a list of
+        (equation, variable) pairs in elimination order.
+        The pivot variable is the one left in the fewest not yet eliminated
+        equations (minimum degree), which keeps fill-in low.  Within its column the
+        pivot equation is the shortest one among those whose |coeff| is within a
+        factor PIVOT_THRESHOLD of the largest (threshold partial pivoting).  Each step
+        visits only the equations listed for the pivot variable and only the
+        nonzeros of the pivot equation.
+        '''
+        one = self.number_type(1)
+        rows = [dict(self.row(i)) for i in range(len(self))]
+        constant_terms = list(self.constant_terms)
+        column_rows = [set(self.column(j)) for j in range(self.dimension)]
+        active = set(range(len(rows)))
+        degree = [len(equations) for equations in column_rows]
+        heap = [(degree[j], j) for j in range(self.dimension) if degree[j]]
+        heapify(heap)
+        pivots = []
+
+        while heap:
+            d, col = heappop(heap)
+            if d != degree[col] or d == 0:
+                continue
+
+            candidates = [i for i in column_rows[col] if i in active]
+            largest = max([abs(rows[i][col]) for i in candidates])
+            row = min([i for i in candidates if abs(rows[i][col]) * self.PIVOT_THRESHOLD >= largest],
+                      key=lambda i: (len(rows[i]), i))
+
+            pivot_row = rows[row]
+            beta = pivot_row[col]
+            for index in pivot_row:
+                pivot_row[index] = pivot_row[index] / beta
+            pivot_row[col] = one
+            constant_terms[row] = constant_terms[row] / beta
+
+            active.remove(row)
+            changed = set(pivot_row)
+            for index in pivot_row:
+                degree[index] -= 1
+
+            for k in list(column_rows[col]):
+                if k == row:
+                    continue
+                target = rows[k]
+                is_active = k in active
+                gamma = target.pop(col)
+                for index, value in pivot_row.items():
+                    if index == col:
+                        continue
+                    if index in target:
+                        new_value = target[index] - gamma*value
+                        if is_near_zero(new_value):
+                            del target[index]
+                            column_rows[index].discard(k)
+                            if is_active:
+                                degree[index] -= 1
+                        else:
+                            target[index] = new_value
+                    else:
+                        target[index] = -gamma*value
+                        column_rows[index].add(k)
+                        if is_active:
+                            degree[index] += 1
+                constant_terms[k] -= gamma*constant_terms[row]
+                if is_active:
+                    degree[col] -= 1
+            column_rows[col] = set([row])
+            pivots.append((row, col))
+
+            for index in changed:
+                if degree[index]:
+                    heappush(heap, (degree[index], index))
+
+        return rows, constant_terms, pivots
+
+
+    def compute_rref(self):
+        '''
+        Output: SparseLinearSystem in reduced row echelon form
+        Each pivot equation has coefficient 1 on its pivot variable, which appears
+        in no other equation; equations are ordered by pivot variable and the
+        remaining 0 = k equations come last.  When the system has free variables
+        the minimum degree ordering may pick different pivot variables than the
+        dense compute_rref.
+        '''
+        rows, constant_terms, pivots = self.eliminate()
+        pivot_rows = set([row for row, col in pivots])
+        order = [row for col, row in sorted([(col, row) for row, col in pivots])]
+        order += [i for i in range(len(rows)) if i not in pivot_rows]
+
+        equations = [(rows[i], constant_terms[i]) for i in order]
+        return SparseLinearSystem.from_equations(equations, self.dimension, self.backend)
+
+
+    def compute_solution(self):
+        '''
+        Output: SparseParametrization of the solution set, or NO_SOLUTIONS_MSG
+        '''
+        try:
+            return self.do_sparse_elimination_and_parametrize_solution()
+
+        except Exception as e:
+            if str(e) == self.NO_SOLUTIONS_MSG:
+                return str(e)
+            else:
+                raise e
+
+
+    def do_sparse_elimination_and_parametrize_solution(self):
+        rows, constant_terms, pivots = self.eliminate()
+        pivot_rows = set([row for row, col in pivots])
+        for i in range(len(rows)):
+            if i not in pivot_rows and not is_near_zero(constant_terms[i]):
+                raise Exception(self.NO_SOLUTIONS_MSG)
+
+        num_variables = self.dimension
+        basepoint_coords = [0] * num_variables
+        for row, col in pivots:
+            basepoint_coords[col] = constant_terms[row]
+
+        # free variable -> (pivot variable, coefficient) of the pivot rows it is in
+        pivot_variables = set([col for row, col in pivots])
+        free_terms = {}
+        for row, col in pivots:
+            for index, value in rows[row].items():
+                if index != col:
+                    free_terms.setdefault(index, []).append((col, value))
+
+        # each direction vector only lists its nonzeros, (index, value) by index
+        one = self.number_type(1)
+        direction_vectors = []
+        for free_var in range(num_variables):
+            if free_var in pivot_variables:
+                continue
+            terms = [(col, -value) for col, value in free_terms.get(free_var, [])]
+            direction_vectors.append(sorted(terms + [(free_var, one)]))
+
+        return SparseParametrization(Vector(basepoint_coords, self.backend), direction_vectors)
+
+
+    def solve_iterative(self, method='cg', tol=1e-10, maxiter=None, x0=None, callback=None):
+        '''
+        Same as LinearSystem.solve_iterative, running directly on the CSR rows:
+        each iteration costs O(nnz).
+        Output: float64 Vector solution, or NOT_CONVERGED_MSG
+        '''
+        if len(self) != self.dimension:
+            raise Exception(self.ITERATIVE_NEEDS_SQUARE_SYSTEM_MSG)
+        if isinstance(x0, Vector):
+            x0 = x0.coordinates
+        rows = []
+        for i in range(len(self)):
+            start, end = self.indptr[i], self.indptr[i+1]
+            rows.append((self.indices[start:end], [float(x) for x in self.data[start:end]]))
+        x, converged = solve_iterative(rows, self.constant_terms, method, tol, maxiter, x0, callback)
+        if not converged:
+            return self.NOT_CONVERGED_MSG
+        return Vector(x, 'float64')
+
+
+class SparseParametrization(object):
+
+    def __init__(self, basepoint, direction_vectors):
+        '''
+        Input: basepoint Vector, and one list of (index, value) pairs per free
+        variable, the nonzeros of its direction vector
+        Review: a system with F free variables in n dimensions would need F x n
+        coordinates as dense Vectors; here the direction vectors take the
+        nonzeros of the RREF plus one entry per free variable, and only the
+        basepoint is dense (n values).
+        '''
+        self.basepoint = basepoint
+        self.direction_vectors = direction_vectors
+        self.dimension = basepoint.dimension
+
+
+    def __repr__(self):
+        return 'SparseParametrization({} dimensions, {} direction vectors, {} nonzeros)'.format(
+            self.dimension, len(self.direction_vectors), sum([len(v) for v in self.direction_vectors]))
+
+
+    def __str__(self):
+        return str(self.to_parametrization())
+
+
+    def direction_vector(self, k):
+        '''
+        Output: direction vector k as a dense Vector
+        '''
+        coordinates = [0] * self.dimension
+        for index, value in self.direction_vectors[k]:
+            coordinates[index] = value
+        return Vector(coordinates, self.basepoint.backend)
+
+
+    def to_parametrization(self):
+        '''
+        Output: the dense Parametrization, F x n coordinates for F free variables
+        '''
+        return Parametrization(self.basepoint, [self.direction_vector(k) for k in range(len(self.direction_vectors))])
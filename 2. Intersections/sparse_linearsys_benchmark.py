@@ -0,0 +1,32 @@
+import sys
+from time import perf_counter
+from sparse_linearsys import SparseLinearSystem
+
+# Solves the 5-point Laplacian on a k x k grid (k*k variables, at most five
+# nonzeros per equation) with SparseLinearSystem.compute_solution and reports
+# the stored nonzeros and the time for each backend.
+# Usage: python sparse_linearsys_benchmark.py [k ...]   (default k = 20 30)
+
+sizes = [int(k) for k in sys.argv[1:]] or [20, 30]
+
+
+def laplacian(k, backend):
+    equations = []
+    for r in range(k):
+        for c in range(k):
+            coefficients = {r*k + c: 4}
+            for rr, cc in ((r-1, c), (r+1, c), (r, c-1), (r, c+1)):
+                if 0 <= rr < k and 0 <= cc < k:
+                    coefficients[rr*k + cc] = -1
+            equations.append((coefficients, 1))
+    return SparseLinearSystem.from_equations(equations, k*k, backend)
+
+
+print('{:>8}{:>10}{:>10}{:>10}'.format('vars', 'backend', 'nnz', 'time (s)'))
+for k in sizes:
+    for backend in ('float64', 'decimal'):
+        s = laplacian(k, backend)
+        start = perf_counter()
+        s.compute_solution()
+        seconds = perf_counter() - start
+        print('{:>8}{:>10}{:>10}{:>10.3f}'.format(k*k, backend, s.nnz, seconds))
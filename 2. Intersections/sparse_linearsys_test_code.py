@@ -0,0 +1,38 @@
+from linearsys import LinearSystem
+from sparse_linearsys import SparseLinearSystem
+from hyperplane import Hyperplane
+from vector_alt import Vector
+
+p1 = Hyperplane(normal_vector=Vector([1,1,1]), constant_term = 6)
+p2 = Hyperplane(normal_vector=Vector([0,2,5]), constant_term = -4)
+p3 = Hyperplane(normal_vector=Vector([2,5,-1]), constant_term = 27)
+s = SparseLinearSystem.from_linear_system(LinearSystem([p1,p2,p3]))
+print(repr(s))
+print(s)
+print()
+print('Column index, x2 appears in equations:', s.column(1))
+print()
+print('One Solution Test')
+print(s.compute_rref())
+print(s.compute_solution())
+
+p3 = Hyperplane(normal_vector=Vector([1,3,6]), constant_term = 2)
+s = SparseLinearSystem.from_linear_system(LinearSystem([p1,p2,p3]))
+print('Infinite Solutions Test')
+print(s.compute_rref())
+print(s.compute_solution())
+
+p3 = Hyperplane(normal_vector=Vector([1,3,6]), constant_term = 3)
+s = SparseLinearSystem.from_linear_system(LinearSystem([p1,p2,p3]))
+print('No Solution Test')
+print(s.compute_solution())
+print()
+
+# x1 + x2 = 3, x2 - x3 = 1, x3 + x4 = 2, x4 = 1 out of 1000 variables
+s = SparseLinearSystem.from_equations([({0: 1, 1: 1}, 3), ({1: 1, 2: -1}, 1), ({2: 1, 3: 1}, 2), ({3: 1}, 1)],
+                                      1000, 'float64')
+print('Sparse Test:', repr(s))
+solution = s.compute_solution()
+print('Basepoint:', list(solution.basepoint.coordinates[:4]), 'Free variables:', len(solution.direction_vectors))
+print(repr(solution), 'First direction:', solution.direction_vectors[0], solution.direction_vector(0).coordinates[:5])
+print()
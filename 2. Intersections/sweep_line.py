@@ -0,0 +1,275 @@
+from heapq import heapify, heappush, heappop
+from math import sqrt
+
+# Reports the intersections of lines clipped to a box, used by
+# LineSet.box_intersections.  A segment is a tuple (i, a, b, c, x1, y1, x2, y2):
+# line i is a x + b y = c and the segment runs from (x1, y1) to (x2, y2) with
+# x1 <= x2.  Intersections are computed from the line coefficients (Cramer's
+# rule), and pairs of parallel or coincident lines are never reported.
+
+# event kinds, in the order they are handled at equal x
+LEFT = 0
+CROSS = 1
+VERTICAL = 2
+RIGHT = 3
+
+
+def clip_line(a, b, c, xmin, ymin, xmax, ymax, tol=1e-10):
+    '''
+    Output: (x1, y1, x2, y2) of the line a x + b y = c inside the box, with
+    x1 <= x2 (y1 <= y2 for a vertical line), or None if the line misses the box
+    or only touches one of its corners
+    '''
+    eps = tol * max(1.0, xmax - xmin, ymax - ymin)
+    points = []
+    if b:
+        for x in (xmin, xmax):
+            y = (c - a*x) / b
+            if ymin - eps <= y <= ymax + eps:
+                points.append((x, min(max(y, ymin), ymax)))
+    if a:
+        for y in (ymin, ymax):
+            x = (c - b*y) / a
+            if xmin - eps <= x <= xmax + eps:
+                points.append((min(max(x, xmin), xmax), y))
+    if len(points) < 2:
+        return None
+    (x1, y1), (x2, y2) = min(points), max(points)
+    if x2 - x1 <= eps and y2 - y1 <= eps:
+        return None
+    return x1, y1, x2, y2
+
+
+def intersection(s, t, tol=1e-10):
+    '''
+    Output: (x, y) where the lines of segments s and t cross, or None when they
+    are parallel; the lines are expected scaled to |a| + |b| = 1
+    '''
+    det = s[1]*t[2] - s[2]*t[1]
+    if abs(det) <= tol:
+        return None
+    return (s[3]*t[2] - s[2]*t[3]) / det, (s[1]*t[3] - s[3]*t[1]) / det
+
+
+def is_vertical(segment, eps):
+    return segment[6] - segment[4] <= eps
+
+
+def merge_coincident(segments, eps):
+    '''
+    Output: (segments, groups); one segment per set of coincident lines, and
+    groups[k] the indices of the lines that segment k stands for
+    Lines are compared by (a, b, c) up to sign, after sorting them by it.
+    '''
+    keyed = []
+    for s in segments:
+        sign = -1 if s[1] < 0 or (s[1] == 0 and s[2] < 0) else 1
+        keyed.append(((sign*s[1], sign*s[2], sign*s[3]), s))
+    keyed.sort(key=lambda item: item[0])
+    merged = []
+    groups = []
+    previous = None
+    for key, s in keyed:
+        if previous is not None and all([abs(u - v) <= eps for u, v in zip(key, previous)]):
+            groups[-1].append(s[0])
+        else:
+            merged.append(s)
+            groups.append([s[0]])
+        previous = key
+    return merged, groups
+
+
+def sweep_intersections(segments, tol=1e-10):
+    '''
+    Input: list of segments (see above)
+    Output: generator of (i, j, x, y), i < j, one per crossing pair of lines
+    Bentley-Ottmann sweep from left to right.  The status list holds the
+    segments crossing the sweep line, ordered by y there; only segments that
+    become neighbours in it are intersected, so the work is O((N + K) log N)
+    comparisons for N segments and K crossings.  All crossings found at one
+    point are handled together: the segments through it form a block in the
+    status, which is re-sorted by slope (their order just right of the point),
+    so three or more lines through one point need no special case.  Vertical
+    segments never enter the status; each is a range query on it instead.
+    Coincident lines are swept once, as one segment standing for all of them.
+    '''
+    if not segments:
+        return
+    width = max([s[6] for s in segments]) - min([s[4] for s in segments])
+    eps = tol * max(1.0, width)
+    segments, groups = merge_coincident(segments, eps)
+    a = [s[1] for s in segments]
+    b = [s[2] for s in segments]
+    c = [s[3] for s in segments]
+    vertical = [is_vertical(s, eps) for s in segments]
+    slopes = [0.0 if v else -s[1] / s[2] for s, v in zip(segments, vertical)]
+
+    def y_at(k, x):
+        return (c[k] - a[k]*x) / b[k]
+
+    def find(x, y, s):
+        # first status position whose (y, slope) at x is not below (y, s)
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t = status[mid]
+            yt = (c[t] - a[t]*x) / b[t]
+            if yt < y or (yt == y and slopes[t] < s):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def schedule(k, l, x):
+        pair = (k, l) if k < l else (l, k)
+        if pair in scheduled:
+            return
+        point = intersection(segments[k], segments[l], tol)
+        if point is None:
+            return
+        px, py = point
+        right = min(segments[k][6], segments[l][6])
+        if px < x - eps or px > right + eps:
+            return
+        scheduled.add(pair)
+        # clamped into both segments, so a crossing at an end point is handled
+        # before the RIGHT event removing the segment (CROSS < RIGHT at equal x)
+        heappush(events, (min(max(px, x), right), CROSS, py, pair, px))
+
+    def report(k, l, x, y):
+        for i in groups[k]:
+            for j in groups[l]:
+                yield (i, j, x, y) if i < j else (j, i, x, y)
+
+    events = []
+    for k, s in enumerate(segments):
+        if vertical[k]:
+            events.append(((s[4] + s[6]) / 2, VERTICAL, min(s[5], s[7]), k))
+        else:
+            # widened by eps, so events within eps of an end point (a vertical,
+            # another end point, a crossing on the box edge) see the segment
+            events.append((s[4] - eps, LEFT, s[5], k))
+            events.append((s[6] + eps, RIGHT, s[7], k))
+    heapify(events)
+    status = []
+    scheduled = set()
+
+    while events:
+        event = heappop(events)
+        x, kind, y = event[0], event[1], event[2]
+
+        if kind == LEFT:
+            k = event[3]
+            p = find(x, y_at(k, x), slopes[k])
+            status.insert(p, k)
+            if p > 0:
+                schedule(status[p-1], k, x)
+            if p + 1 < len(status):
+                schedule(k, status[p+1], x)
+
+        elif kind == RIGHT:
+            k = event[3]
+            p = status.index(k)
+            del status[p]
+            if 0 < p < len(status):
+                schedule(status[p-1], status[p], x)
+
+        elif kind == VERTICAL:
+            k = event[3]
+            top = max(segments[k][5], segments[k][7])
+            p = find(x, y - eps, float('-inf'))
+            while p < len(status):
+                yt = y_at(status[p], x)
+                if yt > top + eps:
+                    break
+                yield from report(k, status[p], x, yt)
+                p += 1
+
+        else:
+            crossings = [event]
+            while events and events[0][1] == CROSS and events[0][0] - x <= eps and abs(events[0][2] - y) <= eps:
+                crossings.append(heappop(events))
+            for crossing in crossings:
+                k, l = crossing[3]
+                yield from report(k, l, crossing[4], crossing[2])
+
+            # the segments through the point, found by y instead of list.index
+            members = set([k for crossing in crossings for k in crossing[3]])
+            lo = hi = find(x, y - eps, float('-inf'))
+            while hi < len(status) and y_at(status[hi], x) <= y + eps:
+                hi += 1
+            hi -= 1
+            if not members.issubset(status[lo:hi+1]):
+                positions = [status.index(k) for k in members]
+                lo, hi = min(positions), max(positions)
+            block = sorted(status[lo:hi+1], key=slopes.__getitem__)
+            # segments between the crossing ones pass through the same point
+            for u in range(len(block)):
+                for v in range(u + 1, len(block)):
+                    k, l = block[u], block[v]
+                    pair = (k, l) if k < l else (l, k)
+                    if pair not in scheduled:
+                        point = intersection(segments[k], segments[l], tol)
+                        if point is not None:
+                            scheduled.add(pair)
+                            yield from report(k, l, point[0], point[1])
+            status[lo:hi+1] = block
+            if lo > 0:
+                schedule(status[lo-1], status[lo], x)
+            if hi + 1 < len(status):
+                schedule(status[hi], status[hi+1], x)
+
+
+def grid_intersections(segments, xmin, ymin, xmax, ymax, tol=1e-10, cells=None):
+    '''
+    Input: list of segments (see above) inside the box, number of cells per side
+    (default about sqrt(N))
+    Output: generator of (i, j, x, y), i < j, one per crossing pair of lines
+    Each segment is listed in every grid cell it passes through, then the pairs
+    within each cell are intersected.  A crossing is reported only by the cell
+    containing it, so a pair sharing several cells is reported once.  Simpler
+    than the sweep and fast for evenly spread lines, but a cell crossed by many
+    lines costs the square of their number.
+    '''
+    if not segments:
+        return
+    if cells is None:
+        cells = max(1, int(sqrt(len(segments))))
+    cell_width = (xmax - xmin) / cells or 1.0
+    cell_height = (ymax - ymin) / cells or 1.0
+    eps = tol * max(1.0, xmax - xmin, ymax - ymin)
+
+    def column(x):
+        return min(cells - 1, max(0, int((x - xmin) / cell_width)))
+
+    def row(y):
+        return min(cells - 1, max(0, int((y - ymin) / cell_height)))
+
+    buckets = {}
+    for k, s in enumerate(segments):
+        x1, y1, x2, y2 = s[4:]
+        for col in range(column(x1 - eps), column(x2 + eps) + 1):
+            if is_vertical(s, eps):
+                low, high = y1, y2
+            else:
+                # the part of the segment inside this column of cells
+                left = max(x1, xmin + col*cell_width)
+                right = min(x2, xmin + (col + 1)*cell_width)
+                low = (s[3] - s[1]*left) / s[2]
+                high = (s[3] - s[1]*right) / s[2]
+            for r in range(row(min(low, high) - eps), row(max(low, high) + eps) + 1):
+                buckets.setdefault((col, r), []).append(k)
+
+    for cell, members in buckets.items():
+        for u in range(len(members)):
+            s = segments[members[u]]
+            for v in range(u + 1, len(members)):
+                t = segments[members[v]]
+                point = intersection(s, t, tol)
+                if point is None:
+                    continue
+                x, y = point
+                if not (xmin - eps <= x <= xmax + eps and ymin - eps <= y <= ymax + eps):
+                    continue
+                if (column(x), row(y)) == cell:
+                    yield (s[0], t[0], x, y) if s[0] < t[0] else (t[0], s[0], x, y)
@@ -1,13 +1,34 @@
 from math import sqrt, acos, pi
 from decimal import Decimal
+from fractions import Fraction
+from array import array
+from operator import add, sub, mul
 
 class Vector(object):
     
-    def __init__(self, coordinates):
+    BACKENDS = {'decimal': Decimal, 'float64': float, 'fraction': Fraction}
+    UNKNOWN_BACKEND_MSG = 'The backend must be one of: decimal, float64, fraction'
+
+    def __init__(self, coordinates, backend='decimal'):
+        '''
+        The decimal backend (default) is the precise mode and keeps each coordinate
+        as a Decimal in a tuple.  The float64 backend keeps the coordinates in a
+        contiguous array('d') so the arithmetic runs at native float speed.
+        The fraction backend keeps exact Fractions in a tuple, for exact results.
+        Both vectors of a binary operation must use the same backend.
+        '''
+        if backend not in self.BACKENDS:
+            raise ValueError(self.UNKNOWN_BACKEND_MSG)
+        self.backend = backend
+        self.number_type = self.BACKENDS[backend]
+
         try:
             if not coordinates:
                 raise ValueError
-            self.coordinates = tuple([Decimal(c) for c in coordinates])
+            if backend == 'float64':
+                self.coordinates = array('d', coordinates)
+            else:
+                self.coordinates = tuple([self.number_type(c) for c in coordinates])
             self.dimension = len(coordinates)
 #            self.normalize = self.normalize()
 
@@ -35,30 +56,40 @@ class Vector(object):
         return self.coordinates == v.coordinates
     
 
+    def new_coordinates(self, values):
+        '''
+        This packs computed coordinate values into the storage type of the
+        backend: a tuple for decimal and fraction, an array('d') for float64.
+        '''
+        if self.backend == 'float64':
+            return array('d', values)
+        return tuple(values)
+
+
     def plus(self, v):
-        new_coordinates = tuple([x+y for x,y in zip(self.coordinates, v.coordinates)])
-        return new_coordinates
+        return self.new_coordinates(map(add, self.coordinates, v.coordinates))
     
     
     def minus(self, v):
-        new_coordinates = tuple([x-y for x,y in zip(self.coordinates, v.coordinates)])
-        return new_coordinates
+        return self.new_coordinates(map(sub, self.coordinates, v.coordinates))
     
 
     def scalar_mult(self, c):
         '''
         This computes the scaled vector for given a scalar constant
         '''
-        new_coordinates = tuple([Decimal(c)*x for x in self.coordinates])
-        return new_coordinates
+        c = self.number_type(c)
+        return self.new_coordinates([c*x for x in self.coordinates])
     
     
     def magnitude(self):
         '''
         This computes the magnitude scalar value of a given vector
         '''
+        if self.backend == 'float64':
+            return sqrt(sum(map(mul, self.coordinates, self.coordinates)))
         coord_squared = [x**2 for x in self.coordinates]
-        return Decimal(sqrt(sum(coord_squared)))
+        return self.number_type(sqrt(sum(coord_squared)))
     
     
     def normalize(self):
@@ -67,7 +98,7 @@ class Vector(object):
         '''
         try:
             mag = self.magnitude()
-            return self.scalar_mult(Decimal(1.0)/mag)
+            return self.scalar_mult(self.number_type(1.0)/mag)
 
         except ZeroDivisionError:           
             return Exception('Cannot normalize the zero vector')
@@ -77,7 +108,7 @@ class Vector(object):
         '''
         This computes the dot product value of a given pair of vectors
         '''
-        return sum([x*y for x,y in zip(self.coordinates, v.coordinates)])
+        return sum(map(mul, self.coordinates, v.coordinates))
     
     
     def dot_prod_unit(self, v):
@@ -86,7 +117,7 @@ class Vector(object):
         (unit) vectors. Result is numerically equal to the cosine of the angle between.
         '''
         try:
-            return sum([x*y for x,y in zip(self.normalize(), v.normalize())])
+            return sum(map(mul, self.normalize(), v.normalize()))
         except:
             return 'One or more zero vectors'
     
@@ -138,9 +169,9 @@ class Vector(object):
         vector b.  Self instance is the reference vector b.
         V dot reference unit vector is V parallel magnitude.
         '''
-        unit_b = Vector(self.normalize())
+        unit_b = Vector(self.normalize(), self.backend)
         mag_vpar = v.dot_prod(unit_b) #scalar value
-        return Vector(unit_b.scalar_mult(mag_vpar))
+        return Vector(unit_b.scalar_mult(mag_vpar), self.backend)
     
     
     def perp_to_b(self, v):
@@ -150,7 +181,7 @@ class Vector(object):
         V minus Vparallel vector is Vpendicular vector.
         '''       
         v_para = self.proj_on_b(v)
-        return Vector(v.minus(v_para))
+        return Vector(v.minus(v_para), self.backend)
     
     
     def para_plus_perp(self, b):
@@ -161,7 +192,7 @@ class Vector(object):
         '''          
         v_para = b.proj_on_b(self)
         v_perp = b.perp_to_b(self)
-        return Vector(v_para.plus(v_perp))
+        return Vector(v_para.plus(v_perp), self.backend)
     
     
     def cross_prod(self, w):
@@ -170,7 +201,7 @@ class Vector(object):
         '''
         Vx, Vy, Vz = self.coordinates
         Wx, Wy, Wz = w.coordinates
-        return Vector([Vy*Wz - Wy*Vz, Wx*Vz - Vx*Wz, Vx*Wy - Wx*Vy])
+        return Vector([Vy*Wz - Wy*Vz, Wx*Vz - Vx*Wz, Vx*Wy - Wx*Vy], self.backend)
     
     
     def area_parallogram (self, w):
@@ -190,3 +221,206 @@ class Vector(object):
         cross = self.cross_prod(w)
         return cross.magnitude()/2
     
+
+class VectorArray(object):
+
+    DIMENSIONS_MUST_MATCH_MSG = 'The vectors must have the same dimension'
+    LENGTHS_MUST_MATCH_MSG = 'Both vector arrays must hold the same number of vectors'
+    CROSS_PROD_NEEDS_3D_MSG = 'The cross product is only defined for 3D vectors'
+
+    def __init__(self, data, dimension):
+        '''
+        Holds N vectors of the same dimension d as one contiguous N x d block
+        (row-major array('d')), so an operation on the whole batch is a single
+        call.  The second operand of a binary operation is either another
+        VectorArray with the same N, or a single Vector applied to every row.
+        '''
+        try:
+            if not data:
+                raise ValueError
+            self.data = array('d', data)
+            self.dimension = dimension
+            if len(self.data) % dimension:
+                raise ValueError
+
+        except ValueError:
+            raise ValueError('The data must be a nonempty multiple of the dimension')
+
+        except TypeError:
+            raise TypeError('The data must be an iterable')
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        '''
+        Input: list of Vector objects (either backend)
+        Output: VectorArray holding the vectors as rows
+        float64 coordinates are copied as raw buffers, decimal coordinates
+        go straight to float.
+        '''
+        dimension = vectors[0].dimension
+        data = array('d')
+        for v in vectors:
+            if v.dimension != dimension:
+                raise ValueError(cls.DIMENSIONS_MUST_MATCH_MSG)
+            data.extend(v.coordinates if v.backend == 'float64' else array('d', v.coordinates))
+        return cls(data, dimension)
+
+
+    def to_vectors(self, backend='float64'):
+        d = self.dimension
+        return [Vector(self.data[i:i+d], backend) for i in range(0, len(self.data), d)]
+
+
+    def __len__(self):
+        return len(self.data) // self.dimension
+
+
+    def __getitem__(self, i):
+        '''
+        Output: float64 Vector for an integer index, new VectorArray of the
+        selected rows for a slice (rows are copied, possibly none)
+        '''
+        d = self.dimension
+        if isinstance(i, slice):
+            rows = range(len(self))[i]
+            if rows.step == 1:
+                data = self.data[rows.start*d:rows.stop*d]
+            else:
+                data = array('d')
+                for k in rows:
+                    data.extend(self.data[k*d:(k+1)*d])
+            # built directly, since __init__ rejects an empty block
+            selected = VectorArray.__new__(VectorArray)
+            selected.data = data
+            selected.dimension = d
+            return selected
+        i = range(len(self))[i]
+        return Vector(self.data[i*d:(i+1)*d], 'float64')
+
+
+    def __repr__(self):
+        return 'VectorArray(' + str(self.to_vectors()) + ')'
+
+
+    def __str__(self):
+        return 'VectorArray: {} x {}'.format(len(self), self.dimension)
+
+
+    def operand_data(self, v):
+        '''
+        This returns the flat data of the second operand, repeating a single
+        Vector once per row so both operands line up element by element.
+        '''
+        if v.dimension != self.dimension:
+            raise ValueError(self.DIMENSIONS_MUST_MATCH_MSG)
+        if isinstance(v, VectorArray):
+            if len(v) != len(self):
+                raise ValueError(self.LENGTHS_MUST_MATCH_MSG)
+            return v.data
+        return array('d', v.coordinates) * len(self)
+
+
+    def row_sums(self, data):
+        '''
+        This sums each row of a flat N x d block, one strided column at a time.
+        '''
+        d = self.dimension
+        sums = data[0::d]
+        for k in range(1, d):
+            sums = array('d', map(add, sums, data[k::d]))
+        return sums
+
+
+    def scale_rows(self, factors):
+        '''
+        This multiplies row i by factors[i].
+        '''
+        d = self.dimension
+        scaled = array('d', self.data)
+        for k in range(d):
+            scaled[k::d] = array('d', map(mul, self.data[k::d], factors))
+        return VectorArray(scaled, d)
+
+
+    def plus(self, v):
+        return VectorArray(map(add, self.data, self.operand_data(v)), self.dimension)
+
+
+    def minus(self, v):
+        return VectorArray(map(sub, self.data, self.operand_data(v)), self.dimension)
+
+
+    def scalar_mult(self, c):
+        c = float(c)
+        return VectorArray([c*x for x in self.data], self.dimension)
+
+
+    def dot_prod(self, v):
+        '''
+        Output: array('d') with the dot product of each pair of rows
+        '''
+        return self.row_sums(array('d', map(mul, self.data, self.operand_data(v))))
+
+
+    def magnitude(self):
+        return array('d', map(sqrt, self.dot_prod(self)))
+
+
+    def normalize(self):
+        '''
+        This computes the unit vector of each row.  Zero rows stay zero since
+        they have no direction.
+        '''
+        return self.scale_rows([1.0/m if m else 0.0 for m in self.magnitude()])
+
+
+    def angle(self, v, degrees=False):
+        '''
+        Output: array('d') of incident angles; nan where either row is a zero vector
+        '''
+        if not isinstance(v, VectorArray):
+            v = VectorArray(self.operand_data(v), self.dimension)
+        scale = 180/pi if degrees else 1.0
+        angles = array('d')
+        for dot, m1, m2 in zip(self.dot_prod(v), self.magnitude(), v.magnitude()):
+            if m1 < 1e-10 or m2 < 1e-10:
+                angles.append(float('nan'))
+            else:
+                cosine = max(-1.0, min(1.0, round(dot/(m1*m2), 10)))
+                angles.append(acos(cosine)*scale)
+        return angles
+
+
+    def parallel(self, v, tolerance=10e-10):
+        '''
+        Output: list of bools, True where the rows are parallel or either is zero
+        '''
+        return [a != a or a < tolerance or abs(a - pi) < tolerance for a in self.angle(v)]
+
+
+    def orthogonal(self, v, tolerance=10e-10):
+        return [abs(dot) < tolerance for dot in self.dot_prod(v)]
+
+
+    def proj_on_b(self, v):
+        '''
+        This computes the parallel component of each row of v on to the
+        matching reference row b.  Self instance holds the reference vectors b.
+        (v dot b)/(b dot b) scales b; a zero reference gives a zero projection.
+        '''
+        v_dot_b = self.dot_prod(v)
+        b_dot_b = self.dot_prod(self)
+        return self.scale_rows([x/y if y else 0.0 for x, y in zip(v_dot_b, b_dot_b)])
+
+
+    def cross_prod(self, w):
+        if self.dimension != 3:
+            raise ValueError(self.CROSS_PROD_NEEDS_3D_MSG)
+        w_data = self.operand_data(w)
+        Vx, Vy, Vz = self.data[0::3], self.data[1::3], self.data[2::3]
+        Wx, Wy, Wz = w_data[0::3], w_data[1::3], w_data[2::3]
+        cross = array('d', self.data)
+        cross[0::3] = array('d', [vy*wz - wy*vz for vy, vz, wy, wz in zip(Vy, Vz, Wy, Wz)])
+        cross[1::3] = array('d', [wx*vz - vx*wz for vx, vz, wx, wz in zip(Vx, Vz, Wx, Wz)])
+        cross[2::3] = array('d', [vx*wy - wx*vy for vx, vy, wx, wy in zip(Vx, Vy, Wx, Wy)])
+        return VectorArray(cross, 3)
@@ -1,4 +1,4 @@
-from vector_alt import Vector
+from vector_alt import Vector, VectorArray
 
     
 print('First pair...')
@@ -98,3 +98,22 @@ w = Vector([-6.007, 0.124, 5.772])
 print('v:', v)
 print('w:', w)
 print('Area of Triangle:', round(v.area_of_triangle(w), 3))
+print()
+print('float64 backend ...')
+v = Vector([-2.029, 9.97, 4.172], backend='float64')
+w = Vector([-9.231, -6.639, -7.245], backend='float64')
+print('v:', v)
+print('w:', w)
+print('Dot Prod:', round(v.dot_prod(w), 3))
+print('Unit Vector v:', Vector(v.normalize(), 'float64'))
+print('Angle:', round(v.angle(w), 4))
+print('VxW:', v.cross_prod(w))
+print()
+print('VectorArray batch ...')
+vs = VectorArray.from_vectors([Vector([8.462, 7.893, -8.187]), Vector([-8.987, -9.838, 5.031])])
+ws = VectorArray.from_vectors([Vector([6.984, -5.975, 4.778]), Vector([-4.268, -1.861, -8.866])])
+print('Dot Prods:', [round(x, 3) for x in vs.dot_prod(ws)])
+print('Magnitudes:', [round(x, 3) for x in vs.magnitude()])
+print('Angles:', [round(x, 4) for x in vs.angle(ws)])
+print('VxW:', vs.cross_prod(ws).to_vectors())
+print('Row 1:', vs[1], 'Slice:', vs[1:].to_vectors(), 'Reversed:', vs[::-1].to_vectors(), 'Empty:', len(vs[2:]))
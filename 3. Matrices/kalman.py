@@ -0,0 +1,385 @@
+from operator import add, sub, mul, truediv
+from itertools import repeat
+from matrix import Matrix
+
+
+def gauss_jordan_inverse(s):
+    '''
+    Input: square matrix s as a list of rows
+    Output: its inverse as a new list of rows, by Gauss-Jordan with partial pivoting
+    '''
+    m = len(s)
+    work = [list(s[i]) + [float(i == j) for j in range(m)] for i in range(m)]
+    for k in range(m):
+        p = max(range(k, m), key=lambda i: abs(work[i][k]))
+        if work[p][k] == 0:
+            raise ValueError('The matrix is not invertible')
+        work[k], work[p] = work[p], work[k]
+        pivot = work[k][k]
+        work[k] = [value/pivot for value in work[k]]
+        for i in range(m):
+            if i != k and work[i][k]:
+                factor = work[i][k]
+                work[i] = [a - factor*b for a, b in zip(work[i], work[k])]
+    return [row[m:] for row in work]
+
+
+def linear_combination(terms, size):
+    '''
+    Input: list of (scalar, column) pairs and the column length
+    Output: new column, the sum of scalar*column over the pairs
+    '''
+    if not terms:
+        return [0.0] * size
+    result = None
+    for scalar, column in terms:
+        if scalar != 1:
+            column = map(mul, column, repeat(scalar, size))
+        result = list(column) if result is None else list(map(add, result, column))
+    return result
+
+
+def elementwise_combination(pairs):
+    '''
+    Input: non-empty list of (column, column) pairs of the same length
+    Output: new column, the sum of the elementwise products of each pair
+    '''
+    result = None
+    for a, b in pairs:
+        product = map(mul, a, b)
+        result = list(product) if result is None else list(map(add, result, product))
+    return result
+
+
+def is_symmetric(rows, tol=1e-9):
+    '''
+    Input: square matrix as a list of rows, relative tolerance
+    Output: True if every entry equals its mirror to within tol times the
+    largest |entry|
+    '''
+    bound = tol * max([abs(value) for row in rows for value in row])
+    return all([abs(rows[i][j] - rows[j][i]) <= bound for i in range(len(rows)) for j in range(i)])
+
+
+class KalmanFilter(object):
+
+    def __init__(self, x, P, F, H, Q, R):
+        '''
+        Input: Matrix objects; x is the n x 1 state, P the n x n covariance,
+        F the n x n state transition, H the m x n measurement function,
+        Q the n x n process noise and R the m x m measurement noise.
+        Review: the filter keeps its own row lists and preallocated buffers, so
+        predict() and update(z) build no lists per step.  P, Q and R must be
+        symmetric (checked here, ValueError otherwise): a row of P then stands in
+        for a column, so every product below is a dot product of two row lists,
+        and P is updated in its upper triangle and mirrored.
+        '''
+        n = F.rows
+        m = H.rows
+        if not (F.columns == n and x.rows == n and x.columns == 1 and P.rows == n and P.columns == n
+                and Q.rows == n and Q.columns == n and H.columns == n and R.rows == m and R.columns == m):
+            raise ValueError('The Kalman filter matrices have inconsistent dimensions')
+        if not (is_symmetric(P.matrix) and is_symmetric(Q.matrix) and is_symmetric(R.matrix)):
+            raise ValueError('The covariance matrices P, Q and R must be symmetric')
+        self.n = n
+        self.m = m
+
+        self.state = list(x.data)
+        self.covariance = P.to_lists()
+        self.transition = F.matrix
+        self.measurement = H.matrix
+        self.process_noise = Q.matrix
+        self.measurement_noise = R.matrix
+
+        # preallocated work buffers
+        self.state_buffer = [0.0] * n
+        self.fp = [[0.0] * n for _ in range(n)]             # F P
+        self.hp = [[0.0] * n for _ in range(m)]             # H P (= (P H^T)^T)
+        self.s = [[0.0] * m for _ in range(m)]              # H P H^T + R
+        self.s_inverse = [[0.0] * m for _ in range(m)]
+        self.gain = [[0.0] * n for _ in range(m)]           # K^T, one row per measurement
+        self.residual = [0.0] * m                           # z - H x
+
+
+    @property
+    def x(self):
+        return Matrix([[value] for value in self.state])
+
+
+    @property
+    def P(self):
+        return Matrix(self.covariance)
+
+
+    def predict(self):
+        '''
+        x = F x
+        P = F P F^T + Q
+        Only the upper triangle of P is computed; the lower one is mirrored.
+        '''
+        n = self.n
+        F = self.transition
+        P = self.covariance
+        Q = self.process_noise
+        x = self.state
+        new_x = self.state_buffer
+        for i in range(n):
+            new_x[i] = sum(map(mul, F[i], x))
+        self.state, self.state_buffer = new_x, x
+
+        fp = self.fp
+        for i in range(n):
+            F_i = F[i]
+            fp_i = fp[i]
+            for j in range(n):
+                fp_i[j] = sum(map(mul, F_i, P[j]))
+        for i in range(n):
+            fp_i = fp[i]
+            P_i = P[i]
+            Q_i = Q[i]
+            for j in range(i, n):
+                P_i[j] = P[j][i] = sum(map(mul, fp_i, F[j])) + Q_i[j]
+
+
+    def update(self, z):
+        '''
+        Input: measurement z (list of m values or m x 1 Matrix)
+        y = z - H x
+        S = H P H^T + R
+        K = P H^T S^-1
+        x = x + K y
+        P = (I - K H) P
+        '''
+        if isinstance(z, Matrix):
+            z = z.data
+        n = self.n
+        m = self.m
+        H = self.measurement
+        R = self.measurement_noise
+        P = self.covariance
+        x = self.state
+
+        y = self.residual
+        hp = self.hp
+        for j in range(m):
+            H_j = H[j]
+            y[j] = z[j] - sum(map(mul, H_j, x))
+            hp_j = hp[j]
+            for k in range(n):
+                hp_j[k] = sum(map(mul, H_j, P[k]))
+
+        s = self.s
+        for i in range(m):
+            H_i = H[i]
+            s_i = s[i]
+            R_i = R[i]
+            for j in range(m):
+                s_i[j] = sum(map(mul, H_i, hp[j])) + R_i[j]
+        s_inverse = self.invert_innovation()
+
+        # row j of K^T is sum over l of S^-1[l][j] * (H P)[l], accumulated in place
+        gain = self.gain
+        for j in range(m):
+            gain_j = gain[j]
+            scalar = s_inverse[0][j]
+            hp_l = hp[0]
+            for k in range(n):
+                gain_j[k] = scalar*hp_l[k]
+            for l in range(1, m):
+                scalar = s_inverse[l][j]
+                hp_l = hp[l]
+                for k in range(n):
+                    gain_j[k] += scalar*hp_l[k]
+
+        for k in range(n):
+            total = 0.0
+            for j in range(m):
+                total += gain[j][k]*y[j]
+            x[k] += total
+        for i in range(n):
+            P_i = P[i]
+            for k in range(i, n):
+                total = 0.0
+                for j in range(m):
+                    total += gain[j][i]*hp[j][k]
+                P_i[k] = P[k][i] = P_i[k] - total
+
+
+    def invert_innovation(self):
+        '''
+        This inverts S into the s_inverse buffer; closed form for 1x1 and 2x2,
+        Gauss-Jordan with partial pivoting otherwise.
+        '''
+        m = self.m
+        s = self.s
+        inverse = self.s_inverse
+        if m == 1:
+            inverse[0][0] = 1/s[0][0]
+        elif m == 2:
+            a, b = s[0]
+            c, d = s[1]
+            determinant = a*d - b*c
+            if determinant == 0:
+                raise ValueError('The matrix is not invertible')
+            inverse[0][0] = d/determinant
+            inverse[0][1] = -b/determinant
+            inverse[1][0] = -c/determinant
+            inverse[1][1] = a/determinant
+        else:
+            for i, row in enumerate(gauss_jordan_inverse(s)):
+                inverse[i][:] = row
+        return inverse
+
+
+class KalmanFilterBank(object):
+
+    def __init__(self, x, P, F, H, Q, R):
+        '''
+        Input: x is a list of N n x 1 Matrix states and P either one n x n Matrix
+        (the starting covariance of every track) or a list of N of them;
+        F, H, Q and R are Matrix objects shared by all tracks, as in KalmanFilter.
+        Review: the bank is stored column-wise, one list of N values per state
+        entry and per covariance entry, so every step is a fixed number of map()
+        passes over all tracks rather than N Python-level filter steps.  Zero
+        entries of F and H are dropped up front; P, Q and R must be symmetric, as
+        in KalmanFilter, and P is kept so by sharing the (i, j) and (j, i) columns.
+        '''
+        n = F.rows
+        m = H.rows
+        if isinstance(P, Matrix):
+            P = [P] * len(x)
+        if not (x and len(P) == len(x) and F.columns == n and Q.rows == n and Q.columns == n
+                and H.columns == n and R.rows == m and R.columns == m
+                and all([x_t.rows == n and x_t.columns == 1 for x_t in x])
+                and all([P_t.rows == n and P_t.columns == n for P_t in P])):
+            raise ValueError('The Kalman filter matrices have inconsistent dimensions')
+        if not (all([is_symmetric(P_t.matrix) for P_t in P]) and is_symmetric(Q.matrix)
+                and is_symmetric(R.matrix)):
+            raise ValueError('The covariance matrices P, Q and R must be symmetric')
+        self.n = n
+        self.m = m
+        self.size = len(x)
+
+        self.state = [[x_t.data[i] for x_t in x] for i in range(n)]
+        self.covariance = [[None] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(i, n):
+                self.covariance[i][j] = self.covariance[j][i] = [P_t.data[i*n + j] for P_t in P]
+
+        self.transition = [[(F.data[i*n + k], k) for k in range(n) if F.data[i*n + k]] for i in range(n)]
+        self.measurement = [[(H.data[j*n + k], k) for k in range(n) if H.data[j*n + k]] for j in range(m)]
+        self.process_noise = Q.matrix
+        self.measurement_noise = R.matrix
+
+
+    def __len__(self):
+        return self.size
+
+
+    @property
+    def x(self):
+        return [Matrix([[column[t]] for column in self.state]) for t in range(self.size)]
+
+
+    @property
+    def P(self):
+        return [Matrix([[column[t] for column in row] for row in self.covariance]) for t in range(self.size)]
+
+
+    def predict(self):
+        '''
+        x = F x
+        P = F P F^T + Q
+        for every track at once.
+        '''
+        n = self.n
+        size = self.size
+        F = self.transition
+        Q = self.process_noise
+        x = self.state
+        P = self.covariance
+
+        self.state = [linear_combination([(f, x[k]) for f, k in F[i]], size) for i in range(n)]
+        fp = [[linear_combination([(f, P[k][j]) for f, k in F[i]], size) for j in range(n)] for i in range(n)]
+        new_P = [[None] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(i, n):
+                column = linear_combination([(f, fp[i][k]) for f, k in F[j]], size)
+                if Q[i][j]:
+                    column = [value + Q[i][j] for value in column]
+                new_P[i][j] = new_P[j][i] = column
+        self.covariance = new_P
+
+
+    def update(self, z, mask=None):
+        '''
+        Input: z, a list of N measurements (lists of m values or m x 1 Matrix
+        objects), and mask, a list of N booleans where False marks a track with
+        no measurement this tick; its z entry is ignored and may be None.
+        Without a mask, tracks whose z entry is None are skipped.
+        Review: skipped tracks get a zero gain, which leaves x and P unchanged.
+        '''
+        n = self.n
+        m = self.m
+        size = self.size
+        H = self.measurement
+        R = self.measurement_noise
+        x = self.state
+        P = self.covariance
+        if len(z) != size or (mask is not None and len(mask) != size):
+            raise ValueError('There must be one measurement per track')
+        if mask is None:
+            mask = [z_t is not None for z_t in z]
+        z = [(z_t.data if isinstance(z_t, Matrix) else z_t) if measured else None
+             for z_t, measured in zip(z, mask)]
+        weight = [1.0 if measured else 0.0 for measured in mask]
+
+        y = []
+        for j in range(m):
+            measured_j = [z_t[j] if z_t is not None else 0.0 for z_t in z]
+            y.append(list(map(sub, measured_j, linear_combination([(h, x[k]) for h, k in H[j]], size))))
+        hp = [[linear_combination([(h, P[l][k]) for h, l in H[j]], size) for k in range(n)] for j in range(m)]
+        s = [[None] * m for _ in range(m)]
+        for i in range(m):
+            for j in range(i, m):
+                column = linear_combination([(h, hp[j][k]) for h, k in H[i]], size)
+                if R[i][j]:
+                    column = [value + R[i][j] for value in column]
+                s[i][j] = s[j][i] = column
+
+        s_inverse = self.invert_innovations(s)
+        s_inverse = [[list(map(mul, column, weight)) for column in row] for row in s_inverse]
+
+        gain = [[elementwise_combination([(s_inverse[l][j], hp[l][k]) for l in range(m)])
+                 for k in range(n)] for j in range(m)]
+        self.state = [list(map(add, x[k], elementwise_combination([(gain[j][k], y[j]) for j in range(m)])))
+                      for k in range(n)]
+        new_P = [[None] * n for _ in range(n)]
+        for i in range(n):
+            for k in range(i, n):
+                correction = elementwise_combination([(gain[j][i], hp[j][k]) for j in range(m)])
+                new_P[i][k] = new_P[k][i] = list(map(sub, P[i][k], correction))
+        self.covariance = new_P
+
+
+    def invert_innovations(self, s):
+        '''
+        Input: the m x m innovation covariances S as columns over the tracks
+        Output: their inverses in the same layout; closed form for 1x1 and 2x2,
+        Gauss-Jordan per track otherwise.
+        '''
+        m = self.m
+        if m == 1:
+            return [[[1/value for value in s[0][0]]]]
+        if m == 2:
+            a, b = s[0]
+            d = s[1][1]
+            determinant = list(map(sub, map(mul, a, d), map(mul, b, b)))
+            if 0 in determinant:
+                raise ValueError('The matrix is not invertible')
+            off_diagonal = [-value/det for value, det in zip(b, determinant)]
+            return [[list(map(truediv, d, determinant)), off_diagonal],
+                    [off_diagonal, list(map(truediv, a, determinant))]]
+        inverses = [gauss_jordan_inverse([[s[i][j][t] for j in range(m)] for i in range(m)])
+                    for t in range(self.size)]
+        return [[[inverse[i][j] for inverse in inverses] for j in range(m)] for i in range(m)]
@@ -0,0 +1,38 @@
+import sys
+from time import perf_counter
+from matrix import Matrix
+from kalman import KalmanFilter, KalmanFilterBank
+
+# Runs predict() + update(z) on a 4-state constant velocity tracker with 2D
+# position measurements and reports the sustained rate in steps per second,
+# then runs a KalmanFilterBank of N such tracks (every tenth track has no
+# measurement each tick) and reports track-steps per second.
+# Usage: python kalman_benchmark.py [steps] [N]   (default 100000 and 5000)
+
+steps = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+tracks = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+dt = 0.1
+x = Matrix([[0.], [0.], [0.], [0.]])
+P = Matrix.identity_matrix(4)
+F = Matrix([[1., 0., dt, 0.], [0., 1., 0., dt], [0., 0., 1., 0.], [0., 0., 0., 1.]])
+H = Matrix([[1., 0., 0., 0.], [0., 1., 0., 0.]])
+Q = Matrix([[.01*(i == j) for j in range(4)] for i in range(4)])
+R = Matrix([[1., 0.], [0., 1.]])
+kf = KalmanFilter(x, P, F, H, Q, R)
+
+measurements = [[i*dt, 2*i*dt] for i in range(1000)]
+start = perf_counter()
+for i in range(steps):
+    kf.predict()
+    kf.update(measurements[i % 1000])
+seconds = perf_counter() - start
+print('{} steps in {:.3f} s, {:.0f} steps/s'.format(steps, seconds, steps/seconds))
+
+bank = KalmanFilterBank([x] * tracks, P, F, H, Q, R)
+ticks = 20
+start = perf_counter()
+for i in range(ticks):
+    bank.predict()
+    bank.update([measurements[i] if t % 10 else None for t in range(tracks)])
+seconds = perf_counter() - start
+print('{} tracks x {} ticks in {:.3f} s, {:.0f} track-steps/s'.format(tracks, ticks, seconds, tracks*ticks/seconds))
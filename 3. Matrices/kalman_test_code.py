@@ -0,0 +1,89 @@
+from matrix import Matrix
+from kalman import KalmanFilter, KalmanFilterBank
+
+# 1D constant velocity example from the lesson: measure, then predict
+x = Matrix([[0.], [0.]])
+P = Matrix([[1000., 0.], [0., 1000.]])
+F = Matrix([[1., 1.], [0., 1.]])
+H = Matrix([[1., 0.]])
+Q = Matrix([[0., 0.], [0., 0.]])
+R = Matrix([[1.]])
+
+kf = KalmanFilter(x, P, F, H, Q, R)
+for z in [1, 2, 3]:
+    kf.update([z])
+    kf.predict()
+assert all([abs(a - b) < 1e-9 for a, b in zip(kf.x.data, [3.9996664447958645, 0.9999998335552873])])
+assert all([abs(a - b) < 1e-9 for a, b in zip(kf.P.data, [2.331890424119432, 0.999167609992071,
+                                                          0.999167609992071, 0.4995005826397132])])
+
+
+# 2D constant velocity tracking, checked against the hand-chained Matrix formulas
+def chained_step(x, P, F, H, Q, R, z):
+    I = Matrix.identity_matrix(F.rows)
+    y = z.matrix_subtraction(H.matrix_multiplication(x))
+    S = H.matrix_multiplication(P).matrix_multiplication(H.transpose()).matrix_addition(R)
+    K = P.matrix_multiplication(H.transpose()).matrix_multiplication(S.inverse_matrix())
+    x = x.matrix_addition(K.matrix_multiplication(y))
+    P = I.matrix_subtraction(K.matrix_multiplication(H)).matrix_multiplication(P)
+    x = F.matrix_multiplication(x)
+    P = F.matrix_multiplication(P).matrix_multiplication(F.transpose()).matrix_addition(Q)
+    return x, P
+
+x = Matrix([[0.], [0.], [0.], [0.]])
+P = Matrix.identity_matrix(4)
+F = Matrix([[1., 0., .1, 0.], [0., 1., 0., .1], [0., 0., 1., 0.], [0., 0., 0., 1.]])
+Q = Matrix([[.01*(i == j) for j in range(4)] for i in range(4)])
+measurements = [[.1, .2, .3], [.25, .35, .5], [.4, .6, .7], [.5, .8, 1.]]
+for H, R in [(Matrix([[1., 0., 0., 0.], [0., 1., 0., 0.]]), Matrix([[1., .1], [.1, 1.]])),
+             (Matrix([[1., 0., 0., 0.], [0., 1., 0., 0.], [1., 1., 0., 0.]]),
+              Matrix([[1., .1, 0.], [.1, 1., 0.], [0., 0., 2.]]))]:
+    kf = KalmanFilter(x, P, F, H, Q, R)
+    x_ref, P_ref = x, P
+    for z in measurements:
+        z = Matrix([[value] for value in z[:H.rows]])
+        kf.update(z)
+        kf.predict()
+        x_ref, P_ref = chained_step(x_ref, P_ref, F, H, Q, R, z)
+    assert all([abs(a - b) < 1e-12 for a, b in zip(kf.x.data, x_ref.data)])
+    assert all([abs(a - b) < 1e-12 for a, b in zip(kf.P.data, P_ref.data)])
+
+
+# A bank of tracks matches one KalmanFilter per track, including skipped measurements
+states = [Matrix([[float(t)], [-t/2.], [.5], [.1*t]]) for t in range(5)]
+mask = [True, False, True, True, False]
+for H, R in [(Matrix([[1., 0., 0., 0.]]), Matrix([[.5]])),
+             (Matrix([[1., 0., 0., 0.], [0., 1., 0., 0.]]), Matrix([[1., .1], [.1, 1.]])),
+             (Matrix([[1., 0., 0., 0.], [0., 1., 0., 0.], [1., 1., 0., 0.]]),
+              Matrix([[1., .1, 0.], [.1, 1., 0.], [0., 0., 2.]]))]:
+    bank = KalmanFilterBank(states, P, F, H, Q, R)
+    filters = [KalmanFilter(x_t, P, F, H, Q, R) for x_t in states]
+    for step, z in enumerate(measurements):
+        z = [[value + t for value in z[:H.rows]] if mask[(t + step) % 5] else None for t in range(5)]
+        bank.predict()
+        bank.update(z)
+        for kf, z_t in zip(filters, z):
+            kf.predict()
+            if z_t is not None:
+                kf.update(z_t)
+    for kf, x_t, P_t in zip(filters, bank.x, bank.P):
+        assert all([abs(a - b) < 1e-12 for a, b in zip(kf.x.data, x_t.data)])
+        assert all([abs(a - b) < 1e-12 for a, b in zip(kf.P.data, P_t.data)])
+    bank.update([[0.] * H.rows] * 5, [False] * 5)
+    assert [x_t.data for x_t in bank.x] == [kf.x.data for kf in filters]
+
+# The covariance matrices must be symmetric
+for P_bad, Q_bad in [(Matrix([[1., .5, 0., 0.], [0., 1., 0., 0.], [0., 0., 1., 0.], [0., 0., 0., 1.]]), Q),
+                     (P, Matrix([[.01, 0., 0., 0.], [0., .01, 0., 0.], [.001, 0., .01, 0.], [0., 0., 0., .01]]))]:
+    for filter_class in [KalmanFilter, KalmanFilterBank]:
+        try:
+            filter_class(states if filter_class is KalmanFilterBank else x, P_bad, F, H, Q_bad, R)
+            assert False
+        except ValueError:
+            pass
+
+print('Completed, All pass!')
+print()
+
+#Inconsistent dimensions, will throw ValueError:
+#KalmanFilter(x, P, F, Matrix([[1., 0.]]), Q, R)
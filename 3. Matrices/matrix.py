@@ -1,15 +1,32 @@
-
+from array import array
+from operator import add, sub, mul
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
 
 class Matrix(object):
 
+    # tile edge used by matrix_multiplication; a tile of A rows and B columns
+    # is reused for a whole block of output cells while it is still in cache
+    BLOCK_SIZE = 64
+
     def __init__(self, matrix):
+        '''
+        The elements are kept row-major in one flat array('d') (self.data); the
+        read-only nested list view is available as self.matrix.
+        Review: every element is stored as a C double, so ints, Fractions and
+        Decimals come back as floats, and ints beyond 2^53 or non-binary
+        fractions are rounded; use exact types elsewhere (eg. the fraction
+        backend of LinearSystem) when that matters.
+        '''
         try:
             if not (matrix and matrix[0]):
                 raise ValueError
-            self.rows = len(matrix)
-            self.columns = len(matrix[0])
-            self.matrix = matrix
+            rows = len(matrix)
+            columns = len(matrix[0])
+            data = array('d')
+            for row in matrix:
+                data.extend(row)
 
         except ValueError:
             raise ValueError('The matrix must be nonempty')
@@ -17,6 +34,84 @@ class Matrix(object):
         except TypeError:
             raise TypeError('The matrix must be an iterable')
 
+        if len(data) != rows*columns:
+            raise ValueError('All rows must have the same number of columns')
+        self.set_data(rows, columns, data)
+
+    @classmethod
+    def from_flat(cls, rows, columns, data):
+        '''
+        Input: dimensions and row-major flat data (an array('d') is used as is)
+        Output: Matrix object, without going through nested lists
+        '''
+        if not rows or not columns or len(data) != rows*columns:
+            raise ValueError('The data must hold rows x columns elements')
+        if not (isinstance(data, array) and data.typecode == 'd'):
+            data = array('d', data)
+        m = cls.__new__(cls)
+        m.set_data(rows, columns, data)
+        return m
+
+
+    def set_data(self, rows, columns, data):
+        self.rows = rows
+        self.columns = columns
+        self.data = data
+        # LU factorization and inverse are computed on first use and kept,
+        # so they are cleared whenever the data is replaced (see cache_is_current)
+        self.factorization = None
+        self.inverse = None
+        self.cached_data = None
+
+
+    def cache_is_current(self):
+        '''
+        Output: True if the cached factorization and inverse still belong to the
+        data; they are dropped otherwise
+        Review: self.data is a public array, so it can be written in place; a
+        copy taken when the first result was cached is compared with it, O(N^2)
+        against the O(N^3) of recomputing.
+        '''
+        if self.cached_data is None:
+            return False
+        if self.cached_data == self.data:
+            return True
+        self.factorization = None
+        self.inverse = None
+        self.cached_data = None
+        return False
+
+
+    def keep_cache_data(self):
+        if self.cached_data is None:
+            self.cached_data = array('d', self.data)
+
+
+    @property
+    def matrix(self):
+        '''
+        Output: read-only nested list view of the data, built on each read
+        Review: the data lives in self.data, so changing this view would not
+        change the Matrix; item assignment on it raises TypeError instead of
+        being lost silently.  Assign a new nested list to m.matrix, or use
+        to_lists() for a mutable copy.
+        '''
+        return ReadOnlyList([ReadOnlyList(row) for row in self.to_lists()])
+
+
+    def to_lists(self):
+        '''
+        Output: new nested list copy of the data, free to modify
+        '''
+        c = self.columns
+        return [self.data[i:i+c].tolist() for i in range(0, len(self.data), c)]
+
+
+    @matrix.setter
+    def matrix(self, matrix):
+        self.__init__(matrix)
+
+
     def __repr__(self):
         return 'Matrix(' + str(self.matrix) +')'
 
@@ -30,15 +125,12 @@ class Matrix(object):
 
 
     def get_row(self, row):
-        return self.matrix[row]
+        c = self.columns
+        return self.data[row*c:(row+1)*c].tolist()
 
 
     def get_column(self, column_number):
-        column = []
-        for row in self.matrix:
-            num = row[column_number]
-            column.append(num)
-        return column
+        return self.data[column_number::self.columns].tolist()
 
 
     def matrix_addition(self, matrixB):
@@ -46,21 +138,18 @@ class Matrix(object):
         Input: MatrixA (self), MatrixB objects
         Output: Matrix object of sum matrix
         (reivew: both matrices must have indentical dimensions)
+        A SparseMatrix B is added on its nonzeros only.
         '''
+        from sparse_matrix import SparseMatrix
+        if isinstance(matrixB, SparseMatrix):
+            return matrixB.matrix_addition(self)
         try:
             if not (self.rows == matrixB.rows and self.columns == matrixB.columns):
                 raise ValueError
         except ValueError:
             raise ValueError('Both matrices must have the same m x n dimensions')
 
-        matrixSum = []
-        for i in range(self.rows):
-            row = []
-            for j in range(self.columns):
-                plus = self.matrix[i][j] + matrixB.matrix[i][j]
-                row.append(plus)
-            matrixSum.append(row)
-        return Matrix(matrixSum)
+        return Matrix.from_flat(self.rows, self.columns, array('d', map(add, self.data, matrixB.data)))
 
 
     def matrix_subtraction(self, matrixB):
@@ -76,14 +165,7 @@ class Matrix(object):
         except ValueError:
             raise ValueError('Both matrices must have the same m x n dimensions')
 
-        matrixSub = []
-        for i in range(self.rows):
-            row = []
-            for j in range(self.columns):
-                sub = self.matrix[i][j] - matrixB.matrix[i][j]
-                row.append(sub)
-            matrixSub.append(row)
-        return Matrix(matrixSub)
+        return Matrix.from_flat(self.rows, self.columns, array('d', map(sub, self.data, matrixB.data)))
 
 
     def scalar_x_matrix(self, const):
@@ -93,41 +175,41 @@ class Matrix(object):
         Output: Matrix object of scaled matrix
         (review: scalar multiplies all elements of matrix)
         '''
-        scaled = []
-        for row in self.matrix:
-            new_row = []
-            for col in row:
-                new_row.append(col*const)
-            scaled.append(new_row)
-        return Matrix(scaled)
+        return Matrix.from_flat(self.rows, self.columns, array('d', [x*const for x in self.data]))
 
 
-    def matrix_multiplication(self, matrixB):
+    def matrix_multiplication(self, matrixB, workers=None):
         '''
-        Input: MatrixA (self), MatrixB objects
+        Input: MatrixA (self), MatrixB objects, optional number of worker processes
         Order: matrixA.matrix_multiplication(matrixB)
         Output: Matrix object of product
         Review: A is M x N, B is N x P; A columns must equal B rows;
         AB is NOT commutative, AB is size M x P
+        Each element in AB is the dot product of an A row and a B column.  The
+        rows of A and the columns of B (rows of B transposed) are cut from the
+        flat data once, then AB is filled tile by tile (BLOCK_SIZE x BLOCK_SIZE)
+        so no temporary list is built per element.
+        With workers > 1 the rows of AB are split into one block per worker and
+        computed in a process pool; A, B transposed and AB live in shared memory,
+        so the operands are never pickled.  Only worth it for large products.
+        A SparseMatrix B is handed to SparseMatrix.rmatrix_multiplication, which
+        only visits its nonzeros.
         '''
+        from sparse_matrix import SparseMatrix
+        if isinstance(matrixB, SparseMatrix):
+            return matrixB.rmatrix_multiplication(self)
         try:
             if not (self.columns == matrixB.rows):
                 raise ValueError
         except ValueError:
             raise ValueError('Matrix A columns does not equal Matrix B rows')
-        
-        ab = []
-        trans_b = matrixB.transpose()
 
-        for row in self.matrix:
-            new_row = []
-            ## each element in AB is dot product of A row x B col
-            ## (after B is transposed, B col = rows in trans_B)
-            for col in trans_b.matrix:
-                dot_product = sum([x*y for x, y in zip(row, col)])
-                new_row.append(dot_product)
-            ab.append(new_row)
-        return Matrix(ab)
+        m, n, p = self.rows, self.columns, matrixB.columns
+        trans_b = matrixB.transpose().data
+        if workers and workers > 1 and m > 1:
+            return Matrix.from_flat(m, p, parallel_multiplication(self.data, trans_b, m, n, p, workers,
+                                                                  self.BLOCK_SIZE))
+        return Matrix.from_flat(m, p, multiply_row_block(self.data, trans_b, n, p, 0, m, self.BLOCK_SIZE))
 
 
     def transpose(self):
@@ -135,10 +217,12 @@ class Matrix(object):
         Input: Matrix object
         Output: Matrix object of transposed matrix
         Review: this is swap of row and cols for simple dot product in matrix
-        multiplication.
+        multiplication.  Column j of the flat data is the strided slice data[j::columns].
         '''
-        matrix_transpose = [[row[i] for row in self.matrix] for i in range(self.columns)]
-        return Matrix(matrix_transpose)
+        matrix_transpose = array('d')
+        for j in range(self.columns):
+            matrix_transpose.extend(self.data[j::self.columns])
+        return Matrix.from_flat(self.columns, self.rows, matrix_transpose)
 
     @classmethod
     def identity_matrix(self, n):
@@ -147,40 +231,217 @@ class Matrix(object):
         Output: Matrix object of indentity matrix (diagonal 1's)
         Review: identity matrix does not depend on any input object, only n.
         '''
-        identity = []
-        for i in range(n):
-            new_row = []
-            for j in range(n):
-                if i == j:
-                    new_row.append(1)
-                else:
-                    new_row.append(0)
-            identity.append(new_row)
-        return Matrix(identity)
+        identity = array('d', bytes(8*n*n))
+        identity[::n+1] = array('d', [1.0])*n
+        return Matrix.from_flat(n, n, identity)
+
+
+    def lu_decomposition(self):
+        '''
+        Input: Matrix object, square
+        Output: (lu, permutation, sign) with PA = LU, computed once and cached
+        Review: L (unit diagonal) is stored below the diagonal of lu and U on and
+        above it; row k of PA is row permutation[k] of A; sign is +1/-1 for an
+        even/odd number of row swaps.  Partial pivoting (largest |pivot|) keeps the
+        multipliers <= 1.  A zero column leaves a zero on U's diagonal (singular).
+        '''
+        if self.rows != self.columns:
+            raise ValueError('The matrix must be square')
+        if self.cache_is_current() and self.factorization is not None:
+            return self.factorization
+
+        n = self.rows
+        lu = self.to_lists()
+        permutation = list(range(n))
+        sign = 1
+        for k in range(n):
+            p = max(range(k, n), key=lambda i: abs(lu[i][k]))
+            if lu[p][k] == 0:
+                continue
+            if p != k:
+                lu[k], lu[p] = lu[p], lu[k]
+                permutation[k], permutation[p] = permutation[p], permutation[k]
+                sign = -sign
+            pivot_row = lu[k]
+            for i in range(k+1, n):
+                row = lu[i]
+                l = row[k]/pivot_row[k]
+                row[k] = l
+                if l:
+                    for j in range(k+1, n):
+                        row[j] -= l*pivot_row[j]
+
+        self.keep_cache_data()
+        self.factorization = (lu, permutation, sign)
+        return self.factorization
+
+
+    def determinant(self):
+        '''
+        Input: Matrix object, square
+        Output: determinant scalar
+        Review: 1x1 and 2x2 use the closed form, larger matrices the product of
+        U's diagonal from the cached LU factorization.
+        '''
+        if self.rows != self.columns:
+            raise ValueError('The matrix must be square')
+        a = self.data
+        if self.rows == 1:
+            return a[0]
+        if self.rows == 2:
+            return a[0]*a[3] - a[1]*a[2]
+
+        lu, permutation, sign = self.lu_decomposition()
+        det = sign
+        for k in range(self.rows):
+            det *= lu[k][k]
+        return det
+
+
+    def solve(self, matrixB):
+        '''
+        Input: MatrixA (self, square N x N), MatrixB (N x P) objects
+        Order: matrixA.solve(matrixB)
+        Output: Matrix object X (N x P) with AX = B
+        Review: each column of B costs one forward and one back substitution,
+        O(N^2), on the cached LU factorization.
+        '''
+        if self.rows != matrixB.rows:
+            raise ValueError('Matrix A rows does not equal Matrix B rows')
+        lu, permutation, sign = self.lu_decomposition()
+        n = self.rows
+        for k in range(n):
+            if lu[k][k] == 0:
+                raise ValueError('The matrix is not invertible')
+
+        b = matrixB.data
+        p_cols = matrixB.columns
+        x = []
+        for column in range(p_cols):
+            y = [b[p*p_cols + column] for p in permutation]
+            for i in range(n):
+                row = lu[i]
+                y[i] -= sum([row[j]*y[j] for j in range(i)])
+            for i in range(n)[::-1]:
+                row = lu[i]
+                y[i] = (y[i] - sum([row[j]*y[j] for j in range(i+1, n)]))/row[i]
+            x.append(y)
+        return Matrix(x).transpose()
 
 
     def inverse_matrix(self):
         '''
         Input: Matrix object, square
-        Output: Matrix object for 1x1 or 2x2 matrix
-        Due to complexity, this is limited to 2x2 matrix max.
+        Output: Matrix object of the inverse, computed once and cached; a copy
+        is returned, so changing it leaves the cache intact
+        Review: 1x1 and 2x2 use the closed form; larger matrices solve
+        A X = I on the LU factorization, O(N^3).
         '''
 
         if self.rows != self.columns:
             raise ValueError('The matrix must be square')
-        if self.rows > 2:
-            raise ValueError('The matrix must be 2x2 max')
+        if self.cache_is_current() and self.inverse is not None:
+            return Matrix.from_flat(self.rows, self.columns, array('d', self.inverse.data))
         if self.rows == 2:
-            determinant = self.matrix[0][0]*self.matrix[1][1] - self.matrix[0][1]*self.matrix[1][0]
+            determinant = self.determinant()
             if determinant == 0:
                 raise ValueError('The matrix is not invertible')
 
-            trace = self.matrix[0][0] + self.matrix[1][1]
+            trace = self.data[0] + self.data[3]
             ident = self.identity_matrix(self.rows)
             trace_x_ident = ident.scalar_x_matrix(trace)
             diff = trace_x_ident.matrix_subtraction(self)
-            inverse = diff.scalar_x_matrix(1/determinant)
-            return inverse
+            self.inverse = diff.scalar_x_matrix(1/determinant)
+
+        elif self.rows == 1:
+            self.inverse = Matrix([[1/self.data[0]]])
 
         else:
-            return Matrix([[1/self.matrix[0][0]]])
+            self.inverse = self.solve(self.identity_matrix(self.rows))
+        self.keep_cache_data()
+        return Matrix.from_flat(self.rows, self.columns, array('d', self.inverse.data))
+
+
+class ReadOnlyList(list):
+    '''
+    list that refuses changes, used for the Matrix.matrix view; it still
+    compares equal to a list with the same items
+    '''
+
+    READ_ONLY_MSG = ('Matrix.matrix is a read-only copy of the data; assign a new nested list '
+                     'to Matrix.matrix or use to_lists() for a mutable copy')
+
+    def refuse(self, *args, **kwargs):
+        raise TypeError(self.READ_ONLY_MSG)
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = refuse
+    append = extend = insert = pop = remove = clear = sort = reverse = refuse
+
+
+def multiply_row_block(a, trans_b, n, p, row_start, row_end, block_size):
+    '''
+    Input: flat A (N columns) and flat B transposed (P rows of N), a range of A rows
+    Output: array('d') holding rows row_start..row_end-1 of AB, row-major
+    '''
+    a_rows = [a[i*n:(i+1)*n] for i in range(row_start, row_end)]
+    b_cols = [trans_b[j*n:(j+1)*n] for j in range(p)]
+
+    ab = array('d', bytes(8*len(a_rows)*p))
+    for i0 in range(0, len(a_rows), block_size):
+        for j0 in range(0, p, block_size):
+            block_cols = b_cols[j0:j0+block_size]
+            for i in range(i0, min(i0+block_size, len(a_rows))):
+                row = a_rows[i]
+                k = i*p + j0
+                for col in block_cols:
+                    ab[k] = sum(map(mul, row, col))
+                    k += 1
+    return ab
+
+
+def parallel_multiplication(a, trans_b, m, n, p, workers, block_size):
+    '''
+    This runs multiply_row_block over row blocks of AB in a process pool.  The
+    workers attach to shared memory blocks by name and write their rows of AB
+    straight into the shared result.
+    '''
+    shared = [shared_memory.SharedMemory(create=True, size=8*size) for size in (m*n, p*n, m*p)]
+    try:
+        shared[0].buf[:8*m*n] = a.tobytes()
+        shared[1].buf[:8*p*n] = trans_b.tobytes()
+        names = [block.name for block in shared]
+
+        rows_per_worker = -(-m // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(multiply_shared_row_block, names, m, n, p, start,
+                                       min(start+rows_per_worker, m), block_size)
+                       for start in range(0, m, rows_per_worker)]
+            for future in futures:
+                future.result()
+
+        ab = array('d')
+        ab.frombytes(shared[2].buf[:8*m*p])
+        return ab
+
+    finally:
+        for block in shared:
+            block.close()
+            block.unlink()
+
+
+def multiply_shared_row_block(names, m, n, p, row_start, row_end, block_size):
+    '''
+    Worker side of parallel_multiplication: copies the operands out of shared
+    memory, computes its rows of AB and writes them back into the shared result.
+    '''
+    shared = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        a = array('d')
+        a.frombytes(shared[0].buf[8*row_start*n:8*row_end*n])
+        trans_b = array('d')
+        trans_b.frombytes(shared[1].buf[:8*p*n])
+        ab = multiply_row_block(a, trans_b, n, p, 0, row_end - row_start, block_size)
+        shared[2].buf[8*row_start*p:8*row_end*p] = ab.tobytes()
+    finally:
+        for block in shared:
+            block.close()
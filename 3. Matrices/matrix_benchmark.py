@@ -0,0 +1,20 @@
+import sys
+from random import random, seed
+from time import perf_counter
+from matrix import Matrix
+
+# Times Matrix.matrix_multiplication on random square matrices and reports the
+# rate in GFLOP/s (an N x N product is 2*N^3 floating point operations).
+# Usage: python matrix_benchmark.py [N ...]   (default N = 64 256 1024)
+
+sizes = [int(n) for n in sys.argv[1:]] or [64, 256, 1024]
+seed(0)
+
+print('{:>6}{:>12}{:>10}'.format('N', 'time (s)', 'GFLOP/s'))
+for n in sizes:
+    a = Matrix.from_flat(n, n, [random() for _ in range(n*n)])
+    b = Matrix.from_flat(n, n, [random() for _ in range(n*n)])
+    start = perf_counter()
+    a.matrix_multiplication(b)
+    seconds = perf_counter() - start
+    print('{:>6}{:>12.3f}{:>10.4f}'.format(n, seconds, 2*n**3/seconds/1e9))
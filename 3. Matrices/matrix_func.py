@@ -81,6 +81,67 @@ def identity_matrix(n):
         identity.append(new_row)
     return identity
 
+def lu_decomposition(matrix):
+    dim = len(matrix)
+    lu = [list(row) for row in matrix]
+    permutation = list(range(dim))
+    sign = 1
+
+    for k in range(dim):
+        ## partial pivoting: bring up the row with the largest |pivot|
+        p = max(range(k, dim), key=lambda i: abs(lu[i][k]))
+        if lu[p][k] == 0:
+            continue
+        if p != k:
+            lu[k], lu[p] = lu[p], lu[k]
+            permutation[k], permutation[p] = permutation[p], permutation[k]
+            sign = -sign
+        for i in range(k+1, dim):
+            l = lu[i][k]/lu[k][k]
+            lu[i][k] = l
+            for j in range(k+1, dim):
+                lu[i][j] -= l*lu[k][j]
+    return lu, permutation, sign
+
+
+def determinant(matrix):
+    dim = len(matrix)
+
+    if dim != len(matrix[0]):
+        raise ValueError('The matrix must be square')
+
+    if dim == 1:
+        return matrix[0][0]
+
+    if dim == 2:
+        return matrix[0][0]*matrix[1][1] - matrix[0][1]*matrix[1][0]
+
+    lu, permutation, sign = lu_decomposition(matrix)
+    det = sign
+    for k in range(dim):
+        det *= lu[k][k]
+    return det
+
+
+def solve(matrix, matrixB):
+    dim = len(matrix)
+    lu, permutation, sign = lu_decomposition(matrix)
+
+    if any([lu[k][k] == 0 for k in range(dim)]):
+        raise ValueError('The matrix is not invertible')
+
+    x = []
+    for column in transpose(matrixB):
+        ## forward substitution with L, then back substitution with U
+        y = [column[p] for p in permutation]
+        for i in range(dim):
+            y[i] -= dot_product(lu[i][:i], y[:i])
+        for i in range(dim)[::-1]:
+            y[i] = (y[i] - dot_product(lu[i][i+1:], y[i+1:]))/lu[i][i]
+        x.append(y)
+    return transpose(x)
+
+
 def inverse_matrix(matrix):    
     dim = len(matrix) 
     
@@ -88,7 +149,7 @@ def inverse_matrix(matrix):
         raise ValueError('The matrix must be square')
     
     if dim > 2:
-        raise ValueError('The matrix must be 2x2 max')
+        return solve(matrix, identity_matrix(dim))
         
     if dim == 1:
         return [[1/matrix[0][0]]]
@@ -0,0 +1,28 @@
+import sys
+from random import random, seed
+from time import perf_counter
+from matrix import Matrix
+
+# Scaling of Matrix.matrix_multiplication(workers=...) on an N x N product,
+# for 1, 2, 4 and 8 worker processes (workers=1 is the serial path).
+# Usage: python matrix_parallel_benchmark.py [N] [max workers]   (default 2048 8)
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seed(0)
+    a = Matrix.from_flat(n, n, [random() for _ in range(n*n)])
+    b = Matrix.from_flat(n, n, [random() for _ in range(n*n)])
+
+    print('{} x {} product'.format(n, n))
+    print('{:>8}{:>12}{:>10}{:>10}'.format('workers', 'time (s)', 'GFLOP/s', 'speedup'))
+    workers = 1
+    serial_seconds = None
+    while workers <= max_workers:
+        start = perf_counter()
+        a.matrix_multiplication(b, workers=workers)
+        seconds = perf_counter() - start
+        serial_seconds = serial_seconds or seconds
+        print('{:>8}{:>12.3f}{:>10.4f}{:>9.2f}x'.format(workers, seconds, 2*n**3/seconds/1e9,
+                                                        serial_seconds/seconds))
+        workers *= 2
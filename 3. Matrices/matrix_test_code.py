@@ -60,6 +60,45 @@ m27 = Matrix([[4, 5], [7, 1]])
 assert m26.inverse_matrix().matrix == [[0.01]]
 assert m27.inverse_matrix().matrix == [[-0.03225806451612903, 0.16129032258064516], [0.22580645161290322, -0.12903225806451613]]
 
+m28 = Matrix([[4, 7, 2], [3, 6, 1], [2, 5, 3]])
+assert abs(m28.determinant() - 9) < 1e-12
+product = m28.matrix_multiplication(m28.inverse_matrix())
+assert all([abs(product.matrix[i][j] - (i == j)) < 1e-12 for i in range(3) for j in range(3)])
+inverse = m28.inverse_matrix()
+inverse.data[0] = 100.
+assert m28.inverse_matrix().data[0] != 100. and m28.inverse_matrix() is not m28.inverse_matrix()
+m29 = Matrix([[2, 0, 1], [1, 3, 2], [1, 1, 1]])
+assert m29.determinant() == 0
+x = m28.solve(Matrix([[13], [10], [10]]))
+assert all([abs(x.matrix[i][0] - 1) < 1e-12 for i in range(3)])
+
+# the nested list view is read-only; writes must go through a new Matrix or m.matrix = ...
+for change in [lambda: m28.matrix[0].__setitem__(0, 5.), lambda: m28.matrix.__setitem__(0, [1., 2., 3.]),
+               lambda: m28.matrix[1].append(4.)]:
+    try:
+        change()
+        assert False
+    except TypeError:
+        pass
+rows = m28.to_lists()
+rows[0][0] = 5.
+m28.matrix = rows
+assert m28.matrix[0] == [5., 7., 2.] and m28.data[0] == 5.
+
+# writing through the flat data drops the cached factorization and inverse
+m30 = Matrix([[4, 7, 2], [3, 6, 1], [2, 5, 3]])
+assert abs(m30.determinant() - 9) < 1e-12 and m30.inverse_matrix()
+m30.data[0] = 5.
+assert abs(m30.determinant() - 22) < 1e-12
+assert abs(m30.inverse_matrix().data[0] - 13/22.) < 1e-12
+x = m30.solve(Matrix([[14], [10], [10]]))
+assert all([abs(x.matrix[i][0] - 1) < 1e-12 for i in range(3)])
+
+# elements are stored as doubles: exact types come back as (rounded) floats
+from fractions import Fraction
+m31 = Matrix([[1, Fraction(1, 3), 2**53 + 1]])
+assert m31.matrix == [[1.0, 1/3., 2.**53]] and all([type(x) is float for x in m31.matrix[0]])
+
 print('Completed, All pass!')
 print()
 
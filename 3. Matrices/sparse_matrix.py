@@ -0,0 +1,240 @@
+from array import array
+from matrix import Matrix
+
+
+class SparseMatrix(object):
+
+    FORMATS = ('csr', 'csc')
+
+    def __init__(self, rows, columns, indptr, indices, data, format='csr'):
+        '''
+        Input: dimensions and the compressed arrays of the nonzero elements
+        csr: row i holds data[indptr[i]:indptr[i+1]] in the columns indices[indptr[i]:indptr[i+1]]
+        csc: the same with rows and columns swapped, column j holds data[indptr[j]:indptr[j+1]]
+        Review: only the nonzeros are stored, in array('d') / array('l'), so memory
+        and multiply-adds scale with nnz instead of rows x columns.
+        '''
+        if format not in self.FORMATS:
+            raise ValueError('The format must be one of: csr, csc')
+        major = rows if format == 'csr' else columns
+        if not rows or not columns or len(indptr) != major + 1 or len(indices) != len(data):
+            raise ValueError('The compressed arrays do not match the dimensions')
+        self.rows = rows
+        self.columns = columns
+        self.format = format
+        self.indptr = indptr if isinstance(indptr, array) else array('l', indptr)
+        self.indices = indices if isinstance(indices, array) else array('l', indices)
+        self.data = data if isinstance(data, array) else array('d', data)
+
+
+    @classmethod
+    def from_matrix(cls, matrixA, format='csr'):
+        '''
+        Input: Matrix object
+        Output: SparseMatrix object holding its nonzero elements
+        '''
+        indptr = array('l', [0])
+        indices = array('l')
+        data = array('d')
+        c = matrixA.columns
+        for i in range(matrixA.rows):
+            for j, value in enumerate(matrixA.data[i*c:(i+1)*c]):
+                if value != 0:
+                    indices.append(j)
+                    data.append(value)
+            indptr.append(len(data))
+        csr = cls(matrixA.rows, c, indptr, indices, data, 'csr')
+        return csr if format == 'csr' else csr.to_csc()
+
+
+    def to_matrix(self):
+        '''
+        Output: the equivalent dense Matrix object
+        '''
+        csr = self.to_csr()
+        c = self.columns
+        dense = array('d', bytes(8*self.rows*c))
+        for i in range(self.rows):
+            for k in range(csr.indptr[i], csr.indptr[i+1]):
+                dense[i*c + csr.indices[k]] = csr.data[k]
+        return Matrix.from_flat(self.rows, c, dense)
+
+
+    @property
+    def matrix(self):
+        return self.to_matrix().matrix
+
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+
+    def __repr__(self):
+        return 'SparseMatrix({} x {}, {} nonzeros, {})'.format(self.rows, self.columns, self.nnz, self.format)
+
+
+    def __str__(self):
+        return str(self.to_matrix())
+
+
+    def to_csr(self):
+        if self.format == 'csr':
+            return self
+        indptr, indices, data = compress_other_axis(self.columns, self.rows, self.indptr, self.indices, self.data)
+        return SparseMatrix(self.rows, self.columns, indptr, indices, data, 'csr')
+
+
+    def to_csc(self):
+        if self.format == 'csc':
+            return self
+        indptr, indices, data = compress_other_axis(self.rows, self.columns, self.indptr, self.indices, self.data)
+        return SparseMatrix(self.rows, self.columns, indptr, indices, data, 'csc')
+
+
+    def transpose(self):
+        '''
+        Input: SparseMatrix object
+        Output: SparseMatrix object of transposed matrix
+        Review: the CSR arrays of A are the CSC arrays of A transposed, so this
+        only swaps the format; the arrays are copied, O(nnz), and nothing is sorted.
+        '''
+        format = 'csc' if self.format == 'csr' else 'csr'
+        return SparseMatrix(self.columns, self.rows, array('l', self.indptr), array('l', self.indices),
+                            array('d', self.data), format)
+
+
+    def scalar_x_matrix(self, const):
+        return SparseMatrix(self.rows, self.columns, array('l', self.indptr), array('l', self.indices),
+                            array('d', [x*const for x in self.data]), self.format)
+
+
+    def matrix_addition(self, matrixB):
+        '''
+        Input: SparseMatrix (self), SparseMatrix or Matrix object
+        Output: SparseMatrix of the sum for a sparse B, Matrix for a dense B
+        (review: both matrices must have identical dimensions)
+        Sparse rows are merged by column index, touching only the nonzeros.
+        '''
+        if not (self.rows == matrixB.rows and self.columns == matrixB.columns):
+            raise ValueError('Both matrices must have the same m x n dimensions')
+
+        a = self.to_csr()
+        c = self.columns
+        if isinstance(matrixB, Matrix):
+            total = array('d', matrixB.data)
+            for i in range(self.rows):
+                for k in range(a.indptr[i], a.indptr[i+1]):
+                    total[i*c + a.indices[k]] += a.data[k]
+            return Matrix.from_flat(self.rows, c, total)
+
+        b = matrixB.to_csr()
+        indptr = array('l', [0])
+        indices = array('l')
+        data = array('d')
+        for i in range(self.rows):
+            row = dict(zip(a.indices[a.indptr[i]:a.indptr[i+1]], a.data[a.indptr[i]:a.indptr[i+1]]))
+            for k in range(b.indptr[i], b.indptr[i+1]):
+                j = b.indices[k]
+                row[j] = row.get(j, 0.0) + b.data[k]
+            for j in sorted(row):
+                if row[j] != 0:
+                    indices.append(j)
+                    data.append(row[j])
+            indptr.append(len(data))
+        return SparseMatrix(self.rows, c, indptr, indices, data, 'csr')
+
+
+    def matrix_multiplication(self, matrixB):
+        '''
+        Input: SparseMatrix A (self), SparseMatrix or Matrix B
+        Order: matrixA.matrix_multiplication(matrixB)
+        Output: SparseMatrix for a sparse B, Matrix for a dense B
+        Review: A is M x N, B is N x P; row i of AB is the sum of a_ik times row k
+        of B over the nonzeros a_ik of row i of A (Gustavson's row-by-row product),
+        so the work is proportional to the multiply-adds actually needed.
+        '''
+        if self.columns != matrixB.rows:
+            raise ValueError('Matrix A columns does not equal Matrix B rows')
+
+        a = self.to_csr()
+        p = matrixB.columns
+        if isinstance(matrixB, Matrix):
+            b = matrixB.data
+            ab = array('d', bytes(8*self.rows*p))
+            for i in range(self.rows):
+                row = [0.0] * p
+                for k in range(a.indptr[i], a.indptr[i+1]):
+                    value = a.data[k]
+                    start = a.indices[k]*p
+                    row = [x + value*y for x, y in zip(row, b[start:start+p])]
+                ab[i*p:(i+1)*p] = array('d', row)
+            return Matrix.from_flat(self.rows, p, ab)
+
+        b = matrixB.to_csr()
+        indptr = array('l', [0])
+        indices = array('l')
+        data = array('d')
+        for i in range(self.rows):
+            row = {}
+            for k in range(a.indptr[i], a.indptr[i+1]):
+                value = a.data[k]
+                r = a.indices[k]
+                for kb in range(b.indptr[r], b.indptr[r+1]):
+                    j = b.indices[kb]
+                    row[j] = row.get(j, 0.0) + value*b.data[kb]
+            for j in sorted(row):
+                if row[j] != 0:
+                    indices.append(j)
+                    data.append(row[j])
+            indptr.append(len(data))
+        return SparseMatrix(self.rows, p, indptr, indices, data, 'csr')
+
+
+    def rmatrix_multiplication(self, matrixA):
+        '''
+        Input: dense Matrix A, SparseMatrix B (self)
+        Output: Matrix object of the product AB
+        Review: row i of AB gathers a_ik times row k of B, for the nonzero a_ik,
+        scattering only the nonzeros of each row of B.
+        '''
+        if matrixA.columns != self.rows:
+            raise ValueError('Matrix A columns does not equal Matrix B rows')
+
+        b = self.to_csr()
+        n = matrixA.columns
+        p = self.columns
+        ab = array('d', bytes(8*matrixA.rows*p))
+        for i in range(matrixA.rows):
+            offset = i*p
+            for r, value in enumerate(matrixA.data[i*n:(i+1)*n]):
+                if value:
+                    for k in range(b.indptr[r], b.indptr[r+1]):
+                        ab[offset + b.indices[k]] += value*b.data[k]
+        return Matrix.from_flat(matrixA.rows, p, ab)
+
+
+def compress_other_axis(major, minor, indptr, indices, data):
+    '''
+    Input: compressed arrays along the major axis (rows for csr) and the sizes
+    Output: (indptr, indices, data) compressed along the minor axis instead
+    This is a counting sort on the minor indices, O(nnz + major + minor); the
+    indices come out sorted inside each new major slot.
+    '''
+    counts = array('l', bytes(array('l').itemsize*(minor + 1)))
+    for j in indices:
+        counts[j+1] += 1
+    for j in range(minor):
+        counts[j+1] += counts[j]
+
+    nnz = len(data)
+    new_indices = array('l', bytes(array('l').itemsize*nnz))
+    new_data = array('d', bytes(8*nnz))
+    position = counts[:-1]
+    for i in range(major):
+        for k in range(indptr[i], indptr[i+1]):
+            j = indices[k]
+            new_indices[position[j]] = i
+            new_data[position[j]] = data[k]
+            position[j] += 1
+    return counts, new_indices, new_data
@@ -0,0 +1,24 @@
+import sys
+from random import random, seed
+from time import perf_counter
+from matrix import Matrix
+from sparse_matrix import SparseMatrix
+
+# Multiplies an N x N matrix with about 1% nonzeros by a dense N x N matrix,
+# stored dense (Matrix) and sparse (SparseMatrix), and by itself sparse x sparse.
+# Usage: python sparse_matrix_benchmark.py [N ...]   (default N = 100 300)
+
+sizes = [int(n) for n in sys.argv[1:]] or [100, 300]
+seed(0)
+
+print('{:>6}{:>8}{:>14}{:>14}{:>14}'.format('N', 'nnz', 'dense (s)', 'sparse (s)', 'sp x sp (s)'))
+for n in sizes:
+    a = Matrix.from_flat(n, n, [random() if random() < 0.01 else 0.0 for _ in range(n*n)])
+    b = Matrix.from_flat(n, n, [random() for _ in range(n*n)])
+    sparse_a = SparseMatrix.from_matrix(a)
+    times = []
+    for left, right in ((a, b), (sparse_a, b), (sparse_a, sparse_a)):
+        start = perf_counter()
+        left.matrix_multiplication(right)
+        times.append(perf_counter() - start)
+    print('{:>6}{:>8}{:>14.3f}{:>14.3f}{:>14.3f}'.format(n, sparse_a.nnz, *times))
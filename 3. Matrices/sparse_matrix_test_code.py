@@ -0,0 +1,38 @@
+from matrix import Matrix
+from sparse_matrix import SparseMatrix
+
+m1 = Matrix([[1, 0, 0, 2], [0, 0, 3, 0], [0, 4, 0, 0]])
+s1 = SparseMatrix.from_matrix(m1)
+assert s1.nnz == 4
+assert list(s1.indptr) == [0, 2, 3, 4] and list(s1.indices) == [0, 3, 2, 1]
+assert s1.to_matrix().matrix == m1.matrix
+
+s2 = s1.to_csc()
+assert list(s2.indptr) == [0, 1, 2, 3, 4] and list(s2.indices) == [0, 2, 1, 0]
+assert s2.matrix == m1.matrix
+assert s2.to_csr().matrix == m1.matrix
+
+assert s1.transpose().format == 'csc'
+assert s1.transpose().matrix == m1.transpose().matrix
+assert s2.transpose().matrix == m1.transpose().matrix
+
+m2 = Matrix([[0, 1, 0, -2], [5, 0, -3, 0], [0, 0, 0, 0]])
+s3 = SparseMatrix.from_matrix(m2, 'csc')
+assert s1.matrix_addition(s3).matrix == m1.matrix_addition(m2).matrix
+assert s1.matrix_addition(s3).nnz == 4
+assert s1.matrix_addition(m2).matrix == m1.matrix_addition(m2).matrix
+assert m2.matrix_addition(s1).matrix == m1.matrix_addition(m2).matrix
+assert s1.scalar_x_matrix(2).matrix == m1.scalar_x_matrix(2).matrix
+
+m3 = Matrix([[1, 2], [0, 0], [0, -1], [3, 0]])
+s4 = SparseMatrix.from_matrix(m3)
+assert s1.matrix_multiplication(s4).matrix == m1.matrix_multiplication(m3).matrix
+assert s1.matrix_multiplication(m3).matrix == m1.matrix_multiplication(m3).matrix
+assert m1.matrix_multiplication(s4).matrix == m1.matrix_multiplication(m3).matrix
+assert s2.matrix_multiplication(s4.to_csc()).matrix == m1.matrix_multiplication(m3).matrix
+
+print('Completed, All pass!')
+print()
+
+#Test for mismatch in A columns and B rows, will throw ValueError:
+#s1.matrix_multiplication(s1)